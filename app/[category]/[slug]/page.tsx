@@ -1,5 +1,6 @@
 import fs from 'fs'
 import path from 'path'
+import zlib from 'zlib'
 import { notFound } from 'next/navigation'
 import type { Metadata } from 'next'
 import ArticleClient from './ArticleClient'
@@ -14,6 +15,7 @@ interface Article {
   Content?: string[]
   Sections?: string[]
   Article?: string  // HTML jako string
+  Body?: ArticleBody  // format "split": HTML w osobnym pliku (article_store.py)
   FAQ?: Array<{ 
     Question?: string
     Answer?: string
@@ -22,6 +24,12 @@ interface Article {
   }>
 }
 
+interface ArticleBody {
+  file: string
+  encoding: 'gzip' | 'zstd' | 'none'
+  size?: number
+}
+
 interface PageProps {
   params: {
     category: string
@@ -29,15 +37,26 @@ interface PageProps {
   }
 }
 
-// Funkcja do pobrania artykułu
-function getArticle(category: string, slug: string): Article | null {
-  const filePath = path.join(
-    process.cwd(),
-    'public',
-    'content',
-    category,
-    `${slug}.json`
-  )
+// Treść artykułu w formacie "split" - czytana dopiero gdy jest potrzebna
+function readBody(dir: string, body: ArticleBody): string {
+  const raw = fs.readFileSync(path.join(dir, path.basename(body.file)))
+  if (body.encoding === 'gzip') {
+    return zlib.gunzipSync(raw).toString('utf-8')
+  }
+  if (body.encoding === 'zstd') {
+    const zstd = (zlib as any).zstdDecompressSync
+    if (!zstd) {
+      throw new Error('zstd body needs Node.js with zlib zstd support')
+    }
+    return zstd(raw).toString('utf-8')
+  }
+  return raw.toString('utf-8')
+}
+
+// Funkcja do pobrania artykułu (withBody=false: tylko nagłówek, np. dla metadanych)
+function getArticle(category: string, slug: string, withBody: boolean = true): Article | null {
+  const dir = path.join(process.cwd(), 'public', 'content', category)
+  const filePath = path.join(dir, `${slug}.json`)
 
   if (!fs.existsSync(filePath)) {
     return null
@@ -48,6 +67,13 @@ function getArticle(category: string, slug: string): Article | null {
     const article = JSON.parse(fileContent)
     article.Category = category
     article.Slug = slug
+    if (article.Body) {
+      article.H1 = article.H1 || article.Title
+      if (withBody) {
+        article.Article = readBody(dir, article.Body)
+      }
+      delete article.Body
+    }
     return article
   } catch (error) {
     console.error('Error reading article:', error)
@@ -94,7 +120,7 @@ export async function generateStaticParams() {
 
 // Generowanie metadanych
 export async function generateMetadata({ params }: PageProps): Promise<Metadata> {
-  const article = getArticle(params.category, params.slug)
+  const article = getArticle(params.category, params.slug, false)
   
   if (!article) {
     return {
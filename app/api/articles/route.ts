@@ -2,43 +2,66 @@ import { NextResponse } from 'next/server'
 import fs from 'fs'
 import path from 'path'
 
-export async function GET() {
-  try {
-    const contentDir = path.join(process.cwd(), 'public', 'content')
-    const articles: any[] = []
+// Listing written by the Python pipeline (content_index.py) after every save
+const LISTING_FILE = path.join(process.cwd(), 'public', 'content-index', 'listing.json')
+
+let listingCache: { mtimeMs: number, articles: any[] } | null = null
 
-    if (!fs.existsSync(contentDir)) {
-      return NextResponse.json([])
+function loadListing(): any[] | null {
+  try {
+    const mtimeMs = fs.statSync(LISTING_FILE).mtimeMs
+    if (!listingCache || listingCache.mtimeMs !== mtimeMs) {
+      const data = JSON.parse(fs.readFileSync(LISTING_FILE, 'utf-8'))
+      listingCache = { mtimeMs, articles: data.articles || [] }
     }
+    return listingCache.articles
+  } catch {
+    return null
+  }
+}
+
+// Fallback: no listing yet - scan every article file
+function scanArticles(): any[] {
+  const contentDir = path.join(process.cwd(), 'public', 'content')
+  const articles: any[] = []
+
+  if (!fs.existsSync(contentDir)) {
+    return articles
+  }
 
-    const categories = fs.readdirSync(contentDir).filter(item => {
-      return fs.statSync(path.join(contentDir, item)).isDirectory()
-    })
-
-    for (const category of categories) {
-      const categoryPath = path.join(contentDir, category)
-      const files = fs.readdirSync(categoryPath).filter(file => file.endsWith('.json'))
-
-      for (const file of files) {
-        try {
-          const filePath = path.join(categoryPath, file)
-          const fileContent = fs.readFileSync(filePath, 'utf-8')
-          const article = JSON.parse(fileContent)
-          
-          articles.push({
-            Title: article.Title,
-            MetaDescription: article.MetaDescription,
-            Category: category,
-            Slug: file.replace('.json', ''),
-            LastModified: article.LastModified || new Date().toISOString()
-          })
-        } catch (error) {
-          console.error(`Error reading ${file}:`, error)
-        }
+  const categories = fs.readdirSync(contentDir).filter(item => {
+    return fs.statSync(path.join(contentDir, item)).isDirectory()
+  })
+
+  for (const category of categories) {
+    const categoryPath = path.join(contentDir, category)
+    const files = fs.readdirSync(categoryPath).filter(file => file.endsWith('.json'))
+
+    for (const file of files) {
+      try {
+        const filePath = path.join(categoryPath, file)
+        const fileContent = fs.readFileSync(filePath, 'utf-8')
+        const article = JSON.parse(fileContent)
+
+        articles.push({
+          Title: article.Title,
+          MetaDescription: article.MetaDescription,
+          Category: category,
+          Slug: file.replace('.json', ''),
+          LastModified: article.LastModified || new Date().toISOString()
+        })
+      } catch (error) {
+        console.error(`Error reading ${file}:`, error)
       }
     }
+  }
 
-    return NextResponse.json(articles)
+  return articles
+}
+
+export async function GET() {
+  try {
+    return NextResponse.json(loadListing() ?? scanArticles())
   } catch (error) {
     console.error('Articles API error:', error)
     return NextResponse.json([], { status: 500 })
@@ -2,59 +2,155 @@ import { NextResponse } from 'next/server'
 import fs from 'fs'
 import path from 'path'
 
-export async function GET(request: Request) {
-  const { searchParams } = new URL(request.url)
-  const query = searchParams.get('q') || ''
+// Listing + inverted index written by the Python pipeline (content_index.py)
+const INDEX_DIR = path.join(process.cwd(), 'public', 'content-index')
+const LISTING_FILE = path.join(INDEX_DIR, 'listing.json')
+const SEARCH_FILE = path.join(INDEX_DIR, 'search.json')
 
-  if (!query) {
-    return NextResponse.json({ results: [] })
-  }
+type SearchIndex = {
+  articles: any[]
+  terms: Record<string, number[]>
+  minPrefix: number
+  maxPrefix: number
+}
+
+let indexCache: { key: string, index: SearchIndex } | null = null
 
+// Same folding as topic_index.fold(): lowercase, no diacritics, single spaces
+function fold(text: string): string {
+  return (text || '')
+    .toLowerCase()
+    .replace(/ł/g, 'l')
+    .normalize('NFKD')
+    .replace(/[^\x00-\x7f]/g, '')
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim()
+}
+
+function loadIndex(): SearchIndex | null {
   try {
-    const contentDir = path.join(process.cwd(), 'public', 'content')
-    const articles: any[] = []
+    const key = `${fs.statSync(LISTING_FILE).mtimeMs}:${fs.statSync(SEARCH_FILE).mtimeMs}`
+    if (!indexCache || indexCache.key !== key) {
+      const listing = JSON.parse(fs.readFileSync(LISTING_FILE, 'utf-8'))
+      const search = JSON.parse(fs.readFileSync(SEARCH_FILE, 'utf-8'))
+      // Files from two different writes - do not mix them
+      if (listing.generated !== search.generated) {
+        return null
+      }
+      indexCache = {
+        key,
+        index: {
+          articles: listing.articles || [],
+          terms: search.terms || {},
+          minPrefix: search.minPrefix || 2,
+          maxPrefix: search.maxPrefix || 8
+        }
+      }
+    }
+    return indexCache.index
+  } catch {
+    return null
+  }
+}
+
+function searchIndex(index: SearchIndex, query: string): any[] {
+  const folded = fold(query)
+  const words = folded.split(' ').filter(word => word.length >= index.minPrefix)
 
-    if (!fs.existsSync(contentDir)) {
-      return NextResponse.json({ results: [] })
+  // Nothing indexable (e.g. one letter) - substring match over the small listing
+  if (words.length === 0) {
+    return folded
+      ? index.articles.filter(a => fold(`${a.Title} ${a.MetaDescription}`).includes(folded))
+      : []
+  }
+
+  let candidates: number[] | null = null
+  let verify = false
+  for (const word of words) {
+    // Full words are indexed; longer prefixes than maxPrefix are narrowed and then checked
+    let ids = index.terms[word]
+    if (!ids && word.length > index.maxPrefix) {
+      ids = index.terms[word.slice(0, index.maxPrefix)]
+      verify = true
+    }
+    if (!ids) {
+      return []
     }
+    const previous = candidates === null ? null : new Set(candidates)
+    candidates = previous === null ? ids : ids.filter(id => previous.has(id))
+    if (candidates.length === 0) {
+      return []
+    }
+  }
 
-    const categories = fs.readdirSync(contentDir).filter(item => {
-      return fs.statSync(path.join(contentDir, item)).isDirectory()
-    })
-
-    for (const category of categories) {
-      const categoryPath = path.join(contentDir, category)
-      const files = fs.readdirSync(categoryPath).filter(file => file.endsWith('.json'))
-
-      for (const file of files) {
-        try {
-          const filePath = path.join(categoryPath, file)
-          const fileContent = fs.readFileSync(filePath, 'utf-8')
-          const article = JSON.parse(fileContent)
-          
-          article.Category = category
-          article.Slug = file.replace('.json', '')
-          
-          articles.push({
-            Title: article.Title,
-            MetaDescription: article.MetaDescription,
-            Category: article.Category,
-            Slug: article.Slug,
-            LastModified: article.LastModified || new Date().toISOString()
-          })
-        } catch (error) {
-          console.error(`Error reading ${file}:`, error)
-        }
+  const results = (candidates ?? []).map(id => index.articles[id]).filter(Boolean)
+  if (!verify) {
+    return results
+  }
+  return results.filter(a => {
+    const text = ` ${fold(`${a.Title} ${a.MetaDescription}`)}`
+    return words.every(word => text.includes(` ${word}`))
+  })
+}
+
+// Fallback: no index yet - scan every article file
+function scanSearch(query: string): any[] {
+  const contentDir = path.join(process.cwd(), 'public', 'content')
+  const articles: any[] = []
+
+  if (!fs.existsSync(contentDir)) {
+    return []
+  }
+
+  const categories = fs.readdirSync(contentDir).filter(item => {
+    return fs.statSync(path.join(contentDir, item)).isDirectory()
+  })
+
+  for (const category of categories) {
+    const categoryPath = path.join(contentDir, category)
+    const files = fs.readdirSync(categoryPath).filter(file => file.endsWith('.json'))
+
+    for (const file of files) {
+      try {
+        const filePath = path.join(categoryPath, file)
+        const fileContent = fs.readFileSync(filePath, 'utf-8')
+        const article = JSON.parse(fileContent)
+
+        article.Category = category
+        article.Slug = file.replace('.json', '')
+
+        articles.push({
+          Title: article.Title,
+          MetaDescription: article.MetaDescription,
+          Category: article.Category,
+          Slug: article.Slug,
+          LastModified: article.LastModified || new Date().toISOString()
+        })
+      } catch (error) {
+        console.error(`Error reading ${file}:`, error)
       }
     }
+  }
+
+  // Wyszukiwanie
+  const searchTerm = query.toLowerCase()
+  return articles.filter(article =>
+    article.Title.toLowerCase().includes(searchTerm) ||
+    article.MetaDescription.toLowerCase().includes(searchTerm)
+  )
+}
 
-    // Wyszukiwanie
-    const searchTerm = query.toLowerCase()
-    const results = articles.filter(article => 
-      article.Title.toLowerCase().includes(searchTerm) ||
-      article.MetaDescription.toLowerCase().includes(searchTerm)
-    )
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url)
+  const query = searchParams.get('q') || ''
 
+  if (!query) {
+    return NextResponse.json({ results: [] })
+  }
+
+  try {
+    const index = loadIndex()
+    const results = index ? searchIndex(index, query) : scanSearch(query)
     return NextResponse.json({ results })
   } catch (error) {
     console.error('Search API error:', error)
@@ -35,7 +35,7 @@ function getCategoryArticles(category: string): Article[] {
       
       articles.push({
         Title: article.Title,
-        H1: article.H1,
+        H1: article.H1 || article.Title,
         MetaDescription: article.MetaDescription,
         Slug: file.replace('.json', ''),
         LastModified: article.LastModified
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Article database (SQLite, WAL): articles, topic pairs, runs and API calls in one file
+• Indexed lookups - slug, category, normalized topic pair (A|B == B|A), near-duplicate
+  titles / bodies (MinHash signatures + LSH band buckets, near_dup.py)
+• Regenerate queue: comparisons whose article failed the post-processing gates
+• WAL + busy timeout: readers never block the writer, several generator processes
+  can write to the same file; threads share one connection behind a lock
+• public/content stays what the site serves: new or edited files are synced in on
+  start (tree wins), export writes the whole tree back out of the database
+
+    python article_db.py import                     # public/content -> articles.sqlite
+    python article_db.py export [--storage split]   # articles.sqlite -> public/content
+    python article_db.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from article_store import FORMATS, BODY_SUFFIX, article_hash, read_article, write_article
+import near_dup
+from topic_index import TopicIndex, article_pair
+
+# api_calls.model of the opening-balance row (spend carried over from progress_claude.json)
+OPENING = 'opening'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    slug TEXT NOT NULL,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    meta TEXT NOT NULL DEFAULT '',
+    modified TEXT NOT NULL DEFAULT '',
+    hash TEXT NOT NULL DEFAULT '',
+    words INTEGER,
+    source TEXT NOT NULL DEFAULT 'tree',
+    run_id INTEGER,
+    updated REAL NOT NULL,
+    header TEXT NOT NULL,
+    body BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_articles_slug ON articles(slug);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles(category, source);
+
+CREATE TABLE IF NOT EXISTS topics (
+    pair TEXT PRIMARY KEY,
+    topic_a TEXT NOT NULL,
+    topic_b TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_topics_article ON topics(article_id);
+
+-- MinHash signatures (near_dup.py) and their LSH band buckets - title and body of every article
+CREATE TABLE IF NOT EXISTS minhash (
+    article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    title BLOB NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    bucket INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_minhash_bands_bucket ON minhash_bands(bucket);
+CREATE INDEX IF NOT EXISTS idx_minhash_bands_article ON minhash_bands(article_id);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    target INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    generated INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS api_calls (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    ts REAL NOT NULL,
+    model TEXT NOT NULL DEFAULT '',
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_write_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    latency REAL,
+    ttfb REAL,
+    stop_reason TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    batch INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_api_calls_run ON api_calls(run_id);
+CREATE INDEX IF NOT EXISTS idx_api_calls_ts ON api_calls(ts);
+
+-- Worst-case cost of requests in flight (budget_ledger.py); rows of dead processes are purged
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    amount REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- Output tokens per generated article (a call's tokens split by html length) - feeds the batch planner
+CREATE TABLE IF NOT EXISTS token_samples (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    category TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_token_samples_category ON token_samples(category, id);
+
+-- Comparisons whose article failed the post-processing gates (post_process.py) - generated again
+-- first, with the issues in the prompt, until max attempts
+CREATE TABLE IF NOT EXISTS regenerate (
+    pair TEXT PRIMARY KEY,
+    topic_a TEXT NOT NULL,
+    topic_b TEXT NOT NULL,
+    category TEXT NOT NULL,
+    issues TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated REAL NOT NULL
+);
+"""
+
+
+def pair_id(topic_a: str, topic_b: str) -> str:
+    """Same key as the autopilot's claims: folded, sorted, 'a|b'"""
+    return '|'.join(TopicIndex.pair_key(topic_a, topic_b))
+
+
+class ArticleDB:
+    def __init__(self, path: str, timeout: float = 30):
+        self.path = path
+        self._lock = threading.Lock()
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE takes the write lock up
+        # front, so two processes never deadlock upgrading read locks)
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is safe with WAL; the newest rows may be lost on power failure, the tree sync brings them back
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+
+    def _write(self):
+        return _Transaction(self._db, self._lock)
+
+    # ---------- articles ----------
+
+    def _upsert(self, rel: str, data: Dict, file_hash: str, source: str, run_id: Optional[int], words: Optional[int]):
+        category, _, name = rel.rpartition('/')
+        slug = name[:-len('.json')]
+        html = data.get('Article') or ''
+        # Article stays in the header as a placeholder so export restores the original key order
+        header = json.dumps({k: (None if k == 'Article' else v) for k, v in data.items()}, ensure_ascii=False, separators=(',', ':'))
+        title = data.get('Title') if isinstance(data.get('Title'), str) else ''
+        row = (rel, slug, category.split('/', 1)[0], title,
+               data.get('MetaDescription') or '', data.get('LastModified') or '',
+               file_hash, words, source, run_id, time.time(), header, zlib.compress(html.encode('utf-8'), 6))
+        self._db.execute("""
+            INSERT INTO articles (path, slug, category, title, meta, modified, hash, words, source, run_id, updated, header, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                slug = excluded.slug, category = excluded.category, title = excluded.title,
+                meta = excluded.meta, modified = excluded.modified, hash = excluded.hash,
+                words = COALESCE(excluded.words, articles.words),
+                source = CASE WHEN excluded.source = 'generated' THEN 'generated' ELSE articles.source END,
+                run_id = COALESCE(excluded.run_id, articles.run_id),
+                updated = excluded.updated, header = excluded.header, body = excluded.body
+        """, row)
+        article_id = self._db.execute("SELECT id FROM articles WHERE path = ?", (rel,)).fetchone()[0]
+
+        self._db.execute("DELETE FROM topics WHERE article_id = ?", (article_id,))
+        if data.get('TopicA') and data.get('TopicB'):
+            pair = TopicIndex.pair_key(data['TopicA'], data['TopicB'])
+        else:
+            pair = article_pair(title, slug)
+        if pair:
+            self._db.execute("INSERT OR REPLACE INTO topics (pair, topic_a, topic_b, article_id) VALUES (?, ?, ?, ?)",
+                             ('|'.join(pair), pair[0], pair[1], article_id))
+        self._index_minhash(article_id, title, html)
+
+    def _index_minhash(self, article_id: int, title: str, html: str):
+        title_sig = near_dup.signature(near_dup.title_shingles(title))
+        body_sig = near_dup.signature(near_dup.body_shingles(html))
+        self._db.execute("INSERT OR REPLACE INTO minhash (article_id, title, body) VALUES (?, ?, ?)",
+                         (article_id, near_dup.to_blob(title_sig), near_dup.to_blob(body_sig)))
+        self._db.execute("DELETE FROM minhash_bands WHERE article_id = ?", (article_id,))
+        self._db.executemany("INSERT INTO minhash_bands (bucket, article_id) VALUES (?, ?)",
+                             [(b, article_id) for b in near_dup.buckets(title_sig, near_dup.TITLE_BANDS, 1) +
+                              near_dup.buckets(body_sig, near_dup.BODY_BANDS, 2)])
+
+    def save(self, rel: str, data: Dict, file_hash: str = '', source: str = 'generated',
+             run_id: Optional[int] = None, words: Optional[int] = None):
+        """One article (inline shape, Article included) and its topic pair, in one transaction"""
+        with self._write():
+            self._upsert(rel, data, file_hash, source, run_id, words)
+
+    def delete(self, rels: List[str]):
+        with self._write():
+            self._db.executemany("DELETE FROM articles WHERE path = ?", [(rel,) for rel in rels])
+
+    def sync_tree(self, content_dir: str, entries: Iterator[Dict]) -> Tuple[int, int]:
+        """Bring the database in line with the manifest entries (tree wins).
+        Only files whose hash differs are read. Returns (saved, deleted)."""
+        with self._lock:
+            known = dict(self._db.execute("SELECT path, hash FROM articles"))
+        changed = []
+        present: Set[str] = set()
+        for entry in entries:
+            present.add(entry['path'])
+            if known.get(entry['path']) != entry['hash']:
+                changed.append(entry)
+        gone = [rel for rel in known if rel not in present]
+
+        saved = 0
+        # Chunked so a first import of a big tree does not hold the write lock for minutes
+        for start in range(0, len(changed), 500):
+            chunk = []
+            for entry in changed[start:start + 500]:
+                try:
+                    chunk.append((entry, read_article(os.path.join(content_dir, entry['path']))))
+                except (OSError, ValueError, RuntimeError) as e:
+                    print(f"   ⚠️  {entry['path']}: {e}")
+            with self._write():
+                for entry, data in chunk:
+                    self._upsert(entry['path'], data, entry['hash'], 'tree', None, None)
+            saved += len(chunk)
+        if gone:
+            self.delete(gone)
+        return saved, len(gone)
+
+    def export(self, content_dir: str, fmt: str = 'inline', compression: str = 'gzip', force: bool = False) -> Dict[str, int]:
+        """Write every article to content_dir; files whose bytes (header + body files) already match the row are skipped"""
+        stats = {"written": 0, "skipped": 0}
+        written = []
+        with self._lock:
+            rows = self._db.execute("SELECT path, hash, header, body FROM articles ORDER BY path").fetchall()
+        for rel, file_hash, header, body in rows:
+            filepath = os.path.join(content_dir, rel)
+            if not force and file_hash and article_hash(filepath) == file_hash:
+                stats['skipped'] += 1
+                continue
+            data = json.loads(header)
+            data['Article'] = zlib.decompress(body).decode('utf-8') if body else ''
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            write_article(filepath, data, fmt, compression)
+            written.append((article_hash(filepath), rel))
+        # New bytes (e.g. another format) - keep the start-up sync from re-importing them
+        with self._write():
+            self._db.executemany("UPDATE articles SET hash = ? WHERE path = ?", written)
+        stats['written'] = len(written)
+        return stats
+
+    # ---------- indexed queries ----------
+
+    def slugs(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._db.execute("SELECT slug FROM articles")}
+
+    def titles(self) -> Set[str]:
+        with self._lock:
+            return {row[0].lower() for row in self._db.execute("SELECT title FROM articles WHERE title != ''")}
+
+    def has_slug(self, slug: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM articles WHERE slug = ? LIMIT 1", (slug,)).fetchone() is not None
+
+    def has_pair(self, topic_a: str, topic_b: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM topics WHERE pair = ?", (pair_id(topic_a, topic_b),)).fetchone() is not None
+
+    def count_by_category(self, source: Optional[str] = None) -> Dict[str, int]:
+        sql = "SELECT category, COUNT(*) FROM articles"
+        args: Tuple = ()
+        if source:
+            sql += " WHERE source = ?"
+            args = (source,)
+        with self._lock:
+            return dict(self._db.execute(sql + " GROUP BY category ORDER BY category", args))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    # ---------- near duplicates (near_dup.py) ----------
+
+    def backfill_minhash(self) -> int:
+        """Signatures for articles saved before the minhash tables existed"""
+        filled = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute("""
+                    SELECT a.id, a.title, a.body FROM articles a
+                    LEFT JOIN minhash m ON m.article_id = a.id WHERE m.article_id IS NULL LIMIT 500
+                """).fetchall()
+            if not rows:
+                return filled
+            with self._write():
+                for article_id, title, body in rows:
+                    self._index_minhash(article_id, title, zlib.decompress(body).decode('utf-8') if body else '')
+            filled += len(rows)
+
+    def _similar(self, column: str, sig, bands: int, kind: int, threshold: float,
+                 exclude: Optional[str] = None, limit: int = 5, pairs_only: bool = False) -> List[Tuple[str, str, float]]:
+        """LSH candidates (any shared band bucket), verified on the stored signatures"""
+        keys = near_dup.buckets(sig, bands, kind)
+        if not keys:
+            return []
+        with self._lock:
+            rows = self._db.execute(f"""
+                SELECT a.path, a.title, m.{column} FROM minhash m JOIN articles a ON a.id = m.article_id
+                WHERE m.article_id IN (SELECT article_id FROM minhash_bands WHERE bucket IN ({','.join('?' * len(keys))}))
+                {'AND m.article_id IN (SELECT article_id FROM topics)' if pairs_only else ''}
+            """, keys).fetchall()
+        matches = []
+        for path, title, blob in rows:
+            if path == exclude:
+                continue
+            score = near_dup.similarity(sig, near_dup.from_blob(blob))
+            if score >= threshold:
+                matches.append((path, title, score))
+        matches.sort(key=lambda m: -m[2])
+        return matches[:limit]
+
+    def similar_titles(self, title: str, threshold: float = near_dup.TITLE_THRESHOLD,
+                       exclude: Optional[str] = None, pairs_only: bool = False) -> List[Tuple[str, str, float]]:
+        """[(path, title, similarity)] of articles whose title is a near duplicate, best first.
+        pairs_only: only comparison articles (with a topic pair), so "A vs B" is not matched by an article on A alone"""
+        sig = near_dup.signature(near_dup.title_shingles(title))
+        return self._similar('title', sig, near_dup.TITLE_BANDS, 1, threshold, exclude, pairs_only=pairs_only)
+
+    def similar_bodies(self, html: str, threshold: float = near_dup.BODY_THRESHOLD,
+                       exclude: Optional[str] = None) -> List[Tuple[str, str, float]]:
+        sig = near_dup.signature(near_dup.body_shingles(html))
+        return self._similar('body', sig, near_dup.BODY_BANDS, 2, threshold, exclude)
+
+    def near_duplicates(self, threshold: Optional[float] = None) -> List[Tuple[str, float, str, str]]:
+        """Every near-duplicate pair in the corpus: [(kind, similarity, path_a, path_b)]"""
+        with self._lock:
+            rows = self._db.execute("SELECT a.path, m.title, m.body FROM minhash m JOIN articles a ON a.id = m.article_id").fetchall()
+        pairs = {}
+        for path, title_blob, body_blob in rows:
+            for kind, column, blob, bands, tag, default in (
+                    ('title', 'title', title_blob, near_dup.TITLE_BANDS, 1, near_dup.TITLE_THRESHOLD),
+                    ('body', 'body', body_blob, near_dup.BODY_BANDS, 2, near_dup.BODY_THRESHOLD)):
+                for other, _, score in self._similar(column, near_dup.from_blob(blob), bands, tag,
+                                                     threshold or default, exclude=path, limit=20):
+                    pairs[(kind,) + tuple(sorted((path, other)))] = score
+        return sorted(((kind, score, a, b) for (kind, a, b), score in pairs.items()), key=lambda p: (p[0], -p[1]))
+
+    # ---------- runs / API calls ----------
+
+    def start_run(self, mode: str, target: int = 0) -> int:
+        with self._write():
+            cur = self._db.execute("INSERT INTO runs (mode, target, pid, started) VALUES (?, ?, ?, ?)",
+                                   (mode, target, os.getpid(), time.time()))
+            return cur.lastrowid
+
+    def finish_run(self, run_id: int, generated: int, failed: int, cost: float):
+        with self._write():
+            self._db.execute("UPDATE runs SET finished = ?, generated = ?, failed = ?, cost = ? WHERE id = ?",
+                             (time.time(), generated, failed, cost, run_id))
+
+    def record_call(self, run_id: Optional[int], model: str, usage: Dict, cost: float, latency: float = None,
+                    ttfb: float = None, stop_reason: str = None, cached: bool = False, batch: bool = False):
+        with self._write():
+            self._db.execute("""
+                INSERT INTO api_calls (run_id, ts, model, input_tokens, output_tokens, cache_read_tokens,
+                                       cache_write_tokens, cost, latency, ttfb, stop_reason, cached, batch)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (run_id, time.time(), model, usage.get('input_tokens') or 0, usage.get('output_tokens') or 0,
+                  usage.get('cache_read_input_tokens') or 0, usage.get('cache_creation_input_tokens') or 0,
+                  cost, latency, ttfb, stop_reason, int(cached), int(batch)))
+
+    def record_opening(self, cost: float):
+        """Spend from before articles.sqlite (progress_claude.json's total_cost) as one api_calls row,
+        dated 0 - it counts until the first budget reset, but is not a call"""
+        with self._write():
+            self._db.execute("INSERT INTO api_calls (run_id, ts, model, cost, stop_reason) VALUES (NULL, 0, ?, ?, ?)",
+                             (OPENING, cost, OPENING))
+
+    def record_tokens(self, samples: List[Tuple[str, int, int]]):
+        """(category, words, output_tokens) per article of one complete response"""
+        now = time.time()
+        with self._write():
+            self._db.executemany("INSERT INTO token_samples (ts, category, words, output_tokens) VALUES (?, ?, ?, ?)",
+                                 [(now, category, words, tokens) for category, words, tokens in samples])
+
+    def token_stats(self, category: Optional[str] = None, last: int = 50) -> Optional[Tuple[int, int, int]]:
+        """(words, output_tokens, samples) summed over the newest `last` samples; None without history"""
+        sql = "SELECT words, output_tokens FROM token_samples"
+        args: Tuple = ()
+        if category:
+            sql += " WHERE category = ?"
+            args = (category,)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY id DESC LIMIT ?", args + (last,)).fetchall()
+        if not rows:
+            return None
+        return sum(r[0] for r in rows), sum(r[1] for r in rows), len(rows)
+
+    def token_categories(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT category FROM token_samples ORDER BY category")]
+
+    def recent_ttfb(self, limit: int = 200) -> List[float]:
+        """Time to first token of the newest live streamed calls, oldest first"""
+        with self._lock:
+            rows = self._db.execute("SELECT ttfb FROM api_calls WHERE ttfb IS NOT NULL AND cached = 0 "
+                                    "ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def total_cost(self, since: float = 0) -> float:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(cost), 0) FROM api_calls WHERE ts >= ?", (since,)).fetchone()[0]
+
+    # ---------- regenerate queue ----------
+
+    def queue_regenerate(self, topic_a: str, topic_b: str, category: str, issues: List[str]) -> int:
+        """Record a rejected article; returns how many times this pair was rejected"""
+        with self._write():
+            self._db.execute("""
+                INSERT INTO regenerate (pair, topic_a, topic_b, category, issues, attempts, updated)
+                VALUES (?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT(pair) DO UPDATE SET
+                    issues = excluded.issues, attempts = regenerate.attempts + 1, updated = excluded.updated
+            """, (pair_id(topic_a, topic_b), topic_a, topic_b, category, json.dumps(issues, ensure_ascii=False), time.time()))
+            return self._db.execute("SELECT attempts FROM regenerate WHERE pair = ?",
+                                    (pair_id(topic_a, topic_b),)).fetchone()[0]
+
+    def regenerate_queue(self) -> List[Dict]:
+        """Every rejected pair, oldest rejection first"""
+        with self._lock:
+            rows = self._db.execute("SELECT pair, topic_a, topic_b, category, issues, attempts FROM regenerate "
+                                    "ORDER BY updated").fetchall()
+        return [{"pair": pair, "a": a, "b": b, "category": category, "issues": json.loads(issues), "attempts": attempts}
+                for pair, a, b, category, issues, attempts in rows]
+
+    def clear_regenerate(self, topic_a: str, topic_b: str):
+        with self._write():
+            self._db.execute("DELETE FROM regenerate WHERE pair = ?", (pair_id(topic_a, topic_b),))
+
+    # ---------- budget ----------
+
+    def get_setting(self, key: str, default: str = None) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_setting(self, key: str, value: str):
+        with self._write():
+            self._db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+
+    def reserved(self) -> float:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(amount), 0) FROM reservations").fetchone()[0]
+
+    def reserve(self, amount: float, cap: float, since: float = 0) -> Optional[int]:
+        """Hold `amount` if spent + every process's holds + amount stays within cap; None otherwise.
+        Check and insert share one write transaction, so two processes cannot both take the last dollar."""
+        with self._write():
+            spent = self._db.execute("SELECT COALESCE(SUM(cost), 0) FROM api_calls WHERE ts >= ?", (since,)).fetchone()[0]
+            held = self._db.execute("SELECT COALESCE(SUM(amount), 0) FROM reservations").fetchone()[0]
+            if spent + held + amount > cap:
+                return None
+            return self._db.execute("INSERT INTO reservations (pid, ts, amount) VALUES (?, ?, ?)",
+                                    (os.getpid(), time.time(), amount)).lastrowid
+
+    def release(self, reservation_id: int):
+        with self._write():
+            self._db.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+
+    def purge_reservations(self, max_age: float = 3600) -> int:
+        """Drop holds of processes that are gone (killed mid-request) or older than any request can run"""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute("SELECT id, pid, ts FROM reservations").fetchall()
+        stale = [(rid,) for rid, pid, ts in rows
+                 if now - ts > max_age or (pid != os.getpid() and not _pid_alive(pid))]
+        if stale:
+            with self._write():
+                self._db.executemany("DELETE FROM reservations WHERE id = ?", stale)
+        return len(stale)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            articles, generated = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(source = 'generated'), 0) FROM articles").fetchone()
+            pairs = self._db.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+            runs = self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            regenerate = self._db.execute("SELECT COUNT(*) FROM regenerate").fetchone()[0]
+            calls, cost, cached = self._db.execute(
+                "SELECT COALESCE(SUM(model != ?), 0), COALESCE(SUM(cost), 0), COALESCE(SUM(cached), 0) FROM api_calls",
+                (OPENING,)).fetchone()
+        return {
+            "articles": articles,
+            "generated": generated,
+            "pairs": pairs,
+            "runs": runs,
+            "regenerate": regenerate,
+            "api_calls": calls,
+            "cached_calls": cached,
+            "cost": round(cost, 4),
+            "size_mb": round(os.path.getsize(self.path) / 1024 / 1024, 2),
+            "file": os.path.basename(self.path)
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT under the connection lock, ROLLBACK on error"""
+
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows - only the age limit applies there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def main():
+    from content_manifest import ContentManifest
+
+    parser = argparse.ArgumentParser(description='Article database <-> public/content')
+    parser.add_argument('command', choices=['import', 'export', 'stats'])
+    parser.add_argument('--db', default=os.path.join(os.getcwd(), 'articles.sqlite'), help='Database file')
+    parser.add_argument('--content', default=os.path.join(os.getcwd(), 'public', 'content'), help='Content directory')
+    parser.add_argument('--storage', choices=FORMATS, default='inline', help='Export format (default: inline)')
+    parser.add_argument('--compression', choices=list(BODY_SUFFIX), default='gzip', help='Body compression for split (default: gzip)')
+    parser.add_argument('--force', action='store_true', help='Export: rewrite files that already match')
+    args = parser.parse_args()
+
+    db = ArticleDB(args.db)
+    if args.command == 'import':
+        manifest = ContentManifest(args.content, os.path.join(os.getcwd(), 'content_manifest.json'))
+        manifest.refresh()
+        manifest.save()
+        saved, deleted = db.sync_tree(args.content, manifest.entries())
+        print(f"✅ Imported: {saved}, removed: {deleted}")
+    elif args.command == 'export':
+        stats = db.export(args.content, args.storage, args.compression, force=args.force)
+        print(f"✅ Written: {stats['written']}, unchanged: {stats['skipped']}")
+    print(json.dumps(db.stats(), ensure_ascii=False, indent=2))
+    if args.command == 'stats':
+        for category, count in db.count_by_category().items():
+            print(f"   {category}: {count}")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Partial-field reader for article JSON files
+• read_fields(): small header fields (Title, Category...) without building the Article string
+• read_except(): everything but the Article
+• iter_field_text(): one big string field as decoded text pieces (flat memory)
+• Works on raw UTF-8 bytes - skipped values are scanned in chunks, never decoded
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+HEADER_FIELDS = ('Title', 'H1', 'MetaDescription', 'Slug', 'Category', 'LastModified')
+
+_WS = b' \t\r\n'
+_CONTAINER_STOP = re.compile(rb'[\[\]{}"]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+_HIGH_SURROGATE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+
+class _ByteReader:
+    """Forward-only tokenizer over a binary file; keeps one chunk in memory"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        data = self.f.read(self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[int]:
+        """Next non-whitespace byte (not consumed)"""
+        while True:
+            while self.pos < len(self.buf):
+                b = self.buf[self.pos]
+                if b not in _WS:
+                    return b
+                self.pos += 1
+            if not self._fill():
+                return None
+
+    def expect(self, char: bytes):
+        if self.peek() != char[0]:
+            raise ValueError(f"expected {char!r} at byte {self.pos}")
+        self.pos += 1
+
+    def _backslashes_before(self, i: int) -> int:
+        j = i
+        while j > self.pos and self.buf[j - 1] == 0x5c:
+            j -= 1
+        return i - j
+
+    def string_segments(self) -> Iterator[bytes]:
+        """Raw bytes of a string value, opening quote already consumed; eats the closing quote.
+        Segments are as large as the buffer allows; an escape is never split after its backslash"""
+        while True:
+            i = self.buf.find(b'"', self.pos)
+            while i >= 0 and self._backslashes_before(i) % 2:
+                i = self.buf.find(b'"', i + 1)
+            if i >= 0:
+                if i > self.pos:
+                    yield self.buf[self.pos:i]
+                self.pos = i + 1
+                return
+            end = len(self.buf)
+            if self._backslashes_before(end) % 2:
+                end -= 1
+            if end > self.pos:
+                yield self.buf[self.pos:end]
+            self.pos = end
+            if not self._fill():
+                raise ValueError("unterminated string")
+
+    def raw_value(self, keep: bool) -> bytes:
+        """Consume one JSON value; return its bytes only when keep=True"""
+        first = self.peek()
+        if first is None:
+            raise ValueError("unexpected end of file")
+        parts = []
+
+        if first == ord('"'):
+            self.pos += 1
+            for seg in self.string_segments():
+                if keep:
+                    parts.append(seg)
+            return b'"' + b''.join(parts) + b'"' if keep else b''
+
+        if first in b'[{':
+            depth = 0
+            while True:
+                m = _CONTAINER_STOP.search(self.buf, self.pos)
+                if not m:
+                    if keep:
+                        parts.append(self.buf[self.pos:])
+                    self.pos = len(self.buf)
+                    if not self._fill():
+                        raise ValueError("unterminated container")
+                    continue
+                if keep:
+                    parts.append(self.buf[self.pos:m.end()])
+                self.pos = m.end()
+                c = m.group()
+                if c == b'"':
+                    for seg in self.string_segments():
+                        if keep:
+                            parts.append(seg)
+                    if keep:
+                        parts.append(b'"')
+                elif c in b'[{':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return b''.join(parts)
+
+        while True:
+            m = _SCALAR_END.search(self.buf, self.pos)
+            if m:
+                parts.append(self.buf[self.pos:m.start()])
+                self.pos = m.start()
+                return b''.join(parts)
+            parts.append(self.buf[self.pos:])
+            self.pos = len(self.buf)
+            if not self._fill():
+                return b''.join(parts)
+
+    def members(self) -> Iterator[str]:
+        """Keys of the top-level object; caller must consume each value"""
+        self.expect(b'{')
+        if self.peek() == ord('}'):
+            return
+        while True:
+            self.expect(b'"')
+            key = json.loads(b'"' + b''.join(self.string_segments()) + b'"')
+            self.expect(b':')
+            yield key
+            nxt = self.peek()
+            if nxt == ord(','):
+                self.pos += 1
+            elif nxt == ord('}') or nxt is None:
+                return
+            else:
+                raise ValueError(f"unexpected byte {chr(nxt)!r} at {self.pos}")
+
+
+def read_fields(path: str, fields: Iterable[str] = HEADER_FIELDS, chunk_size: int = 16384) -> Dict:
+    """Pull only `fields` from an article; stops reading once all of them were seen"""
+    wanted = set(fields)
+    found = {}
+    with open(path, 'rb') as f:
+        reader = _ByteReader(f, chunk_size)
+        for key in reader.members():
+            if key in wanted:
+                found[key] = json.loads(reader.raw_value(keep=True), strict=False)
+                if len(found) == len(wanted):
+                    break
+            else:
+                reader.raw_value(keep=False)
+    return found
+
+
+def read_except(path: str, skip: Iterable[str] = ('Article',), chunk_size: int = 16384) -> Dict:
+    """Every field but `skip` - the skipped values are scanned, never decoded"""
+    skip = set(skip)
+    found = {}
+    with open(path, 'rb') as f:
+        reader = _ByteReader(f, chunk_size)
+        for key in reader.members():
+            if key in skip:
+                reader.raw_value(keep=False)
+            else:
+                found[key] = json.loads(reader.raw_value(keep=True), strict=False)
+    return found
+
+
+def iter_field_text(path: str, field: str = 'Article', chunk_size: int = 65536) -> Iterator[str]:
+    """Decoded text of one string field, piece by piece - never the whole body at once"""
+    with open(path, 'rb') as f:
+        reader = _ByteReader(f, chunk_size)
+        for key in reader.members():
+            if key != field:
+                reader.raw_value(keep=False)
+                continue
+            if reader.peek() != ord('"'):
+                return
+            reader.pos += 1
+            utf8 = codecs.getincrementaldecoder('utf-8')()
+            pending = ''
+            for seg in reader.string_segments():
+                text = pending + utf8.decode(seg)
+                cut = _escape_safe_cut(text)
+                pending = text[cut:]
+                if cut:
+                    yield json.loads('"' + text[:cut] + '"', strict=False)
+            text = pending + utf8.decode(b'', final=True)
+            if text:
+                yield json.loads('"' + text + '"', strict=False)
+            return
+
+
+def _escape_safe_cut(text: str) -> int:
+    """Index before a trailing, possibly incomplete escape sequence (\\uXXXX is 6 chars)
+    or a high surrogate escape whose low half has not arrived yet"""
+    cut = len(text)
+    k = text.rfind('\\', max(0, cut - 6))
+    # an even run is only escaped backslashes - nothing pending
+    if k >= 0 and _backslash_run(text, k) % 2:
+        cut = k
+    start = cut - 6
+    if start >= 0 and _HIGH_SURROGATE.match(text, start) and _backslash_run(text, start) % 2:
+        cut = start
+    return cut
+
+
+def _backslash_run(text: str, k: int) -> int:
+    """Length of the backslash run ending at index k"""
+    run = 0
+    while k - run >= 0 and text[k - run] == '\\':
+        run += 1
+    return run
+
+
+def field_word_count(path: str, field: str = 'Article', chunk_size: int = 65536) -> int:
+    """Whitespace word count of a string field (tags split like ' '), streamed"""
+    count = 0
+    glued = False  # previous piece ended inside a word
+    for piece in iter_field_text(path, field, chunk_size):
+        piece = piece.replace('<', ' ').replace('>', ' ')
+        if not piece:
+            continue
+        count += len(piece.split())
+        if glued and not piece[0].isspace():
+            count -= 1
+        glued = not piece[-1].isspace()
+    return count
+
+
+def iter_headers(content_dir: str, fields: Iterable[str] = HEADER_FIELDS) -> Iterator[Tuple[str, Dict]]:
+    """(relative path, header fields) for every article under content_dir"""
+    fields = tuple(fields)
+    for root, _, files in os.walk(content_dir):
+        for name in files:
+            if name.endswith('.json'):
+                path = os.path.join(root, name)
+                try:
+                    header = read_fields(path, fields)
+                except (OSError, ValueError):
+                    continue
+                yield os.path.relpath(path, content_dir).replace(os.sep, '/'), header
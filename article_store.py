@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Article storage formats under public/content/<category>/
+• inline: <slug>.json with everything, Article HTML included (the original layout)
+• split:  <slug>.json = compact header, Article HTML in <slug>.body.html.gz (or .zst);
+          H1 is dropped when it equals Title. The .gz body can be served as-is with
+          Content-Encoding: gzip
+• Readers accept both, so a tree can be converted file by file
+
+    python article_store.py --to split [--compression gzip|zstd|none]
+    python article_store.py --to inline
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+from article_reader import iter_field_text, read_except, read_fields
+from safe_io import atomic_write, atomic_write_json
+
+# zstd (optional) - smaller and faster than gzip, but not servable to browsers as-is
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+FORMATS = ('inline', 'split')
+BODY_SUFFIX = {'gzip': '.body.html.gz', 'zstd': '.body.html.zst', 'none': '.body.html'}
+
+
+def _compression(name: str) -> str:
+    if name == 'zstd' and not ZSTD_AVAILABLE:
+        print("⚠️  zstandard not installed - using gzip (pip install zstandard)")
+        return 'gzip'
+    if name not in BODY_SUFFIX:
+        raise ValueError(f"unknown compression: {name}")
+    return name
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd body but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def _body_files(filepath: str) -> Iterator[str]:
+    base = filepath[:-len('.json')]
+    for suffix in BODY_SUFFIX.values():
+        if os.path.exists(base + suffix):
+            yield base + suffix
+
+
+def body_paths(filepath: str) -> List[str]:
+    """Body files next to a header, in name order (the order article_hash reads them)"""
+    return sorted(_body_files(filepath))
+
+
+def article_hash(filepath: str, bodies: Optional[List[str]] = None) -> Optional[str]:
+    """sha1 over the raw bytes of the header and its body files - the hash content_manifest.json
+    keeps and export / sync_tree compare against; None if a file is missing"""
+    sha1 = hashlib.sha1()
+    try:
+        for path in [filepath] + (body_paths(filepath) if bodies is None else bodies):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    sha1.update(chunk)
+    except OSError:
+        return None
+    return sha1.hexdigest()
+
+
+# ---------- write ----------
+
+def write_article(filepath: str, data: Dict, fmt: str = 'inline', compression: str = 'gzip'):
+    """Atomic in both formats; in split the body lands first, so the header never points at a missing body"""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown storage format: {fmt}")
+
+    if fmt == 'inline':
+        atomic_write_json(filepath, data, indent=2)
+        stale = list(_body_files(filepath))
+    else:
+        compression = _compression(compression)
+        html = (data.get('Article') or '').encode('utf-8')
+        body_path = filepath[:-len('.json')] + BODY_SUFFIX[compression]
+        atomic_write(body_path, _compress(html, compression))
+
+        header = {k: v for k, v in data.items() if k != 'Article'}
+        if header.get('H1') == header.get('Title'):
+            header.pop('H1', None)
+        header['Body'] = {
+            "file": os.path.basename(body_path),
+            "encoding": compression,
+            "size": len(html),
+            "sha1": hashlib.sha1(html).hexdigest()
+        }
+        atomic_write_json(filepath, header, separators=(',', ':'))
+        stale = [p for p in _body_files(filepath) if p != body_path]
+
+    for path in stale:
+        os.remove(path)
+
+
+# ---------- read ----------
+
+# Below this size json.load (C) beats skipping the body with the Python tokenizer
+SMALL_FILE = 64 * 1024
+
+
+def read_header(filepath: str) -> Dict:
+    """Everything except the Article body (never decompressed); H1 filled back in"""
+    if os.path.getsize(filepath) <= SMALL_FILE:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        header.pop('Article', None)
+    else:
+        header = read_except(filepath, ('Article',))
+    header.setdefault('H1', header.get('Title', ''))
+    return header
+
+
+def _body_info(filepath: str) -> Optional[Dict]:
+    info = read_fields(filepath, ('Body',)).get('Body')
+    return info if isinstance(info, dict) else None
+
+
+def read_body(filepath: str, info: Optional[Dict] = None) -> str:
+    info = info if info is not None else _body_info(filepath)
+    if info is None:
+        return read_fields(filepath, ('Article',)).get('Article') or ''
+    with open(os.path.join(os.path.dirname(filepath), info['file']), 'rb') as f:
+        return _decompress(f.read(), info.get('encoding', 'none')).decode('utf-8')
+
+
+def read_article(filepath: str) -> Dict:
+    """Full article in the inline shape, whatever the format on disk"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    info = data.pop('Body', None)
+    if isinstance(info, dict):
+        data['Article'] = read_body(filepath, info)
+        data.setdefault('H1', data.get('Title', ''))
+    return data
+
+
+def iter_body_text(filepath: str, chunk_size: int = 65536) -> Iterator[str]:
+    """Article HTML in pieces - streamed from the inline JSON or decompressed from the body file"""
+    info = _body_info(filepath)
+    if info is None:
+        yield from iter_field_text(filepath, 'Article', chunk_size)
+        return
+    body_path = os.path.join(os.path.dirname(filepath), info['file'])
+    encoding = info.get('encoding', 'none')
+    if encoding == 'gzip':
+        f = gzip.open(body_path, 'rt', encoding='utf-8')
+    elif encoding == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd body but zstandard is not installed")
+        f = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(body_path, 'rb'), closefd=True), encoding='utf-8')
+    else:
+        f = open(body_path, 'r', encoding='utf-8')
+    with f:
+        for piece in iter(lambda: f.read(chunk_size), ''):
+            yield piece
+
+
+# ---------- converter ----------
+
+def convert_tree(content_dir: str, fmt: str, compression: str = 'gzip') -> Dict[str, int]:
+    """Rewrite every article under content_dir in `fmt`; files already in that shape are skipped"""
+    stats = {"converted": 0, "skipped": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    compression = _compression(compression) if fmt == 'split' else compression
+    for root, _, files in os.walk(content_dir):
+        for name in sorted(files):
+            if not name.endswith('.json'):
+                continue
+            filepath = os.path.join(root, name)
+            try:
+                before = _disk_size(filepath)
+                info = _body_info(filepath)
+                if (fmt == 'inline' and info is None) or (
+                        fmt == 'split' and info is not None and info.get('encoding') == compression):
+                    stats['skipped'] += 1
+                    continue
+                write_article(filepath, read_article(filepath), fmt, compression)
+                stats['converted'] += 1
+                stats['bytes_before'] += before
+                stats['bytes_after'] += _disk_size(filepath)
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"   ❌ {filepath}: {e}")
+                stats['failed'] += 1
+    return stats
+
+
+def _disk_size(filepath: str) -> int:
+    return os.path.getsize(filepath) + sum(os.path.getsize(p) for p in _body_files(filepath))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert public/content between storage formats')
+    parser.add_argument('--to', choices=FORMATS, required=True, help='Target format')
+    parser.add_argument('--compression', choices=list(BODY_SUFFIX), default='gzip', help='Body compression for split (default: gzip)')
+    parser.add_argument('--content', default=os.path.join(os.getcwd(), 'public', 'content'), help='Content directory')
+    args = parser.parse_args()
+
+    stats = convert_tree(args.content, args.to, args.compression)
+    print(f"✅ Converted: {stats['converted']}, skipped: {stats['skipped']}, failed: {stats['failed']}")
+    if stats['converted']:
+        print(f"💾 {stats['bytes_before'] / 1024:.0f} KB -> {stats['bytes_after'] / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batch planner - how many comparisons fit in one call's output budget
+• Output tokens per article = words per article x tokens per word, both learned from
+  past complete responses (per category, then overall, then defaults)
+• Comparisons are packed first-fit into calls under max_tokens x fill; what a worker actually
+  claims is checked again (fit), the pool's order can differ from the plan's
+• Every complete response is recorded, so later plans follow the real numbers
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from article_db import ArticleDB
+
+# Before any history: the prompt asks for 5000-6000 words; Polish prose with HTML markup
+# runs ~2.8 output tokens per word
+DEFAULT_WORDS = 5500
+DEFAULT_TOKENS_PER_WORD = 2.8
+# Below this many samples a category borrows the overall figures
+MIN_SAMPLES = 3
+# "articles": [...] wrapper, ids, topics, winner
+ARTICLE_OVERHEAD = 60
+
+
+class BatchPlanner:
+    def __init__(self, db: ArticleDB, max_tokens: int, fill: float = 0.9, max_batch: int = 5, margin: float = 1.1):
+        self.db = db
+        self.budget = int(max_tokens * fill)
+        self.max_batch = max(1, max_batch)
+        self.margin = margin
+        self._estimates: Dict[Optional[str], Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _figures(self, category: Optional[str]) -> Tuple[float, float]:
+        """(words per article, tokens per word) - memoized until the next record()"""
+        with self._lock:
+            cached = self._estimates.get(category)
+        if cached:
+            return cached
+        stats = self.db.token_stats(category) if category else None
+        if not stats or stats[2] < MIN_SAMPLES:
+            stats = self.db.token_stats()
+        if stats and stats[0] > 0:
+            words, tokens, samples = stats
+            figures = (words / samples, tokens / words)
+        else:
+            figures = (DEFAULT_WORDS, DEFAULT_TOKENS_PER_WORD)
+        with self._lock:
+            self._estimates[category] = figures
+        return figures
+
+    def estimate(self, category: Optional[str] = None) -> int:
+        """Expected output tokens for one article, safety margin included"""
+        words, per_word = self._figures(category)
+        return int(words * per_word * self.margin) + ARTICLE_OVERHEAD
+
+    def plan(self, comparisons: Sequence[Tuple[str, str, str]]) -> List[List[Tuple[str, str, str]]]:
+        """First-fit in priority order; an article that alone exceeds the budget still gets its own call"""
+        calls: List[List[Tuple[str, str, str]]] = []
+        room: List[int] = []
+        for comparison in comparisons:
+            need = self.estimate(comparison[2])
+            for i, free in enumerate(room):
+                if need <= free and len(calls[i]) < self.max_batch:
+                    calls[i].append(comparison)
+                    room[i] -= need
+                    break
+            else:
+                calls.append([comparison])
+                room.append(self.budget - need)
+        return calls
+
+    def fit(self, comparisons: Sequence[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+        """The longest priority-order prefix that stays under the budget - at least one comparison"""
+        taken: List[Tuple[str, str, str]] = []
+        used = 0
+        for comparison in comparisons[:self.max_batch]:
+            need = self.estimate(comparison[2])
+            if taken and used + need > self.budget:
+                break
+            taken.append(comparison)
+            used += need
+        return taken
+
+    def record(self, comparisons: Sequence[Tuple[str, str, str]], articles: Sequence[Dict], output_tokens: int):
+        """One complete (not truncated) response: the call's output tokens are split over its
+        articles by html length ('chars' when the html was already dropped). word_count should
+        be the counted words (post_process.py), not the model's own figure."""
+        sized = []
+        for article in articles:
+            idx = article.get('comparison_id', 0) - 1
+            words = article.get('word_count') or 0
+            if 0 <= idx < len(comparisons) and isinstance(words, int) and words > 0:
+                sized.append((comparisons[idx][2], words, article.get('chars') or len(article.get('html') or '')))
+        chars = sum(s[2] for s in sized)
+        if not sized or not chars or not output_tokens:
+            return
+        self.db.record_tokens([(category, words, round(output_tokens * size / chars))
+                               for category, words, size in sized])
+        with self._lock:
+            self._estimates.clear()
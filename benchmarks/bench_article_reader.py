@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: json.load vs article_reader on public/content
+Each mode runs in its own subprocess so peak RSS is not shared
+
+    python benchmarks/bench_article_reader.py
+    python benchmarks/bench_article_reader.py --inflate 200   # Article x200 copies in a temp dir
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from article_reader import HEADER_FIELDS, field_word_count, iter_headers  # noqa: E402
+
+MODES = ('json_headers', 'reader_headers', 'json_words', 'reader_words')
+
+
+def run_mode(mode: str, content_dir: str) -> dict:
+    started = time.perf_counter()
+    checksum = 0
+    if mode == 'reader_headers':
+        for _, header in iter_headers(content_dir):
+            checksum += len(header.get('Title', ''))
+    else:
+        for root, _, files in os.walk(content_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                if mode == 'reader_words':
+                    checksum += field_word_count(path)
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if mode == 'json_headers':
+                    header = {k: data[k] for k in HEADER_FIELDS if k in data}
+                    checksum += len(header.get('Title', ''))
+                else:
+                    checksum += len(data.get('Article', '').replace('<', ' ').replace('>', ' ').split())
+    return {
+        "mode": mode,
+        "seconds": time.perf_counter() - started,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "checksum": checksum
+    }
+
+
+def inflate(content_dir: str, factor: int) -> str:
+    """Copy of the corpus with every Article repeated `factor` times"""
+    out = tempfile.mkdtemp(prefix='bench_articles_')
+    for root, _, files in os.walk(content_dir):
+        for name in files:
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data['Article'] = data.get('Article', '') * factor
+            target = os.path.join(out, os.path.relpath(root, content_dir))
+            os.makedirs(target, exist_ok=True)
+            with open(os.path.join(target, name), 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--content', default=os.path.join(ROOT, 'public', 'content'))
+    parser.add_argument('--inflate', type=int, default=1)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.content)))
+        return
+
+    content_dir = inflate(args.content, args.inflate) if args.inflate > 1 else args.content
+    try:
+        size_mb = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(content_dir) for f in fs) / 1024 / 1024
+        print(f"corpus: {content_dir} ({size_mb:.1f} MB)\n")
+        print(f"{'mode':>16} {'time':>9} {'peak RSS':>10} {'checksum':>10}")
+        for mode in MODES:
+            out = subprocess.run([sys.executable, __file__, '--mode', mode, '--content', content_dir],
+                                 capture_output=True, text=True, check=True).stdout
+            r = json.loads(out)
+            print(f"{r['mode']:>16} {r['seconds'] * 1000:>7.1f}ms {r['peak_rss_mb']:>8.1f}MB {r['checksum']:>10}")
+    finally:
+        if content_dir != args.content:
+            shutil.rmtree(content_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: article storage formats (article_store.py) on a copy of public/content
+Disk size, write time (atomic + fsync, as the autopilot writes) and cold-read time
+(page cache dropped per file with posix_fadvise) for header-only and full reads
+
+    python benchmarks/bench_article_store.py
+    python benchmarks/bench_article_store.py --copies 20   # corpus x20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from article_store import ZSTD_AVAILABLE, read_article, read_header, write_article  # noqa: E402
+
+LAYOUTS = [('inline', None), ('split', 'none'), ('split', 'gzip')] + ([('split', 'zstd')] if ZSTD_AVAILABLE else [])
+
+
+def load_corpus(content_dir: str, copies: int):
+    articles = []
+    for root, _, files in os.walk(content_dir):
+        for name in sorted(files):
+            if name.endswith('.json'):
+                with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                category = os.path.relpath(root, content_dir).split(os.sep)[0]
+                for i in range(copies):
+                    articles.append((category, f"{name[:-5]}-{i}" if copies > 1 else name[:-5], data))
+    return articles
+
+
+def drop_cache(directory: str):
+    """Evict file data pages; inodes stay cached (os.stat) so both read passes start equal"""
+    for root, _, files in os.walk(directory):
+        for name in files:
+            fd = os.open(os.path.join(root, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def disk_usage(directory: str):
+    apparent = allocated = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            st = os.stat(os.path.join(root, name))
+            apparent += st.st_size
+            allocated += st.st_blocks * 512
+    return apparent, allocated
+
+
+def timed_reads(paths, reader) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        reader(path)
+    return time.perf_counter() - started
+
+
+def bench(articles, fmt: str, compression: str) -> dict:
+    out = tempfile.mkdtemp(prefix='bench_store_')
+    try:
+        paths = []
+        started = time.perf_counter()
+        for category, slug, data in articles:
+            directory = os.path.join(out, category)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{slug}.json")
+            write_article(path, data, fmt, compression or 'gzip')
+            paths.append(path)
+        write_s = time.perf_counter() - started
+
+        apparent, allocated = disk_usage(out)
+        drop_cache(out)
+        header_s = timed_reads(paths, read_header)
+        drop_cache(out)
+        full_s = timed_reads(paths, read_article)
+        return {
+            "layout": fmt if fmt == 'inline' else f"split/{compression}",
+            "apparent_mb": apparent / 1024 / 1024,
+            "disk_mb": allocated / 1024 / 1024,
+            "write_ms": write_s * 1000 / len(paths),
+            "header_ms": header_s * 1000 / len(paths),
+            "full_ms": full_s * 1000 / len(paths)
+        }
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--content', default=os.path.join(ROOT, 'public', 'content'))
+    parser.add_argument('--copies', type=int, default=1)
+    args = parser.parse_args()
+
+    articles = load_corpus(args.content, args.copies)
+    print(f"{len(articles)} articles{'' if ZSTD_AVAILABLE else ' (zstandard not installed - zstd skipped)'}\n")
+    print(f"{'layout':>12} {'size':>9} {'on disk':>9} {'write':>10} {'cold header':>12} {'cold full':>10}")
+    for fmt, compression in LAYOUTS:
+        r = bench(articles, fmt, compression)
+        print(f"{r['layout']:>12} {r['apparent_mb']:>7.2f}MB {r['disk_mb']:>7.2f}MB "
+              f"{r['write_ms']:>7.2f}ms {r['header_ms']:>10.3f}ms {r['full_ms']:>8.3f}ms")
+    print("\n(write/read times are per article)")
+
+
+if __name__ == '__main__':
+    main()
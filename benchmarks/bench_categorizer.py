@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: keyword categorization, 100k keywords
+The old categorize_keyword (seven any(term in kw) passes, lists rebuilt per call) vs
+Categorizer.classify per keyword vs Categorizer.categorize_many on the whole batch
+
+    python benchmarks/bench_categorizer.py
+    python benchmarks/bench_categorizer.py --keywords 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from keyword_categorizer import UNKNOWN, Categorizer  # noqa: E402
+
+FILLER = "jak kiedy dlaczego co najlepszy tani ranking opinie 2026 czy warto cena gdzie ile".split()
+TOPICS = {
+    'finanse': "kredyt hipoteczny lokata obligacje fundusz inwestycyjny emerytura podatek PIT ulga bankowa".split(),
+    'zdrowie': "dieta trening witaminy suplementy odchudzanie zdrowie choroba lekarz kalorie".split(),
+    'technologia': "laptop telefon smartfon aplikacja VPN router komputer internet Android".split(),
+    'biznes': "firma marketing startup sprzedaż przedsiębiorca faktura działalność sklep".split(),
+    'prawo': "umowa rozwód spadek testament sąd pozew alimenty notariusz".split(),
+    'nieruchomosci': "mieszkanie dom nieruchomość wynajem działka remont czynsz deweloper".split(),
+    'motoryzacja': "samochód auto opony silnik ubezpieczenie OC leasing paliwo".split(),
+}
+# No category at all: news headlines, recipes, culture (RSS noise)
+OTHER = "ciasto film serial mecz koncert pogoda wakacje pies kot książka muzyka teatr".split()
+
+
+def keyword(rng: random.Random):
+    """(keyword, intended category or None)"""
+    filler = rng.sample(FILLER, rng.randint(0, 3))
+    if rng.random() < 0.2:
+        return ' '.join(filler + rng.sample(OTHER, 2)), None
+    category = rng.choice(list(TOPICS))
+    return ' '.join(filler + rng.sample(TOPICS[category], rng.randint(1, 2))), category
+
+
+def old_categorize(keyword: str) -> str:
+    """categorize_keyword before keyword_categorizer.py"""
+    kw = keyword.lower()
+    if any(t in kw for t in ['kredyt', 'hipoteczny', 'pit', 'podatek', 'ulga', 'bank', 'oszczędności', 'inwestycj', 'emerytur', 'finans', 'obligacj', 'akcj']):
+        return 'finanse'
+    if any(t in kw for t in ['dieta', 'odchudzanie', 'bmi', 'kalori', 'fitness', 'trening', 'zdrowie', 'chorob', 'witamin', 'lek', 'suplement']):
+        return 'zdrowie'
+    if any(t in kw for t in ['laptop', 'komputer', 'telefon', 'smartfon', 'aplikacj', 'program', 'ai', 'vpn', 'technolog', 'internet']):
+        return 'technologia'
+    if any(t in kw for t in ['biznes', 'firma', 'marketing', 'sprzedaż', 'startup', 'przedsiębior', 'zarządzanie']):
+        return 'biznes'
+    if any(t in kw for t in ['prawo', 'prawnik', 'umowa', 'rozwód', 'spadek', 'testament', 'sąd', 'pozew']):
+        return 'prawo'
+    if any(t in kw for t in ['mieszkanie', 'dom', 'nieruchom', 'wynajem', 'kupno', 'sprzedaż', 'lokal']):
+        return 'nieruchomosci'
+    if any(t in kw for t in ['samochód', 'auto', 'pojazd', 'silnik', 'opony', 'przegląd', 'ubezpieczenie', 'leasing', 'motoryzacj']):
+        return 'motoryzacja'
+    return 'technologia'
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keywords', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.keywords)
+    labelled = [keyword(rng) for _ in range(args.keywords)]
+    keywords = [k for k, _ in labelled]
+
+    old, old_s = timed(lambda: [old_categorize(k) for k in keywords])
+    categorizer, build_s = timed(Categorizer)
+    single, single_s = timed(lambda: [categorizer.classify(k) for k in keywords])
+    batch, batch_s = timed(categorizer.categorize_many, keywords)
+    assert single == batch
+
+    n = len(keywords)
+    print(f"{n} keywords, pattern compiled in {build_s * 1000:.1f} ms\n")
+    print(f"{'':>18} | {'total s':>8} | {'µs/keyword':>10} | {'right':>6} | {'wrong':>6} | {'missed':>6}")
+    for name, seconds, categories in (('old any() passes', old_s, old),
+                                      ('classify()', single_s, [c for c, _ in single]),
+                                      ('categorize_many()', batch_s, [c for c, _ in batch])):
+        # Right: the intended category, or UNKNOWN for a keyword that has none;
+        # missed: UNKNOWN although it has one (goes to review, not to a wrong category)
+        right = wrong = missed = 0
+        for (_, want), got in zip(labelled, categories):
+            if got == (want or UNKNOWN):
+                right += 1
+            elif got == UNKNOWN:
+                missed += 1
+            else:
+                wrong += 1
+        print(f"{name:>18} | {seconds:>8.2f} | {seconds / n * 1e6:>10.1f} | {right / n:>6.1%} | "
+              f"{wrong / n:>6.1%} | {missed / n:>6.1%}")
+
+
+if __name__ == '__main__':
+    main()
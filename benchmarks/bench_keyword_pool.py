@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: keyword pool claim + mark-used vs pool size
+Full JSON rewrite per change (the old way) vs KeywordPool (heap + fsync-ed journal);
+the compaction every compact_every changes is timed separately
+
+    python benchmarks/bench_keyword_pool.py
+    python benchmarks/bench_keyword_pool.py --sizes 100000 500000 --ops 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from keyword_pool import KeywordPool  # noqa: E402
+from safe_io import atomic_write_json  # noqa: E402
+
+CATEGORIES = ('finanse', 'zdrowie', 'technologia', 'biznes', 'prawo', 'nieruchomosci', 'motoryzacja')
+WORDS = ("jak kiedy dlaczego co kredyt lokata dieta trening laptop telefon umowa spółka mieszkanie "
+         "podatek fundusz akcje rower samochód ubezpieczenie leasing router serwer sklep").split()
+
+
+def build(path: str, n: int, rng: random.Random):
+    today = date.today()
+    pool = [{
+        "keyword": f"{' '.join(rng.choice(WORDS) for _ in range(4))} {i}",
+        "category": rng.choice(CATEGORIES),
+        "generated_by": "bench",
+        "generated_date": (today - timedelta(days=rng.randint(0, 60))).isoformat(),
+        "priority": rng.randint(1, 10),
+        "used": rng.random() < 0.3
+    } for i in range(n)]
+    atomic_write_json(path, {"generated_date": today.isoformat(), "pool": pool}, indent=2)
+
+
+def old_way(path: str, ops: int) -> float:
+    """Load, scan for the first unused keyword, mark it, dump the whole file - per keyword"""
+    started = time.perf_counter()
+    for _ in range(ops):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entry = next(e for e in data['pool'] if not e['used'])
+        entry['used'] = True
+        entry['used_date'] = date.today().isoformat()
+        atomic_write_json(path, data, indent=2)
+    return (time.perf_counter() - started) / ops
+
+
+def bench(n: int, ops: int, old_ops: int):
+    workdir = tempfile.mkdtemp(prefix='bench_pool_')
+    try:
+        path = os.path.join(workdir, 'keywords_pool.json')
+        build(path, n, random.Random(n))
+
+        t = time.perf_counter()
+        pool = KeywordPool(path, compact_every=ops + 1)
+        load_ms = (time.perf_counter() - t) * 1000
+
+        t = time.perf_counter()
+        for entry in pool.claim(ops):
+            pool.mark_used(entry['keyword'])
+        pool_us = (time.perf_counter() - t) / ops * 1e6
+
+        t = time.perf_counter()
+        pool.close()
+        compact_ms = (time.perf_counter() - t) * 1000
+
+        old_us = old_way(path, old_ops) * 1e6
+        print(f"{n:>9} | {old_us / 1000:>11.1f} | {pool_us:>10.1f} | {load_ms:>9.0f} | {compact_ms:>10.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 300_000])
+    parser.add_argument('--ops', type=int, default=1000, help='Keywords claimed + marked used per size')
+    parser.add_argument('--old-ops', type=int, default=3, help='Full rewrites timed for the old way')
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} | {'rewrite ms':>11} | {'pool µs':>10} | {'load ms':>9} | {'compact ms':>10}")
+    for n in args.sizes:
+        bench(n, args.ops, args.old_ops)
+
+
+if __name__ == '__main__':
+    main()
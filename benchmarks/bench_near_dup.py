@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: near-duplicate title lookup vs corpus size
+MinHash + LSH bands in articles.sqlite (ArticleDB.similar_titles) vs comparing the title
+against every stored title (the exact Jaccard scan it replaces); bodies are short here,
+only the title index is queried
+
+    python benchmarks/bench_near_dup.py
+    python benchmarks/bench_near_dup.py --sizes 100000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import near_dup  # noqa: E402
+from article_db import ArticleDB  # noqa: E402
+
+CATEGORIES = ('finanse', 'zdrowie', 'technologia', 'biznes', 'prawo', 'nieruchomosci', 'motoryzacja')
+SYLLABLES = "ka ro mi lo ta wy sze nie ku pa dro gra zdro wie pod da tek lek bez mo to cy kle".split()
+SUBTITLES = ("kompletny przewodnik 2026", "praktyczne porady", "jak wybrać", "krok po kroku", "fakty i mity")
+
+
+def vocabulary(rng: random.Random, size: int = 20_000):
+    """Made-up words of 2-4 syllables - a corpus vocabulary, not a handful of repeated topics"""
+    return sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)})
+
+
+def title(rng: random.Random, words) -> str:
+    return f"{' '.join(rng.sample(words, rng.randint(3, 5)))} - {rng.choice(SUBTITLES)}"
+
+
+def build(db: ArticleDB, n: int, rng: random.Random, words) -> list:
+    titles = []
+    for start in range(0, n, 1000):
+        with db._write():
+            for i in range(start, min(n, start + 1000)):
+                titles.append(title(rng, words))
+                db._upsert(f"{rng.choice(CATEGORIES)}/bench-{i}.json", {"Title": titles[-1], "Article": f"<p>{titles[-1]}</p>"},
+                           '', 'tree', None, None)
+    return titles
+
+
+def bench(n: int, queries: int, scan_queries: int):
+    workdir = tempfile.mkdtemp(prefix='bench_near_dup_')
+    try:
+        rng = random.Random(n)
+        db = ArticleDB(os.path.join(workdir, 'articles.sqlite'))
+        words = vocabulary(rng)
+        t = time.perf_counter()
+        titles = build(db, n, rng, words)
+        build_s = time.perf_counter() - t
+
+        # Half stored titles with a new subtitle (should be found), half new titles
+        probes = [(f"{rng.choice(titles).split(' - ')[0]} - {rng.choice(SUBTITLES)}" if q % 2 else title(rng, words))
+                  for q in range(queries)]
+        hits = 0
+        t = time.perf_counter()
+        for probe in probes:
+            hits += bool(db.similar_titles(probe))
+        lsh_us = (time.perf_counter() - t) / queries * 1e6
+
+        # Old way: every title's shingles against the probe's
+        t = time.perf_counter()
+        for probe in probes[:scan_queries]:
+            shingles = near_dup.title_shingles(probe)
+            sum(1 for other in titles
+                if len(shingles & (s := near_dup.title_shingles(other))) / (len(shingles | s) or 1) >= near_dup.TITLE_THRESHOLD)
+        scan_ms = (time.perf_counter() - t) / scan_queries * 1000
+        db.close()
+        print(f"{n:>9} | {build_s:>8.1f} | {scan_ms:>9.1f} | {lsh_us:>8.0f} | {hits / queries:>6.0%}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=1000, help='LSH lookups timed per size')
+    parser.add_argument('--scan-queries', type=int, default=3, help='Full scans timed for the old way')
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} | {'build s':>8} | {'scan ms':>9} | {'LSH µs':>8} | {'found':>6}")
+    for n in args.sizes:
+        bench(n, args.queries, args.scan_queries)
+
+
+if __name__ == '__main__':
+    main()
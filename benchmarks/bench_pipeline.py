@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: the whole VS pipeline (run()) against mock_anthropic_server.py - no network, no cost
+Each scenario runs the autopilot in its own subprocess and temp dir (fresh database, seed list,
+telemetry) so CPU time and peak RSS are its own; the mock runs here with the same seed every time
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --vs 40 --workers 1 4 --stream --ttfb 1 --tps 2000
+    python benchmarks/bench_pipeline.py --rate-429 0.1 --truncate 0.1 --malformed 0.02 --json
+    python benchmarks/bench_pipeline.py --stream --tps 2000 --defective 0.2 --post-workers 0 4
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from mock_anthropic_server import add_arguments, from_arguments  # noqa: E402
+from telemetry import read_records, summarize  # noqa: E402
+
+CATEGORIES = ('finanse', 'zdrowie', 'technologia', 'biznes', 'prawo', 'nieruchomosci')
+SYLLABLES = "ka ro mi lo ta wy sze nie ku pa dro gra zdro wie pod da tek lek bez mo to cy kle".split()
+
+
+def topic(i: int) -> str:
+    """Distinct made-up topic names - "Produkt 1" / "Produkt 2" would be near duplicates (near_dup.py)"""
+    rng = random.Random(i)
+    return ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(2)).capitalize()
+
+
+def prepare(workdir: str, vs: int, workers: int, stream: bool, post_workers: int):
+    """config.json, keys.config and a seed list with exactly `vs` comparisons"""
+    config = {
+        "workers": workers,
+        "stream": stream,
+        "post_process_workers": post_workers,
+        "response_cache": False,
+        # The mock has no limits; the limiter should not be what is measured
+        "rate_limits": {"requests_per_minute": 100000, "input_tokens_per_minute": 1e9,
+                        "output_tokens_per_minute": 1e9, "base_backoff": 0.5},
+        "progress_flush_every": 10
+    }
+    keys = {"claude": {"api_key": "sk-ant-mock"}, "budget": {"claude_total_budget": 1e6}}
+    seeds = {"generated_date": "bench", "vs_comparisons": [
+        {"a": topic(2 * i), "b": topic(2 * i + 1), "category": CATEGORIES[i % len(CATEGORIES)], "priority": 5}
+        for i in range(vs)
+    ]}
+    for name, data in (('config.json', config), ('keys.config', keys), ('vs_seed_list.json', seeds)):
+        with open(os.path.join(workdir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_child(vs: int) -> dict:
+    """In the scenario's temp dir; the autopilot's own output goes to /dev/null.
+    CPU includes the post-processing pool (children are reaped when run() shuts it down)."""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        from claude_premium_v11_FINAL import ClaudePremiumAutopilot
+        bot = ClaudePremiumAutopilot()
+        started = time.perf_counter()
+        cpu = time.process_time() + _children_cpu()
+        bot.run(vs_target=vs)
+        wall = time.perf_counter() - started
+        cpu = time.process_time() + _children_cpu() - cpu
+        bot.telemetry.flush()
+        articles = bot._generated_vs
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    records = list(read_records(bot.telemetry_file))
+    summary = summarize(iter(records))
+    parse = [r for r in records if r['kind'] == 'stage' and r['stage'] == 'parse']
+    post = [r for r in records if r['kind'] == 'stage' and r['stage'] == 'post']
+    return {
+        "articles": articles,
+        "wall_s": wall,
+        "articles_per_min": articles / (wall / 60) if wall > 0 else 0.0,
+        "cpu_s": cpu,
+        "cpu_ms_per_article": cpu * 1000 / articles if articles else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "calls": summary['calls'],
+        "retries": summary['retries'],
+        # Parse failures: malformed articles the stream parser skipped / responses with nothing parsable
+        "bad_articles": sum(r.get('errors') or 0 for r in parse),
+        "bad_responses": sum(1 for r in parse if r.get('outcome') == 'error'),
+        # Failed the post-processing gates - queued for regeneration, not published
+        "rejected": sum(1 for r in post if r.get('outcome') == 'rejected'),
+        "post_ms_per_article": sum(r['ms'] for r in post) / len(post) if post else 0.0,
+        "outcomes": summary['outcomes']
+    }
+
+
+def run_scenario(args: argparse.Namespace, workers: int, post_workers: int) -> dict:
+    server = from_arguments(args).start()
+    workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        prepare(workdir, args.vs, workers, args.stream, post_workers)
+        env = dict(os.environ, ANTHROPIC_BASE_URL=server.url, PYTHONPATH=ROOT)
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--vs', str(args.vs)],
+                             cwd=workdir, env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise RuntimeError(f"workers={workers}: child failed\n{out.stderr[-2000:]}")
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result.update(workers=workers, post_workers=post_workers, stream=args.stream, mock=dict(server.stats))
+        return result
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end pipeline benchmark against the mock API')
+    parser.add_argument('--vs', type=int, default=20, help='Articles per scenario (default: 20)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help='One scenario per value (default: 1 4)')
+    parser.add_argument('--post-workers', type=int, nargs='+', default=[2],
+                        help='post_process_workers per scenario, 0 = in the saving thread (default: 2)')
+    parser.add_argument('--stream', action='store_true', help='SSE responses (incremental parsing)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON (CI artifacts)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.vs)))
+        return
+
+    results = [run_scenario(args, workers, post_workers)
+               for workers in args.workers for post_workers in args.post_workers]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"mock: ttfb {args.ttfb}s, {args.tps or 'unpaced'} tok/s, {args.words} words, "
+          f"429 {args.rate_429:.0%}, 529 {args.rate_529:.0%}, truncate {args.truncate:.0%}, "
+          f"malformed {args.malformed:.0%}, defective {args.defective:.0%}, seed {args.seed}\n")
+    print(f"{'workers':>7} {'post':>4} {'articles':>8} {'wall':>8} {'art/min':>8} {'CPU':>8} {'CPU/art':>9} "
+          f"{'peak RSS':>9} {'calls':>6} {'retries':>7} {'bad art':>7} {'bad resp':>8} {'rejected':>8} {'post/art':>9}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['post_workers']:>4} {r['articles']:>4}/{args.vs:<3} {r['wall_s']:>7.1f}s {r['articles_per_min']:>8.1f} "
+              f"{r['cpu_s']:>7.2f}s {r['cpu_ms_per_article']:>7.1f}ms {r['peak_rss_mb']:>7.1f}MB "
+              f"{r['calls']:>6} {r['retries']:>7} {r['bad_articles']:>7} {r['bad_responses']:>8} "
+              f"{r['rejected']:>8} {r['post_ms_per_article']:>7.1f}ms")
+    for r in results:
+        print(f"   workers {r['workers']}: calls {json.dumps(r['outcomes'])}, mock {json.dumps(r['mock'])}")
+
+
+if __name__ == '__main__':
+    main()
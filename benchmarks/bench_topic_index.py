@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark: check_vs_exists lookup cost vs corpus size
+Linear title scan (old) vs TopicIndex (pair set + trigram index)
+
+    python benchmarks/bench_topic_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from topic_index import TopicIndex  # noqa: E402
+
+WORDS = ("kredyt hipoteczny gotówkowy leasing lokata obligacje konto karta dieta trening laptop "
+         "telefon umowa spółka mieszkanie dom wynajem sprzedaż podatek ulga fundusz akcje rower "
+         "bieżnia joga pilates chmura dysk router serwer franczyza sklep magazyn marketing").split()
+
+
+def random_topic(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).capitalize() + f" {rng.randint(1, 9999)}"
+
+
+def build(n: int, rng: random.Random):
+    titles = []
+    for _ in range(n):
+        titles.append(f"{random_topic(rng)} vs {random_topic(rng)} - Które Wybrać? [Porównanie 2026]".lower())
+    return titles
+
+
+def bench(n: int, queries: int = 200):
+    rng = random.Random(n)
+    titles = build(n, rng)
+    probes = [(random_topic(rng), random_topic(rng)) for _ in range(queries)]
+
+    index = TopicIndex()
+    t = time.perf_counter()
+    index.update(titles=titles)
+    build_ms = (time.perf_counter() - t) * 1000
+
+    t = time.perf_counter()
+    for a, b in probes:
+        ab, ba = f"{a} vs {b}".lower(), f"{b} vs {a}".lower()
+        any(ab in e or ba in e for e in titles)
+    linear_us = (time.perf_counter() - t) / queries * 1e6
+
+    t = time.perf_counter()
+    for a, b in probes:
+        index.has_pair(a, b) or index.contains(f"{a} vs {b}") or index.contains(f"{b} vs {a}")
+    indexed_us = (time.perf_counter() - t) / queries * 1e6
+
+    print(f"{n:>8} | {linear_us:>12.1f} | {indexed_us:>12.1f} | {build_ms:>10.0f}")
+
+
+if __name__ == "__main__":
+    print(f"{'articles':>8} | {'linear µs':>12} | {'indexed µs':>12} | {'build ms':>10}")
+    for n in (1_000, 10_000, 50_000, 100_000):
+        bench(n)
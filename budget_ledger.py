@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Budget ledger - claude_total_budget enforced before money is spent, across runs and processes
+• spent = every API call recorded in articles.sqlite since the last budget reset
+• reserve() holds a request's worst-case cost (prompt + max_tokens) before it is sent;
+  the real cost lands in api_calls and the hold is released
+• Holds live in the database, so parallel processes see each other's requests in flight
+• First run: progress_claude.json's total_cost (spend from before the ledger) becomes an
+  opening row, so the cap keeps counting it
+"""
+
+import time
+from typing import Optional
+
+from article_db import ArticleDB
+
+
+class BudgetLedger:
+    def __init__(self, db: ArticleDB, cap: float, opening: float = 0.0):
+        self.db = db
+        self.cap = float(cap)
+        self.since = float(db.get_setting('budget_since', '0'))
+        if db.get_setting('budget_opening') is None:
+            # Only what api_calls does not already have (a run of an earlier ledger without this)
+            carried = max(0.0, float(opening) - db.total_cost())
+            if carried > 0:
+                db.record_opening(carried)
+                print(f"🧾 Budget: ${carried:.4f} spent before the ledger carried over from progress")
+            db.set_setting('budget_opening', repr(carried))
+        purged = db.purge_reservations()
+        if purged:
+            print(f"🧾 Budget: released {purged} hold(s) left by an interrupted run")
+
+    def spent(self) -> float:
+        """Since the last reset - what the cap is checked against"""
+        return self.db.total_cost(self.since)
+
+    def lifetime(self) -> float:
+        return self.db.total_cost()
+
+    def reserved(self) -> float:
+        return self.db.reserved()
+
+    def available(self) -> float:
+        """What can still be committed: cap - spent - holds of requests in flight"""
+        return self.cap - self.spent() - self.reserved()
+
+    def reserve(self, amount: float) -> Optional[int]:
+        return self.db.reserve(amount, self.cap, self.since)
+
+    def release(self, reservation_id: Optional[int]):
+        """After the real cost was recorded (or the request failed)"""
+        if reservation_id is not None:
+            self.db.release(reservation_id)
+
+    def reset(self):
+        """Start counting from zero - earlier calls stay in api_calls"""
+        self.since = time.time()
+        self.db.set_setting('budget_since', repr(self.since))
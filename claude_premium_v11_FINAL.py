@@ -13,11 +13,33 @@
 import json
 import os
 import re
+import threading
 import time
 import requests
+import requests.adapters
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Set, Optional, Tuple
 
+from article_db import ArticleDB
+from batch_planner import BatchPlanner
+from budget_ledger import BudgetLedger
+from content_index import ContentIndex
+from content_manifest import ContentManifest
+from content_validator import html_word_count
+from hedging import HedgeRace, TtfbTracker
+from keyword_categorizer import categorize, categorize_many
+from keyword_pool import KeywordPool
+from post_process import MAX_TABLE_ROWS, MIN_TABLE_ROWS, MIN_WORDS, PostProcessor, process_article
+from rate_limiter import RateLimiter, parse_retry_after
+from response_cache import ResponseCache
+from article_store import FORMATS as STORAGE_FORMATS, write_article
+from safe_io import Journal, atomic_write_json
+from telemetry import Telemetry
+from stream_json import ArticleStreamParser, parse_articles
+from topic_index import TopicIndex
+from trend_ingest import TrendIngest
+
 # Google Trends
 try:
     from pytrends.request import TrendReq
@@ -25,17 +47,12 @@ try:
 except ImportError:
     TRENDS_AVAILABLE = False
 
-# RSS Parser
-try:
-    import feedparser
-    RSS_AVAILABLE = True
-except ImportError:
-    RSS_AVAILABLE = False
-
 class ClaudePremiumAutopilot:
-    def __init__(self, config_path: str = "config.json", keys_path: str = "keys.config"):
+    def __init__(self, config_path: str = "config.json", keys_path: str = "keys.config", options: Optional[Dict] = None):
         self.config = self._load_json(config_path)
         self.keys = self._load_json(keys_path)
+        # CLI flags override config.json
+        self.options = {k: v for k, v in (options or {}).items() if v is not None}
         
         self._validate_keys()
         
@@ -44,24 +61,136 @@ class ClaudePremiumAutopilot:
         self.vs_seed_file = os.path.join(os.getcwd(), 'vs_seed_list.json')
         self.pool_file = os.path.join(os.getcwd(), 'keywords_pool.json')
         self.progress_file = os.path.join(os.getcwd(), 'progress_claude.json')
+        self.journal_file = os.path.join(os.getcwd(), 'progress_claude.journal')
+        self.telemetry_file = os.path.join(os.getcwd(), self._setting('telemetry_file', 'telemetry.jsonl'))
+        self.manifest_file = os.path.join(os.getcwd(), 'content_manifest.json')
+        self.database_file = os.path.join(os.getcwd(), self._setting('database', 'articles.sqlite'))
+        self.content_index_dir = os.path.join(os.getcwd(), 'public', 'content-index')
         os.makedirs(self.base_content_dir, exist_ok=True)
+        # inline: one JSON per article; split: JSON header + compressed body (article_store.py)
+        self.storage_format = self._setting('storage_format', 'inline')
+        self.storage_compression = self._setting('storage_compression', 'gzip')
         
-        # State
+        # State - one stat pass over the tree, only changed files are re-read
+        self.manifest = ContentManifest(self.base_content_dir, self.manifest_file)
+        added, changed, removed = self.manifest.refresh(full=bool(self._setting('rescan', False)))
+        if added or changed or removed:
+            print(f"🗂️  Manifest: +{added} ~{changed} -{removed}")
+            self.manifest.save()
+        
+        # Listing + search index for the API routes (public/content-index); unchanged corpus = no work
+        self.content_index = ContentIndex(self.content_index_dir)
+        if added or changed or removed or not self.content_index.exists():
+            self.content_index.rebuild(self.manifest.entries())
+            self.content_index.save()
+        
+        # Article database - slug / category / topic-pair lookups are indexed queries;
+        # files added or edited by hand are pulled in (only those whose hash differs)
+        self.db = ArticleDB(self.database_file)
+        saved, deleted = self.db.sync_tree(self.base_content_dir, self.manifest.entries())
+        if saved or deleted:
+            print(f"🗃️  Database: {saved} synced from {os.path.basename(self.base_content_dir)}, {deleted} removed")
+        # Near-duplicate check (near_dup.py): titles before the API call, bodies at save; 0 = off.
+        # Stricter than the report's 0.6 - "A vs B" and "A vs C" share a topic, a skip is never retried
+        self.near_dup_threshold = float(self._setting('near_dup_threshold', 0.7))
+        filled = self.db.backfill_minhash()
+        if filled:
+            print(f"🧮 Near-duplicate signatures: {filled} articles")
+        # Post-processing (post_process.py): sanitized html, real word count and winner, quality gates.
+        # Runs in worker processes while the stream goes on (0 = in the saving thread); a rejected
+        # article is not published, its pair is generated again first, up to max_regenerate_attempts
+        self.post_rules = {"min_words": int(self._setting('min_words', MIN_WORDS)),
+                           "table_rows": tuple(self._setting('table_rows', [MIN_TABLE_ROWS, MAX_TABLE_ROWS]))}
+        self.post_workers = int(self._setting('post_process_workers', min(4, (os.cpu_count() or 1) - 1)))
+        self.max_regenerate = int(self._setting('max_regenerate_attempts', 2))
+        self.post_processor: Optional[PostProcessor] = None
+        self._regenerate_issues: Dict[str, List[str]] = {}
+        self.run_id = None
+        # Per-call / per-stage timings for `python telemetry.py report`
+        self.telemetry = Telemetry(self.telemetry_file if self._setting('telemetry', True) else None)
+        # Comparisons per call follow the output budget and the tokens/word seen so far
+        self.planner = BatchPlanner(self.db, self.MAX_TOKENS,
+                                    fill=float(self._setting('batch_fill', 0.9)),
+                                    max_batch=int(self._setting('max_batch_size', 5)))
         self.existing_slugs = self._get_existing_slugs()
         self.existing_keywords = self._get_existing_keywords()
+        self.topic_index = TopicIndex()
+        self.topic_index.update(self.existing_slugs, self.existing_keywords)
         self.progress_data = self._load_progress()
+        # Counts from before articles.sqlite: those articles were imported as 'tree', not 'generated' -
+        # kept once as a baseline the database counts are added to
+        if 'baseline' not in self.progress_data:
+            generated = self.db.count_by_category(source='generated')
+            self.progress_data['baseline'] = {
+                "vs_generated": max(0, self.progress_data.get('vs_generated', 0) - sum(generated.values())),
+                "by_category": {category: count - generated.get(category, 0)
+                                for category, count in self.progress_data.get('by_category', {}).items()
+                                if count > generated.get(category, 0)}
+            }
+        # Budget across runs: spend comes from api_calls (seeded once with the progress file's
+        # total_cost), requests in flight hold their worst case
+        self.ledger = BudgetLedger(self.db, self.keys.get('budget', {}).get('claude_total_budget', 10),
+                                   opening=self.progress_data.get('total_cost', 0.0))
         self.total_cost = 0.0
+        self.usage_totals: Dict[str, int] = {}
         self.articles_stats = {"success": 0, "failed": 0, "total_words": 0}
         
+        # Concurrency: one lock for shared state, claimed pairs are never handed out twice
+        self._lock = threading.RLock()
+        self._claimed: Set[str] = set()
+        self._stop = threading.Event()
+        
+        # Write-ahead journal: every save is logged at once, the progress snapshot is
+        # rewritten every progress_flush_every saves / progress_flush_seconds
+        self.flush_every = int(self._setting('progress_flush_every', 10))
+        self.flush_seconds = float(self._setting('progress_flush_seconds', 30))
+        self._last_flush = time.monotonic()
+        self._unflushed = 0
+        snapshot_seq = self.progress_data.get('journal_seq', 0)
+        self.journal = Journal(self.journal_file, snapshot_seq)
+        replayed = self.journal.read(snapshot_seq)
+        if replayed:
+            for record in replayed:
+                self._apply_journal(record)
+            print(f"📒 Journal: {len(replayed)} saves recovered from an interrupted run")
+        
+        # API - one limiter shared by every worker
+        # --base-url > ANTHROPIC_BASE_URL > config.json (a local mock: mock_anthropic_server.py)
+        self.api_base_url = (self.options.get('api_base_url') or os.getenv('ANTHROPIC_BASE_URL') or
+                             self.config.get('api_base_url') or 'https://api.anthropic.com').rstrip('/')
+        self.rate_limiter = RateLimiter(**self._setting('rate_limits', {}))
+        self.stream = bool(self._setting('stream', False))
+        
+        # Hedging: a request with no first token after the hedge_percentile of observed TTFB
+        # gets a duplicate; the first to stream wins. Needs streaming to see the first token.
+        self.hedge = bool(self._setting('hedge', False))
+        self.hedge_percentile = float(self._setting('hedge_percentile', 95))
+        self.hedge_min_delay = float(self._setting('hedge_min_delay', 5))
+        self.hedge_min_samples = int(self._setting('hedge_min_samples', 20))
+        self.hedge_budget = float(self._setting('hedge_budget', 1.0))
+        self.hedge_spent = 0.0
+        self.ttfb = TtfbTracker()
+        if self.hedge:
+            self.stream = True
+            self.ttfb.seed(self.db.recent_ttfb())
+        self.session = self._create_session()
+        self.connect_timeout = float(self._setting('connect_timeout', 10))
+        self.request_timeout = float(self._setting('request_timeout', 300))
+        self.stream_idle_timeout = float(self._setting('stream_idle_timeout', 60))
+        
+        # Response cache - a re-run never pays twice for the same prompt
+        self.replay = bool(self._setting('replay', False))
+        self.response_cache = None
+        if self.replay or self._setting('response_cache', True):
+            self.response_cache = ResponseCache(
+                os.path.join(os.getcwd(), 'claude_cache.sqlite'),
+                ttl_days=float(self._setting('cache_ttl_days', 30)),
+                max_mb=float(self._setting('cache_max_mb', 500))
+            )
+        
         # Initialize VS seed list
         self._init_vs_seed_list()
         
-        # Trends
-        if TRENDS_AVAILABLE:
-            self.pytrends = TrendReq(hl='pl', tz=60)
-        else:
-            self.pytrends = None
-        
         self._print_status()
 
     def _load_json(self, path: str) -> dict:
@@ -72,6 +201,12 @@ class ClaudePremiumAutopilot:
             print(f"❌ Error loading {path}: {e}")
             exit(1)
 
+    def _setting(self, name: str, default=None):
+        """CLI option > config.json > default"""
+        if name in self.options:
+            return self.options[name]
+        return self.config.get(name, default)
+
     def _validate_keys(self):
         if not self.keys.get('claude', {}).get('api_key'):
             print(f"❌ CLAUDE_API_KEY missing in keys.config")
@@ -87,46 +222,30 @@ class ClaudePremiumAutopilot:
         print(f"🚀 CLAUDE PREMIUM AUTOPILOT v11.0 FINAL")
         print(f"{'='*70}")
         print(f"📂 Existing articles: {len(self.existing_slugs)}")
-        print(f"💰 Budget: ${self.keys.get('budget', {}).get('claude_total_budget', 10):.2f}")
+        print(f"💰 Budget: ${self.ledger.spent():.2f} spent of ${self.ledger.cap:.2f}")
         print(f"📍 Output: {self.base_content_dir}")
+        print(f"🗃️  Database: {os.path.basename(self.database_file)}")
+        if self.response_cache:
+            stats = self.response_cache.stats()
+            print(f"♻️  Response cache: {stats['entries']} entries, {stats['size_mb']} MB{' (REPLAY)' if self.replay else ''}")
         print(f"{'='*70}\n")
 
     def _get_existing_slugs(self) -> Set[str]:
-        slugs = set()
-        if not os.path.exists(self.base_content_dir):
-            return slugs
-        for root, _, files in os.walk(self.base_content_dir):
-            for f in files:
-                if f.endswith('.json'):
-                    slugs.add(f.replace('.json', ''))
-        return slugs
+        return self.db.slugs()
 
     def _get_existing_keywords(self) -> Set[str]:
-        keywords = set()
-        if not os.path.exists(self.base_content_dir):
-            return keywords
-        
-        for root, _, files in os.walk(self.base_content_dir):
-            for f in files:
-                if f.endswith('.json'):
-                    try:
-                        with open(os.path.join(root, f), 'r', encoding='utf-8') as file:
-                            data = json.load(file)
-                            title = data.get('Title', '').lower()
-                            if title:
-                                keywords.add(title)
-                    except:
-                        pass
-        
-        return keywords
+        return self.db.titles()
 
     def _load_progress(self) -> dict:
         if os.path.exists(self.progress_file):
             try:
                 with open(self.progress_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
-            except:
-                pass
+            except (OSError, ValueError) as e:
+                # Keep the damaged file for inspection instead of silently starting from zero
+                corrupt = f"{self.progress_file}.corrupt-{datetime.now():%Y%m%d%H%M%S}"
+                os.replace(self.progress_file, corrupt)
+                print(f"⚠️  {os.path.basename(self.progress_file)} unreadable ({e}), moved to {os.path.basename(corrupt)}")
         return {
             "articles_generated": 0,
             "vs_generated": 0,
@@ -135,17 +254,55 @@ class ClaudePremiumAutopilot:
             "success_rate": 1.0
         }
 
-    def _save_progress(self):
+    def _apply_journal(self, record: Dict):
+        """Fold one journal record into progress_data - same path live and on replay.
+        Articles are not journaled - they are committed to the database as they are saved"""
+        if record['type'] == 'batch_result':
+            job = self.progress_data.get('batch_job')
+            if job and job['id'] == record['job'] and record['custom_id'] not in job['processed']:
+                job['processed'].append(record['custom_id'])
+
+    def _journal(self, record: Dict):
+        with self._lock:
+            self.journal.append(record)
+            self._apply_journal(record)
+
+    def _save_progress(self, force: bool = False):
+        """Progress snapshot (+ content index, manifest) - only when a flush is due or forced;
+        saves in between are already durable in the database / journal"""
         try:
-            self.progress_data['total_cost'] = self.total_cost
-            self.progress_data['last_run'] = datetime.now().isoformat()
-            if self.articles_stats['success'] + self.articles_stats['failed'] > 0:
-                self.progress_data['success_rate'] = (
-                    self.articles_stats['success'] / (self.articles_stats['success'] + self.articles_stats['failed'])
-                )
-            
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(self.progress_data, f, ensure_ascii=False, indent=2)
+            with self._lock:
+                due = (self.journal.pending + self._unflushed >= self.flush_every or
+                       time.monotonic() - self._last_flush >= self.flush_seconds)
+                if not (force or due):
+                    return
+                
+                # Lifetime spend - never lowered (a reset only restarts budget_spent); run_cost is this run
+                self.progress_data['total_cost'] = max(self.progress_data.get('total_cost', 0.0), self.ledger.lifetime())
+                self.progress_data['budget_spent'] = self.ledger.spent()
+                self.progress_data['run_cost'] = self.total_cost
+                self.progress_data['last_run'] = datetime.now().isoformat()
+                if self.articles_stats['success'] + self.articles_stats['failed'] > 0:
+                    self.progress_data['success_rate'] = (
+                        self.articles_stats['success'] / (self.articles_stats['success'] + self.articles_stats['failed'])
+                    )
+                self.progress_data['journal_seq'] = self.journal.last_seq
+                # Counts come from the database (indexed GROUP BY), not from incrementing the snapshot
+                baseline = self.progress_data['baseline']
+                by_category = self.db.count_by_category(source='generated')
+                self.progress_data['vs_generated'] = baseline['vs_generated'] + sum(by_category.values())
+                for category, count in baseline['by_category'].items():
+                    by_category[category] = by_category.get(category, 0) + count
+                self.progress_data['by_category'] = dict(sorted(by_category.items()))
+                
+                atomic_write_json(self.progress_file, self.progress_data, indent=2)
+                self.journal.checkpoint()
+                self._last_flush = time.monotonic()
+                self._unflushed = 0
+                
+                # Index before manifest: a crash in between is caught by the next refresh
+                self.content_index.save()
+                self.manifest.save()
         except Exception as e:
             print(f"⚠️ Progress save error: {e}")
 
@@ -158,24 +315,8 @@ class ClaudePremiumAutopilot:
         return re.sub(r'-+', '-', s)
 
     def categorize_keyword(self, keyword: str) -> str:
-        kw = keyword.lower()
-        
-        if any(t in kw for t in ['kredyt', 'hipoteczny', 'pit', 'podatek', 'ulga', 'bank', 'oszczędności', 'inwestycj', 'emerytur', 'finans', 'obligacj', 'akcj']):
-            return 'finanse'
-        if any(t in kw for t in ['dieta', 'odchudzanie', 'bmi', 'kalori', 'fitness', 'trening', 'zdrowie', 'chorob', 'witamin', 'lek', 'suplement']):
-            return 'zdrowie'
-        if any(t in kw for t in ['laptop', 'komputer', 'telefon', 'smartfon', 'aplikacj', 'program', 'ai', 'vpn', 'technolog', 'internet']):
-            return 'technologia'
-        if any(t in kw for t in ['biznes', 'firma', 'marketing', 'sprzedaż', 'startup', 'przedsiębior', 'zarządzanie']):
-            return 'biznes'
-        if any(t in kw for t in ['prawo', 'prawnik', 'umowa', 'rozwód', 'spadek', 'testament', 'sąd', 'pozew']):
-            return 'prawo'
-        if any(t in kw for t in ['mieszkanie', 'dom', 'nieruchom', 'wynajem', 'kupno', 'sprzedaż', 'lokal']):
-            return 'nieruchomosci'
-        if any(t in kw for t in ['samochód', 'auto', 'pojazd', 'silnik', 'opony', 'przegląd', 'ubezpieczenie', 'leasing', 'motoryzacj']):
-            return 'motoryzacja'
-        
-        return 'technologia'
+        """Category by weighted terms (keyword_categorizer.py); 'unknown' when nothing clearly matches"""
+        return categorize(keyword)
 
     # ==================== VS SEED LIST ====================
     
@@ -256,73 +397,119 @@ class ClaudePremiumAutopilot:
             ]
         }
         
-        with open(self.vs_seed_file, 'w', encoding='utf-8') as f:
-            json.dump(seed_data, f, ensure_ascii=False, indent=2)
+        atomic_write_json(self.vs_seed_file, seed_data, indent=2)
         
         print(f"✅ Created VS seed list: {len(seed_data['vs_comparisons'])} comparisons")
 
     def check_vs_exists(self, topic_a: str, topic_b: str) -> bool:
-        """Check if VS already exists (both directions)"""
-        slug_ab = self._create_slug(f"{topic_a}-vs-{topic_b}")
-        slug_ba = self._create_slug(f"{topic_b}-vs-{topic_a}")
-        
-        if slug_ab in self.existing_slugs or slug_ba in self.existing_slugs:
+        """Check if VS already exists (both directions) - indexed, no scan over all titles"""
+        if self.db.has_pair(topic_a, topic_b):
             return True
         
-        title_ab = f"{topic_a} vs {topic_b}".lower()
-        title_ba = f"{topic_b} vs {topic_a}".lower()
-        
-        for existing in self.existing_keywords:
-            if title_ab in existing or title_ba in existing:
-                return True
-        
-        return False
+        return (self.topic_index.contains(f"{topic_a} vs {topic_b}") or
+                self.topic_index.contains(f"{topic_b} vs {topic_a}"))
 
-    def get_vs_comparisons(self, count: int, category: str = None) -> List[Tuple[str, str, str]]:
-        """Get VS comparisons from seed list"""
+    def _pair_key(self, topic_a: str, topic_b: str) -> str:
+        """Order-independent key: A|B == B|A"""
+        return '|'.join(TopicIndex.pair_key(topic_a, topic_b))
+
+    def claim_vs_comparisons(self, count: int, category: str = None) -> List[Tuple[str, str, str]]:
+        """Atomically pick comparisons no other worker is generating - at most count, and no more
+        than fit in one call's output budget (the order here can differ from run()'s plan)"""
+        with self._lock:
+            result = self.planner.fit(self.get_vs_comparisons(count, category, exclude=self._claimed))
+            for a, b, _ in result:
+                self._claimed.add(self._pair_key(a, b))
+            return result
+
+    def release_vs_comparisons(self, comparisons: List[Tuple[str, str, str]]):
+        """Return claims - saved ones are already in existing_slugs"""
+        with self._lock:
+            for a, b, _ in comparisons:
+                self._claimed.discard(self._pair_key(a, b))
+
+    def get_vs_comparisons(self, count: int, category: str = None, exclude: Optional[Set[str]] = None) -> List[Tuple[str, str, str]]:
+        """Get VS comparisons from seed list - rejected ones (regenerate queue) first"""
         with open(self.vs_seed_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        comparisons = data['vs_comparisons']
+        queued = self.db.regenerate_queue()
+        retry = [q for q in queued if q['attempts'] < self.max_regenerate]
+        # Issues of the last rejection go into the prompt (_build_vs_prompt)
+        self._regenerate_issues = {q['pair']: q['issues'] for q in retry}
+        queued_pairs = {q['pair'] for q in queued}
+        comparisons = [c for c in data['vs_comparisons'] if self._pair_key(c['a'], c['b']) not in queued_pairs]
+        comparisons.sort(key=lambda x: x.get('priority', 0), reverse=True)
+        comparisons = retry + comparisons
         
         if category:
             comparisons = [c for c in comparisons if c['category'] == category]
         
-        comparisons.sort(key=lambda x: x.get('priority', 0), reverse=True)
-        
         result = []
         for comp in comparisons:
             if len(result) >= count:
                 break
             
-            if not self.check_vs_exists(comp['a'], comp['b']):
-                result.append((comp['a'], comp['b'], comp['category']))
+            if exclude and self._pair_key(comp['a'], comp['b']) in exclude:
+                continue
+            
+            if self.check_vs_exists(comp['a'], comp['b']):
+                continue
+            
+            # Same comparison under other words ("Leasing czy kredyt" ~ "Leasing vs kredyt") - no API call
+            if self.near_dup_threshold > 0:
+                similar = self.db.similar_titles(f"{comp['a']} vs {comp['b']}", self.near_dup_threshold, pairs_only=True)
+                if similar:
+                    path, title, score = similar[0]
+                    print(f"   ⏭️  {comp['a']} vs {comp['b']} ~ {title} ({score:.2f})")
+                    continue
+            
+            result.append((comp['a'], comp['b'], comp['category']))
         
         return result
 
-    # ==================== BATCH VS GENERATION ====================
+    # ==================== TRENDS / RSS INGESTION ====================
     
-    def generate_vs_batch(self, comparisons: List[Tuple[str, str, str]]) -> List[Dict]:
-        """Generate multiple VS articles in ONE API call"""
+    def ingest_trends(self) -> int:
+        """Fetch rss_feeds and trend_seeds concurrently (cached, per-host limits) and merge
+        the new keywords into keywords_pool.json. Returns the number added"""
+        feeds = self._setting('rss_feeds', [])
+        seeds = self._setting('trend_seeds', {})
+        if not feeds and not seeds:
+            print("⚠️  No rss_feeds / trend_seeds in config.json - nothing to ingest")
+            return 0
         
-        print(f"\n{'='*70}")
-        print(f"📦 BATCH GENERATION: {len(comparisons)} articles")
-        print(f"{'='*70}")
+        ingest = TrendIngest(
+            os.path.join(os.getcwd(), 'ingest_cache.sqlite'),
+            ttl_hours=float(self._setting('ingest_ttl_hours', 20)),
+            workers=int(self._setting('ingest_workers', 8)),
+            rate_limits=self._setting('ingest_rate_limits'),
+            # TrendReq connects to Google when built - only here, one per ingest worker
+            trends_client=(lambda: TrendReq(hl='pl', tz=60)) if TRENDS_AVAILABLE else None,
+            categorize=categorize_many
+        )
+        try:
+            print(f"📡 Ingest: {len(feeds)} feeds, {sum(len(t) for t in seeds.values())} trend seed terms")
+            result = ingest.run(feeds, seeds)
+        finally:
+            ingest.close()
         
-        for idx, (a, b, cat) in enumerate(comparisons, 1):
-            print(f"   {idx}. {a} vs {b} [{cat}]")
+        pool = KeywordPool(self.pool_file)
+        added = TrendIngest.merge(result, pool)
+        pool.close()
+        if any(item['generated_by'] == 'google_trends' for item in result['items']):
+            TrendIngest.write_snapshot(result, os.path.join(os.getcwd(), self._setting('trends_file', '1trends.json')))
         
-        comparisons_text = ""
-        for idx, (a, b, cat) in enumerate(comparisons, 1):
-            comparisons_text += f"{idx}. {a} vs {b} (kategoria: {cat})\n"
-        
-        # OPTIMIZED PROMPT - shorter, clearer
-        prompt = f"""Napisz {len(comparisons)} profesjonalnych artykułów porównawczych.
-
-PORÓWNANIA:
-{comparisons_text}
+        status = ', '.join(f"{k} {v}" for k, v in sorted(result['status'].items()))
+        print(f"✅ Ingest: {len(result['items'])} keywords ({status}) in {result['seconds']:.1f}s, "
+              f"{added} new in {os.path.basename(self.pool_file)}")
+        return added
 
-STRUKTURA (każdy artykuł):
+    # ==================== BATCH VS GENERATION ====================
+    
+    # Static part of every VS prompt - sent first as a cacheable prefix.
+    # The API only caches prefixes of >= 1024 tokens (Sonnet); shorter ones are sent uncached.
+    VS_TEMPLATE = """STRUKTURA (każdy artykuł):
 
 <p>INTRO (200-300 słów): Dlaczego ten wybór jest ważny, co zyskasz czytając, realny problem. BEZ spoilerów werdyktu!</p>
 
@@ -374,9 +561,9 @@ WYMAGANIA:
 • Tabela z faktami
 
 JSON format:
-{{
+{
   "articles": [
-    {{
+    {
       "comparison_id": 1,
       "topic_a": "A",
       "topic_b": "B",
@@ -384,54 +571,199 @@ JSON format:
       "html": "...",
       "word_count": 5500,
       "winner": "topic_a"|"topic_b"|"tie"
-    }}
+    }
   ]
-}}"""
+}"""
 
+    def _build_vs_prompt(self, comparisons: List[Tuple[str, str, str]]) -> str:
+        """Per-batch part of the prompt - goes after the cached VS_TEMPLATE"""
+        comparisons_text = ""
+        for idx, (a, b, cat) in enumerate(comparisons, 1):
+            comparisons_text += f"{idx}. {a} vs {b} (kategoria: {cat})\n"
+            issues = self._regenerate_issues.get(self._pair_key(a, b))
+            if issues:
+                comparisons_text += f"   Poprzednia wersja odrzucona: {'; '.join(issues)} - tym razem spełnij te wymagania.\n"
+        
+        return f"""Napisz {len(comparisons)} profesjonalnych artykułów porównawczych według powyższej struktury.
+
+PORÓWNANIA:
+{comparisons_text}"""
+
+    def generate_vs_batch(self, comparisons: List[Tuple[str, str, str]], on_article=None) -> List[Dict]:
+        """Generate multiple VS articles in ONE API call.
+        With on_article every article is passed on (and its html dropped) the moment it is parsed.
+        A response cut off at max_tokens is split: the missing comparisons are retried one per call."""
+        
+        print(f"\n{'='*70}")
+        print(f"📦 BATCH GENERATION: {len(comparisons)} articles")
+        print(f"{'='*70}")
+        
+        for idx, (a, b, cat) in enumerate(comparisons, 1):
+            print(f"   {idx}. {a} vs {b} [{cat}]")
+        
+        with self.telemetry.stage('prompt', count=len(comparisons)):
+            prompt = self._build_vs_prompt(comparisons)
+        
         print(f"\n🚀 Wysyłam do Claude API...")
         print(f"   Model: claude-sonnet-4-20250514")
-        print(f"   Timeout: 5 minut")
+        print(f"   Timeout: {self.request_timeout:.0f}s" + (f" (stream idle {self.stream_idle_timeout:.0f}s)" if self.stream else ""))
         print(f"   Szacowany czas: {len(comparisons) * 30}-{len(comparisons) * 45}s")
         
+        # Articles are handed out as soon as their closing brace arrives;
+        # a retry gets a fresh parser, already delivered ids are skipped
+        delivered: Dict[int, Dict] = {}
+        parsers: List[ArticleStreamParser] = []
+        parse_s = 0.0
+        
+        # comparison_id -> on_article's Future (post-processing), for the counted word totals
+        processed: Dict[int, Future] = {}
+        
+        def deliver(article: Dict):
+            cid = article.get('comparison_id')
+            if cid in delivered:
+                return None
+            wc = article.get('word_count', 0)
+            winner = article.get('winner', '?')
+            article_html = article.get('html') or ''
+            print(f"   📄 {cid}. {wc}w | Zwycięzca: {winner}")
+            result = None
+            if on_article:
+                result = on_article(article)
+                if isinstance(result, Future):
+                    processed[cid] = result
+                article = {k: v for k, v in article.items() if k != 'html'}
+                article['chars'] = len(article_html)
+            delivered[cid] = article
+            return result
+        
+        def new_text_handler():
+            parser = ArticleStreamParser()
+            parsers.append(parser)
+            
+            def on_text(chunk: str):
+                nonlocal parse_s
+                started = time.perf_counter()
+                articles = parser.feed(chunk)
+                parse_s += time.perf_counter() - started
+                for article in articles:
+                    deliver(article)
+            return on_text
+        
         start_time = time.time()
-        response = self._call_claude_retry(prompt, json_mode=True, temp=0.8)
+        # The rate limiter holds what the call is expected to write, not all of max_tokens
+        expected_output = min(self.MAX_TOKENS, sum(self.planner.estimate(cat) for _, _, cat in comparisons))
+        response = self._call_claude_retry(prompt, json_mode=True, temp=0.8, new_text_handler=new_text_handler,
+                                           prefix=self.VS_TEMPLATE, expected_output=expected_output)
         elapsed = time.time() - start_time
+        # Incremental parsing ran inside the stream; its share of the request time
+        self.telemetry.emit('stage', stage='parse', ms=round(parse_s * 1000, 2), outcome='ok', count=len(delivered),
+                            errors=sum(p.errors for p in parsers))
         
         print(f"\n✅ Odpowiedź otrzymana w {elapsed:.1f}s")
         
         if not response or not response.get("success"):
+            if delivered:
+                print(f"⚠️  Generation failed after {len(delivered)} complete articles")
+                return list(delivered.values())
             print(f"❌ Generation failed")
             return []
         
-        try:
-            print(f"🔍 Parsowanie JSON...")
-            content = re.sub(r'```json|```', '', response["content"])
-            data = json.loads(content)
-            articles = data.get('articles', [])
-            
-            print(f"✅ Sparsowano: {len(articles)} artykułów")
-            print(f"💰 Koszt batcha: ${response.get('cost', 0):.2f}")
-            
-            for idx, article in enumerate(articles, 1):
-                wc = article.get('word_count', 0)
-                winner = article.get('winner', '?')
-                print(f"   {idx}. {wc}w | Zwycięzca: {winner}")
-            
-            return articles
-            
-        except Exception as e:
-            print(f"❌ Parse error: {e}")
-            return []
+        parser = parsers[-1]
+        if not delivered:
+            # Not the {"articles": [...]} shape - fall back to parsing the whole blob
+            try:
+                print(f"🔍 Parsowanie JSON...")
+                with self.telemetry.stage('parse', fallback=True):
+                    content = re.sub(r'```json|```', '', response["content"])
+                    data = json.loads(content)
+                    for article in (data.get('articles', []) if isinstance(data, dict) else data):
+                        deliver(article)
+            except Exception as e:
+                print(f"❌ Parse error: {e}")
+                if response.get('cached') and not self.replay:
+                    # Don't let a broken cached answer block this batch forever (--replay keeps it)
+                    self.response_cache.invalidate(response['cache_key'])
+                if response.get('stop_reason') != 'max_tokens':
+                    return []
+                # Cut off before the first article closed - split / queued below like any truncation
+        elif parser.truncated:
+            print(f"⚠️  Truncated payload - recovered {len(delivered)}/{len(comparisons)} complete articles")
+        
+        if parser.errors:
+            print(f"⚠️  {parser.errors} malformed article(s) skipped")
+        
+        truncated = response.get('stop_reason') == 'max_tokens' or parser.truncated
+        if not truncated and not response.get('cached'):
+            # Real tokens per word for the next plans (a cached answer was recorded when it was fresh)
+            self.planner.record(comparisons, self._counted(delivered.values(), processed),
+                                response.get('usage', {}).get('output_tokens') or 0)
+        
+        missing = [idx for idx in range(len(comparisons)) if idx + 1 not in delivered]
+        if truncated and missing and len(comparisons) > 1:
+            print(f"✂️  Hit max_tokens - {len(missing)} comparison(s) retried one per call")
+            for idx in missing:
+                def deliver_as(article: Dict, idx=idx):
+                    return deliver(dict(article, comparison_id=idx + 1))
+                for article in self.generate_vs_batch([comparisons[idx]], on_article=deliver_as if on_article else None):
+                    if not on_article:
+                        deliver(dict(article, comparison_id=idx + 1))
+        elif truncated and missing:
+            # Cut off on its own - not dropped: generated again first, asked to be shorter
+            topic_a, topic_b, category = comparisons[0]
+            attempts = self.db.queue_regenerate(topic_a, topic_b, category,
+                                                [f"odpowiedź ucięta na max_tokens ({self.MAX_TOKENS}) - artykuł musi być krótszy"])
+            print(f"✂️  {topic_a} vs {topic_b} cut off at max_tokens - "
+                  f"{'queued for regeneration' if attempts < self.max_regenerate else 'given up'} ({attempts}/{self.max_regenerate})")
+            with self._lock:
+                self.articles_stats['failed'] += 1
+        
+        print(f"✅ Sparsowano: {len(delivered)} artykułów")
+        print(f"💰 Koszt batcha: ${response.get('cost', 0):.2f}")
+        
+        return list(delivered.values())
 
-    def save_vs_article(self, article: Dict, comparisons: List[Tuple]) -> bool:
-        """Save VS article"""
+    @staticmethod
+    def _counted(articles, processed: Dict[int, Future]) -> List[Dict]:
+        """Articles with word_count = words counted in the html (post-processing result, or counted
+        here when the html is still there); the model's own figure only if neither is available"""
+        counted = []
+        for article in articles:
+            words = article.get('word_count')
+            future = processed.get(article.get('comparison_id'))
+            try:
+                if future is not None:
+                    words = future.result()['words']
+                elif article.get('html'):
+                    words = html_word_count(article['html'])
+            except Exception:
+                pass
+            counted.append(dict(article, word_count=words))
+        return counted
+
+    def save_vs_article(self, article: Dict, comparisons: List[Tuple], processed: Optional[Dict] = None) -> bool:
+        """Save VS article - `processed` is its post_process.process_article result (computed here without one)"""
+        started = time.perf_counter()
         try:
             idx = article.get('comparison_id', 1) - 1
-            if idx >= len(comparisons):
+            if not 0 <= idx < len(comparisons):
                 return False
             
             topic_a, topic_b, category = comparisons[idx]
             
+            if processed is None:
+                processed = process_article(article.get('html') or '', topic_a, topic_b, article.get('winner'), self.post_rules)
+            issues = processed['issues']
+            self.telemetry.emit('stage', stage='post', ms=processed['ms'], outcome='rejected' if issues else 'ok',
+                                words=processed['words'], claimed_words=article.get('word_count'), removed=processed['removed'])
+            if issues:
+                attempts = self.db.queue_regenerate(topic_a, topic_b, category, issues)
+                print(f"   ♻️  {topic_a} vs {topic_b} rejected: {'; '.join(issues)}")
+                print(f"      {'Queued for regeneration' if attempts < self.max_regenerate else 'Given up'} "
+                      f"({attempts}/{self.max_regenerate} attempts)")
+                with self._lock:
+                    self.articles_stats['failed'] += 1
+                return False
+            
             title = f"{topic_a} vs {topic_b} - Które Wybrać? [Porównanie 2026]"
             slug = self._create_slug(f"{topic_a}-vs-{topic_b}")
             
@@ -440,212 +772,875 @@ JSON format:
             
             filepath = os.path.join(category_path, f"{slug}.json")
             
+            # Already paid for - saved anyway, but flagged for review (python near_dup.py report)
+            if self.near_dup_threshold > 0:
+                similar = self.db.similar_bodies(processed['html'], exclude=os.path.relpath(filepath, self.base_content_dir).replace(os.sep, '/'))
+                if similar:
+                    print(f"   ⚠️  Near-duplicate body: {similar[0][0]} ({similar[0][2]:.2f})")
+                    self.telemetry.emit('near_dup', slug=slug, match=similar[0][0], score=round(similar[0][2], 2))
+            
             article_data = {
                 "Title": title,
                 "H1": title,
                 "MetaDescription": f"Szczegółowe porównanie {topic_a} vs {topic_b}. Tabele, fakty, werdykt [2026]"[:155],
-                "Article": article['html'],
+                "Article": processed['html'],
                 "Slug": slug,
                 "Category": category,
                 "LastModified": datetime.now().isoformat(),
                 "ComparisonType": "vs",
                 "TopicA": topic_a,
                 "TopicB": topic_b,
-                "Winner": article.get('winner', 'tie')
+                "Winner": processed['winner']
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(article_data, f, ensure_ascii=False, indent=2)
-            
-            self.existing_slugs.add(slug)
-            self.existing_keywords.add(title.lower())
-            self.progress_data['vs_generated'] = self.progress_data.get('vs_generated', 0) + 1
+            # Never a half-written file under the site, even if we are killed right here
+            write_article(filepath, article_data, self.storage_format, self.storage_compression)
             
-            if 'by_category' not in self.progress_data:
-                self.progress_data['by_category'] = {}
-            self.progress_data['by_category'][category] = self.progress_data['by_category'].get(category, 0) + 1
-            
-            self.articles_stats['success'] += 1
-            self.articles_stats['total_words'] += article.get('word_count', 0)
+            with self._lock:
+                entry = self.manifest.record(filepath)
+                # One transaction: article row + topic pair; a crash before it is repaired by the start-up sync
+                self.db.save(entry['path'], article_data, entry['hash'], run_id=self.run_id,
+                             words=processed['words'])
+                # Accepted: out of the regenerate queue, if it was in it
+                self.db.clear_regenerate(topic_a, topic_b)
+                self._regenerate_issues.pop(self._pair_key(topic_a, topic_b), None)
+                self.existing_slugs.add(slug)
+                self.existing_keywords.add(title.lower())
+                self.topic_index.add_title(title)
+                self.content_index.add(entry)
+                self._unflushed += 1
+                
+                self.articles_stats['success'] += 1
+                self.articles_stats['total_words'] += processed['words']
             
             print(f"   💾 {topic_a} vs {topic_b}")
             print(f"      📁 {filepath}")
+            self.telemetry.emit('stage', stage='save', ms=round((time.perf_counter() - started) * 1000, 2), outcome='ok',
+                                category=category, words=processed['words'], bytes=entry['size'])
             
             return True
             
         except Exception as e:
             print(f"   ❌ Save error: {e}")
-            self.articles_stats['failed'] += 1
+            with self._lock:
+                self.articles_stats['failed'] += 1
+            self.telemetry.emit('stage', stage='save', ms=round((time.perf_counter() - started) * 1000, 2), outcome='error',
+                                error=str(e)[:200])
             return False
 
     # ==================== CLAUDE API ====================
     
-    def _call_claude_retry(self, prompt: str, json_mode: bool = False, temp: float = 0.7, max_retries: int = 3) -> Optional[Dict]:
-        """Call Claude with retry"""
+    RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+    MAX_TOKENS = 16000
+
+    def _call_claude_retry(self, prompt: str, json_mode: bool = False, temp: float = 0.7, max_retries: int = 3,
+                           new_text_handler=None, prefix: str = None, expected_output: Optional[int] = None) -> Optional[Dict]:
+        """Call Claude with retry. new_text_handler() builds a fresh on_text callback per attempt"""
+        retry_after = None
         for attempt in range(max_retries):
             try:
                 if attempt > 0:
-                    wait_time = 2 ** attempt
-                    print(f"\n⏳ Retry {attempt+1}/{max_retries} po {wait_time}s...")
+                    wait_time = self.rate_limiter.backoff(attempt, retry_after)
+                    print(f"\n⏳ Retry {attempt+1}/{max_retries} po {wait_time:.1f}s...")
                     time.sleep(wait_time)
                 
-                result = self._call_claude(prompt, json_mode, temp)
+                on_text = new_text_handler() if new_text_handler else None
+                started = time.perf_counter()
+                result = self._call_claude(prompt, json_mode, temp, on_text=on_text, prefix=prefix,
+                                           expected_output=expected_output)
+                self._emit_call(result, attempt, time.perf_counter() - started)
                 if result and result.get("success"):
                     return result
                 
+                retry_after = result.get('retry_after') if result else None
+                if result and not result.get('retryable', True):
+                    print(f"❌ {str(result.get('error'))[:100]} - not retrying")
+                    return None
+                
                 if attempt < max_retries - 1:
                     error_msg = result.get('error', 'Unknown error') if result else 'No response'
                     print(f"⚠️  Attempt {attempt+1} failed: {str(error_msg)[:100]}")
                 
             except Exception as e:
                 print(f"⚠️  Exception in attempt {attempt+1}: {str(e)[:100]}")
+                self.telemetry.emit('call', attempt=attempt, outcome='exception', error=str(e)[:200])
                 if attempt == max_retries - 1:
                     return None
         
         return None
 
-    def _call_claude(self, prompt: str, json_mode: bool = False, temp: float = 0.7) -> Dict:
-        """Call Claude API - FIXED URL"""
-        url = "https://api.anthropic.com/v1/messages"
-        
-        api_key = self.keys['claude']['api_key']
-        
-        headers = {
-            "x-api-key": api_key,
+    def _emit_call(self, result: Optional[Dict], attempt: int, seconds: float):
+        """One telemetry line per attempt; ms is the whole attempt (rate-limiter wait included)"""
+        result = result or {}
+        usage = result.get('usage') or {}
+        if result.get('success'):
+            outcome = 'cached' if result.get('cached') else 'ok'
+        elif result.get('budget'):
+            outcome = 'budget'
+        else:
+            outcome = f"http_{result['status']}" if result.get('status') else 'error'
+        self.telemetry.emit(
+            'call', attempt=attempt, outcome=outcome, cached=bool(result.get('cached')), stream=self.stream,
+            ms=round(seconds * 1000, 1), ttfb_ms=round(result['ttfb'] * 1000, 1) if result.get('ttfb') else None,
+            input_tokens=usage.get('input_tokens') or 0, output_tokens=usage.get('output_tokens') or 0,
+            cache_read_tokens=usage.get('cache_read_input_tokens') or 0,
+            cache_write_tokens=usage.get('cache_creation_input_tokens') or 0,
+            cost=result.get('cost') or 0.0, stop_reason=result.get('stop_reason'), hedge=result.get('hedge'),
+            request_bytes=result.get('request_bytes') or 0,
+            response_bytes=len(result['content'].encode('utf-8')) if result.get('content') else 0,
+            error=str(result['error'])[:200] if result.get('error') else None
+        )
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough pre-flight estimate - Polish runs ~3 chars per token"""
+        return len(text) // 3 + 1
+
+    def _create_session(self) -> requests.Session:
+        """Keep-alive pool shared by all workers - one TLS handshake per connection, not per call"""
+        # A hedge needs a free connection while its primary still holds one
+        workers = int(self._setting('workers', 1)) * (2 if self.hedge else 1)
+        pool_size = int(self._setting('http_pool_size', max(4, workers)))
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            "x-api-key": self.keys['claude']['api_key'],
             "anthropic-version": "2023-06-01",
             "content-type": "application/json"
-        }
+        })
+        return session
+
+    def _read_sse(self, resp: requests.Response, started: float, on_text=None,
+                  race: Optional[HedgeRace] = None, attempt: str = 'primary') -> Dict:
+        """Consume a streamed Messages response event by event.
+        In a hedge race the first token claims the text channel; a closed loser returns what it was billed"""
+        usage = {}
+        try:
+            return self._read_sse_events(resp, started, on_text, race, attempt, usage)
+        except Exception:
+            if race and race.lost(attempt):
+                return {"success": False, "error": "Hedge lost", "cancelled": True, "retryable": False, "usage": usage}
+            raise
+
+    def _read_sse_events(self, resp: requests.Response, started: float, on_text, race: Optional[HedgeRace],
+                         attempt: str, usage: Dict) -> Dict:
+        parts = []
+        stop_reason = None
+        ttfb = None
+        chars = 0
+        next_report = 4000
         
+        for line in resp.iter_lines(chunk_size=1024):
+            if not line or not line.startswith(b'data:'):
+                continue
+            
+            event = json.loads(line[5:])
+            kind = event.get('type')
+            
+            if kind == 'message_start':
+                usage.update(event.get('message', {}).get('usage', {}))
+            elif kind == 'content_block_delta' and event.get('delta', {}).get('type') == 'text_delta':
+                text = event['delta']['text']
+                if ttfb is None:
+                    if race and not race.claim(attempt):
+                        return {"success": False, "error": "Hedge lost", "cancelled": True, "retryable": False, "usage": usage}
+                    ttfb = time.time() - started
+                    print(f"   ⚡ First token after {ttfb:.1f}s")
+                parts.append(text)
+                chars += len(text)
+                if on_text:
+                    on_text(text)
+                if chars >= next_report:
+                    print(f"   ⬇️  {chars // 1000}k chars, {time.time() - started:.0f}s")
+                    next_report += 4000
+            elif kind == 'message_delta':
+                usage.update(event.get('usage', {}))
+                stop_reason = event.get('delta', {}).get('stop_reason') or stop_reason
+            elif kind == 'error':
+                error = event.get('error', {})
+                return {
+                    "success": False,
+                    "error": f"Stream error: {error.get('type')}: {error.get('message', '')}",
+                    "retryable": error.get('type') in ('overloaded_error', 'api_error', 'rate_limit_error')
+                }
+            elif kind == 'message_stop':
+                break
+            
+            if time.time() - started > self.request_timeout:
+                return {"success": False, "error": f"Stream exceeded {self.request_timeout}s"}
+        
+        return {"success": True, "content": ''.join(parts), "usage": usage, "stop_reason": stop_reason, "ttfb": ttfb}
+
+    def _build_request(self, prompt: str, json_mode: bool = False, temp: float = 0.7, prefix: str = None) -> Dict:
+        """Messages API body - shared by _call_claude and the Batches API.
+        prefix is sent as its own block with a cache_control breakpoint (system + prefix get cached)"""
         system_prompt = "Jesteś ekspertem SEO i content writerem. Piszesz naturalnie, jak ekspert."
         if json_mode:
             system_prompt += " Odpowiadasz TYLKO w JSON."
         
+        content = prompt
+        if prefix:
+            content = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ]
+        
         # FIXED: Correct model name
-        data = {
+        return {
             "model": "claude-sonnet-4-20250514",
-            "max_tokens": 16000,
+            "max_tokens": self.MAX_TOKENS,
             "temperature": temp,
             "system": system_prompt,
-            "messages": [{"role": "user", "content": prompt}]
+            "messages": [{"role": "user", "content": content}]
         }
+
+    # Sonnet 4 per 1M tokens: input $3, cache write $3.75, cache read $0.30, output $15
+    PRICES = {"input_tokens": 3.0, "cache_creation_input_tokens": 3.75, "cache_read_input_tokens": 0.30, "output_tokens": 15.0}
+
+    def _usage_cost(self, usage: Dict, discount: float = 1.0) -> float:
+        return discount * sum((usage.get(k) or 0) / 1_000_000 * price for k, price in self.PRICES.items())
+
+    def _worst_case_cost(self, prompt_tokens: int, discount: float = 1.0) -> float:
+        """Upper bound before sending: every prompt token at the cache-write price + a full max_tokens answer"""
+        input_price = max(self.PRICES['input_tokens'], self.PRICES['cache_creation_input_tokens'])
+        return discount * (prompt_tokens * input_price + self.MAX_TOKENS * self.PRICES['output_tokens']) / 1_000_000
+
+    def _vs_call_worst_case(self, discount: float = 1.0) -> float:
+        """Worst case of one VS call (template + a few comparisons) - the scheduling threshold"""
+        return self._worst_case_cost(self._estimate_tokens(self.VS_TEMPLATE) + 500, discount)
+
+    def _budget_left_for_call(self) -> bool:
+        need = self._vs_call_worst_case()
+        return self._wait_for_budget(need, lambda: self.ledger.available() >= need)
+
+    def _reserve_budget(self, amount: float) -> Optional[int]:
+        hold = None
         
-        try:
-            print(f"   📤 Sending request...")
-            resp = requests.post(url, headers=headers, json=data, timeout=300)
-            
-            # Better error handling
-            if resp.status_code != 200:
-                error_body = resp.text[:200]
+        def attempt() -> bool:
+            nonlocal hold
+            hold = self.ledger.reserve(amount)
+            return hold is not None
+        
+        self._wait_for_budget(amount, attempt)
+        return hold
+
+    def _wait_for_budget(self, need: float, attempt) -> bool:
+        """attempt() until it succeeds. While other requests hold part of the budget, wait for them
+        to settle (their real cost is usually far below the hold); give up when nothing is in flight
+        or even the settled spend leaves no room"""
+        while True:
+            if attempt():
+                return True
+            if self._stop.is_set() or self.ledger.reserved() <= 0 or self.ledger.cap - self.ledger.spent() < need:
+                return False
+            time.sleep(1.0)
+
+    def _track_usage(self, usage: Dict, cost: float):
+        """Running totals per token kind (cache reads/writes kept apart)"""
+        with self._lock:
+            self.total_cost += cost
+            totals = self.progress_data.setdefault('usage', {})
+            for k in self.PRICES:
+                self.usage_totals[k] = self.usage_totals.get(k, 0) + (usage.get(k) or 0)
+                totals[k] = totals.get(k, 0) + (usage.get(k) or 0)
+
+    def _call_claude(self, prompt: str, json_mode: bool = False, temp: float = 0.7, on_text=None, prefix: str = None,
+                     expected_output: Optional[int] = None) -> Dict:
+        """Call Claude API - pooled session, optional SSE streaming (on_text gets every text delta)"""
+        url = f"{self.api_base_url}/v1/messages"
+        data = self._build_request(prompt, json_mode, temp, prefix)
+        
+        cache_key = None
+        if self.response_cache:
+            cache_key = self.response_cache.key(data)
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                print(f"   ♻️  Cache hit {cache_key[:12]} - $0.00")
+                self.db.record_call(self.run_id, data["model"], cached.get('usage', {}), 0.0,
+                                    stop_reason=cached.get('stop_reason'), cached=True)
+                if on_text:
+                    on_text(cached['content'])
                 return {
-                    "success": False,
-                    "error": f"HTTP {resp.status_code}: {error_body}"
+                    "success": True,
+                    "content": cached['content'],
+                    "usage": cached.get('usage', {}),
+                    "cost": 0.0,
+                    "stop_reason": cached.get('stop_reason'),
+                    "ttfb": 0.0,
+                    "latency": 0.0,
+                    "cached": True,
+                    "cache_key": cache_key
                 }
+            if self.replay:
+                return {"success": False, "error": f"Replay miss {cache_key[:12]}", "retryable": False}
+        
+        if self.stream:
+            data["stream"] = True
+        
+        prompt_tokens = self._estimate_tokens(data["system"] + (prefix or "") + prompt)
+        budget_hold = self._reserve_budget(self._worst_case_cost(prompt_tokens))
+        if budget_hold is None:
+            return {"success": False, "error": f"Budget cap ${self.ledger.cap:.2f} - no room for this request's worst case",
+                    "retryable": False, "budget": True}
+        
+        if self.hedge:
+            # The hold goes with the primary's thread, which can outlive the race (stuck before headers)
+            return self._send_hedged(url, data, prompt_tokens, cache_key, on_text, expected_output, budget_hold)
+        try:
+            return self._send(url, data, prompt_tokens, cache_key, on_text, expected_output=expected_output)
+        finally:
+            # The real cost is in api_calls by now (or nothing was spent)
+            self.ledger.release(budget_hold)
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds without a first token before hedging; None until enough TTFBs were observed"""
+        if len(self.ttfb) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, self.ttfb.percentile(self.hedge_percentile))
+
+    def _send_hedged(self, url: str, data: Dict, prompt_tokens: int, cache_key: Optional[str], on_text=None,
+                     expected_output: Optional[int] = None, budget_hold: Optional[int] = None) -> Dict:
+        """Primary at once; a duplicate if it has not streamed a token after _hedge_delay().
+        The first attempt to stream wins, the other is closed. The duplicate needs room in
+        hedge_budget (extra spend per run) and its own hold in the budget ledger. Each attempt
+        releases its hold (budget_hold for the primary) when its thread ends, not when the race does."""
+        delay = self._hedge_delay()
+        if delay is None:
+            try:
+                return self._send(url, data, prompt_tokens, cache_key, on_text, expected_output=expected_output)
+            finally:
+                self.ledger.release(budget_hold)
+        
+        race = HedgeRace()
+        results: Dict[str, Dict] = {}
+        threads: Dict[str, threading.Thread] = {}
+        
+        def attempt(name: str, hold: Optional[int] = None):
+            try:
+                results[name] = self._send(url, data, prompt_tokens, cache_key, on_text, race, name, expected_output)
+            except Exception as e:
+                results[name] = {"success": False, "error": f"Unexpected error: {str(e)}"}
+            finally:
+                self.ledger.release(hold)
+            result = results[name]
+            if result.get('cancelled'):
+                # What the loser was billed is the price of the hedge. One closed before its first
+                # event (the primary stuck before headers) has no usage - its prompt was still read
+                usage = result.get('usage') or {'input_tokens': prompt_tokens}
+                cost = self._usage_cost(usage)
+                self._track_usage(usage, cost)
+                self.db.record_call(self.run_id, data["model"], usage, cost, stop_reason='hedge_cancelled')
+                self.telemetry.emit('call', attempt=0, outcome='hedge_cancelled', hedge=name, cost=cost,
+                                    input_tokens=usage.get('input_tokens') or 0,
+                                    output_tokens=usage.get('output_tokens') or 0)
+                with self._lock:
+                    self.hedge_spent += cost
+        
+        def start(name: str, hold: Optional[int] = None):
+            threads[name] = threading.Thread(target=attempt, args=(name, hold), daemon=True)
+            threads[name].start()
+        
+        start('primary', budget_hold)
+        deadline = time.monotonic() + delay
+        while time.monotonic() < deadline and threads['primary'].is_alive() and not race.claimed.is_set():
+            race.claimed.wait(0.05)
+        
+        hedged = False
+        if threads['primary'].is_alive() and not race.claimed.is_set():
+            hold = None
+            with self._lock:
+                affordable = self.hedge_spent < self.hedge_budget
+            if affordable:
+                hold = self.ledger.reserve(self._worst_case_cost(prompt_tokens))
+            if hold is not None:
+                print(f"   🪁 No token after {delay:.1f}s (p{self.hedge_percentile:.0f} TTFB) - hedging")
+                hedged = True
+                start('hedge', hold)
+        
+        # The winner is whoever streams first; without one, wait for both to give up
+        while race.winner is None and any(t.is_alive() for t in threads.values()):
+            race.claimed.wait(0.05)
+        winner = race.winner or 'primary'
+        threads[winner].join()
+        result = results.get(winner) or results.get('hedge') or {"success": False, "error": "No response"}
+        
+        if hedged:
+            result = dict(result, hedge=winner)
+            self.telemetry.emit('hedge', delay_ms=round(delay * 1000, 1), winner=winner,
+                                outcome='ok' if result.get('success') else 'error')
+            if winner == 'hedge':
+                print(f"   🪁 Hedge won")
+        return result
+
+    def _send(self, url: str, data: Dict, prompt_tokens: int, cache_key: Optional[str], on_text=None,
+              race: Optional[HedgeRace] = None, attempt: str = 'primary', expected_output: Optional[int] = None) -> Dict:
+        """The HTTP part of _call_claude (one attempt of a hedge race when race is given).
+        Output tokens are held at expected_output (max_tokens without one) and settled from usage."""
+        reservation = self.rate_limiter.acquire(prompt_tokens, expected_output or self.MAX_TOKENS)
+        if reservation.waited >= 1:
+            print(f"   🚦 Rate limiter: waited {reservation.waited:.1f}s")
+        settled = False
+        
+        try:
+            print(f"   📤 Sending request{' (stream)' if self.stream else ''}...")
+            started = time.time()
+            if self.stream:
+                # Read timeout applies per chunk: a stalled stream dies after stream_idle_timeout
+                timeout = (self.connect_timeout, self.stream_idle_timeout)
+            else:
+                timeout = (self.connect_timeout, self.request_timeout)
             
-            result = resp.json()
-            
-            # Check for API errors
-            if 'error' in result:
-                return {
-                    "success": False,
-                    "error": result['error'].get('message', 'API error')
-                }
+            with self.session.post(url, json=data, timeout=timeout, stream=self.stream) as resp:
+                self.rate_limiter.update_from_headers(resp.headers)
+                request_bytes = len(resp.request.body or b'') if resp.request is not None else 0
+                if race and not race.register(attempt, resp):
+                    return {"success": False, "error": "Hedge lost", "cancelled": True, "retryable": False}
+                
+                # Better error handling
+                if resp.status_code != 200:
+                    error_body = resp.text[:200]
+                    retry_after = parse_retry_after(resp.headers.get('retry-after'))
+                    if resp.status_code in (429, 529):
+                        pause = self.rate_limiter.on_rate_limited(retry_after)
+                        print(f"   🚦 HTTP {resp.status_code} - all workers paused {pause:.1f}s")
+                    return {
+                        "success": False,
+                        "error": f"HTTP {resp.status_code}: {error_body}",
+                        "status": resp.status_code,
+                        "retry_after": retry_after,
+                        "retryable": resp.status_code in self.RETRYABLE_STATUS
+                    }
+                
+                if self.stream:
+                    result = self._read_sse(resp, started, on_text, race, attempt)
+                    if not result["success"]:
+                        return result
+                    content = result["content"]
+                    usage = result["usage"]
+                    stop_reason = result["stop_reason"]
+                    ttfb = result["ttfb"]
+                else:
+                    result = resp.json()
+                    
+                    # Check for API errors
+                    if 'error' in result:
+                        return {
+                            "success": False,
+                            "error": result['error'].get('message', 'API error')
+                        }
+                    
+                    content = result['content'][0]['text']
+                    usage = result.get('usage', {})
+                    stop_reason = result.get('stop_reason')
+                    ttfb = None
+                    if on_text:
+                        on_text(content)
             
-            usage = result.get('usage', {})
+            latency = time.time() - started
+            if ttfb is not None:
+                self.ttfb.add(ttfb)
             input_tokens = usage.get('input_tokens', 0)
             output_tokens = usage.get('output_tokens', 0)
+            cache_write = usage.get('cache_creation_input_tokens') or 0
+            cache_read = usage.get('cache_read_input_tokens') or 0
+            # Cache reads don't count towards the input-token rate limit
+            self.rate_limiter.reconcile(reservation, input_tokens + cache_write, output_tokens)
+            settled = True
             
-            # Sonnet 4: $3/1M input, $15/1M output
-            cost = (input_tokens / 1_000_000) * 3.0 + (output_tokens / 1_000_000) * 15.0
-            self.total_cost += cost
+            cost = self._usage_cost(usage)
+            self._track_usage(usage, cost)
+            self.db.record_call(self.run_id, data["model"], usage, cost, latency, ttfb, stop_reason)
             
-            print(f"   📊 Tokens: {input_tokens} in, {output_tokens} out")
+            print(f"   📊 Tokens: {input_tokens} in, {output_tokens} out ({latency:.1f}s)")
+            if cache_write or cache_read:
+                print(f"   🗄️  Prompt cache: {cache_read} read, {cache_write} written")
             print(f"   💰 Cost: ${cost:.3f}")
+            if stop_reason == 'max_tokens':
+                print(f"   ⚠️  Hit max_tokens - response truncated")
+            
+            if self.response_cache:
+                self.response_cache.put(cache_key, {
+                    "model": data["model"],
+                    "content": content,
+                    "usage": usage,
+                    "stop_reason": stop_reason
+                })
             
             return {
                 "success": True,
-                "content": result['content'][0]['text'],
+                "content": content,
                 "usage": usage,
-                "cost": cost
+                "cost": cost,
+                "stop_reason": stop_reason,
+                "ttfb": ttfb,
+                "latency": latency,
+                "request_bytes": request_bytes,
+                "cache_key": cache_key
             }
             
         except requests.exceptions.Timeout:
-            return {"success": False, "error": "Timeout after 5 minutes"}
+            return {"success": False, "error": f"Timeout (connect {self.connect_timeout}s / read {timeout[1]}s)"}
+        except requests.exceptions.ConnectionError as e:
+            # urllib3 read timeouts inside iter_lines surface here
+            if 'timed out' in str(e).lower():
+                return {"success": False, "error": f"Stream stalled > {self.stream_idle_timeout}s"}
+            return {"success": False, "error": f"Request error: {str(e)}"}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Request error: {str(e)}"}
         except Exception as e:
             return {"success": False, "error": f"Unexpected error: {str(e)}"}
+        finally:
+            # Every failure (timeouts and stalled streams included) gives the whole hold back -
+            # a max_tokens hold left in place would drain the output bucket for every worker
+            if not settled:
+                self.rate_limiter.reconcile(reservation, 0, 0)
 
-    # ==================== MAIN WORKFLOW ====================
+    # ==================== MESSAGE BATCHES API ====================
     
-    def run(self, vs_target: int = 0, category: str = None):
-        """Main workflow"""
+    BATCH_DISCOUNT = 0.5
+    
+    def _batch_custom_id(self, topic_a: str, topic_b: str) -> str:
+        """custom_id must match ^[a-zA-Z0-9_-]{1,64}$"""
+        return self._create_slug(f"{topic_a}-vs-{topic_b}")[:64]
+    
+    def submit_vs_batch_job(self, vs_target: int, category: str = None) -> Optional[Dict]:
+        """Submit every pending comparison as one Message Batches job (one article per request)"""
+        comparisons = self.get_vs_comparisons(vs_target, category)
+        if not comparisons:
+            print(f"⚠️  No more comparisons available")
+            return None
+        
+        # Results are billed as they arrive, possibly runs later - submit only what the budget covers
+        per_request = self._vs_call_worst_case(self.BATCH_DISCOUNT)
+        affordable = int(max(0.0, self.ledger.available()) // per_request)
+        if affordable < len(comparisons):
+            print(f"⚠️  Budget covers {affordable}/{len(comparisons)} requests (worst case ${per_request:.2f} each)")
+            comparisons = comparisons[:affordable]
+            if not comparisons:
+                return None
+        
+        job_requests = []
+        pending = {}
+        for a, b, cat in comparisons:
+            custom_id = self._batch_custom_id(a, b)
+            pending[custom_id] = [a, b, cat]
+            job_requests.append({
+                "custom_id": custom_id,
+                "params": self._build_request(self._build_vs_prompt([(a, b, cat)]), json_mode=True, temp=0.8, prefix=self.VS_TEMPLATE)
+            })
+        
+        print(f"📤 Submitting batch job: {len(job_requests)} requests")
+        resp = self.session.post(f"{self.api_base_url}/v1/messages/batches",
+                                 json={"requests": job_requests},
+                                 timeout=(self.connect_timeout, self.request_timeout))
+        if resp.status_code != 200:
+            print(f"❌ Batch submit failed: HTTP {resp.status_code}: {resp.text[:200]}")
+            return None
+        
+        batch = resp.json()
+        job = {
+            "id": batch["id"],
+            "submitted": datetime.now().isoformat(),
+            "requests": pending,
+            "processed": []
+        }
+        with self._lock:
+            self.progress_data['batch_job'] = job
+        self._save_progress(force=True)
+        print(f"✅ Batch job {job['id']} saved to {os.path.basename(self.progress_file)}")
+        return job
+    
+    def _poll_batch_job(self, batch_id: str) -> Optional[Dict]:
+        """Poll until processing has ended - backoff from batch_poll_interval up to 5 min"""
+        delay = float(self._setting('batch_poll_interval', 30))
+        while True:
+            try:
+                resp = self.session.get(f"{self.api_base_url}/v1/messages/batches/{batch_id}",
+                                        timeout=(self.connect_timeout, 60))
+                if resp.status_code == 200:
+                    batch = resp.json()
+                    counts = batch.get('request_counts', {})
+                    print(f"   ⏳ {batch.get('processing_status')}: "
+                          f"{counts.get('processing', 0)} processing, {counts.get('succeeded', 0)} ok, "
+                          f"{counts.get('errored', 0)} errored")
+                    if batch.get('processing_status') == 'ended':
+                        return batch
+                elif resp.status_code == 404:
+                    print(f"❌ Batch job {batch_id} not found")
+                    return None
+                else:
+                    print(f"   ⚠️  Poll HTTP {resp.status_code}")
+            except requests.exceptions.RequestException as e:
+                print(f"   ⚠️  Poll error: {str(e)[:100]}")
+            
+            time.sleep(delay)
+            delay = min(300.0, delay * 1.5)
+    
+    def _process_batch_results(self, job: Dict, results_url: str) -> int:
+        """Stream the results JSONL into save_vs_article; processed ids survive a crash"""
+        saved = 0
+        processed = set(job.get('processed', []))
+        
+        with self.session.get(results_url, stream=True, timeout=(self.connect_timeout, self.request_timeout)) as resp:
+            if resp.status_code != 200:
+                print(f"❌ Results download failed: HTTP {resp.status_code}")
+                return 0
+            
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                item = json.loads(line)
+                custom_id = item.get('custom_id')
+                comparison = job['requests'].get(custom_id)
+                if comparison is None or custom_id in processed:
+                    continue
+                
+                result = item.get('result', {})
+                if result.get('type') == 'succeeded':
+                    message = result['message']
+                    usage = message.get('usage', {})
+                    content = message['content'][0]['text']
+                    cost = self._usage_cost(usage, self.BATCH_DISCOUNT)
+                    self._track_usage(usage, cost)
+                    self.db.record_call(self.run_id, message.get('model', ''), usage, cost,
+                                        stop_reason=message.get('stop_reason'), batch=True)
+                    self.telemetry.emit('call', attempt=0, outcome='ok', batch=True,
+                                        input_tokens=usage.get('input_tokens') or 0, output_tokens=usage.get('output_tokens') or 0,
+                                        cache_read_tokens=usage.get('cache_read_input_tokens') or 0,
+                                        cache_write_tokens=usage.get('cache_creation_input_tokens') or 0,
+                                        cost=cost, stop_reason=message.get('stop_reason'),
+                                        response_bytes=len(content.encode('utf-8')))
+                    
+                    if self.response_cache:
+                        params = self._build_request(self._build_vs_prompt([tuple(comparison)]), json_mode=True, temp=0.8, prefix=self.VS_TEMPLATE)
+                        self.response_cache.put(self.response_cache.key(params), {
+                            "model": params["model"],
+                            "content": content,
+                            "usage": usage,
+                            "stop_reason": message.get('stop_reason')
+                        })
+                    
+                    articles = parse_articles(content)
+                    if not articles:
+                        print(f"   ❌ {custom_id}: no article in result")
+                        with self._lock:
+                            self.articles_stats['failed'] += 1
+                    elif self.save_vs_article(articles[0], [tuple(comparison)]):
+                        # Post-processed in this thread - results are read one line at a time anyway
+                        saved += 1
+                else:
+                    error = result.get('error', {}).get('error', result.get('error', {}))
+                    print(f"   ❌ {custom_id}: {result.get('type')} {str(error)[:100]}")
+                    self.telemetry.emit('call', attempt=0, outcome=result.get('type') or 'error', batch=True, error=str(error)[:200])
+                    with self._lock:
+                        self.articles_stats['failed'] += 1
+                
+                processed.add(custom_id)
+                self._journal({"type": "batch_result", "job": job['id'], "custom_id": custom_id})
+                self._save_progress()
+        
+        return saved
+    
+    def run_batch_api(self, vs_target: int = 0, category: str = None):
+        """Bulk overnight mode - submit, poll, save. Resumes a job recorded in progress"""
         print(f"\n{'='*70}")
-        print(f"🎯 TARGET: {vs_target} VS articles")
-        if category:
-            print(f"📂 Category: {category}")
+        print(f"📮 MESSAGE BATCHES API ({int(self.BATCH_DISCOUNT * 100)}% price)")
         print(f"{'='*70}\n")
         
-        if vs_target == 0:
+        job = self.progress_data.get('batch_job')
+        if job:
+            print(f"🔁 Resuming batch job {job['id']} ({len(job.get('processed', []))}/{len(job['requests'])} processed)")
+        elif vs_target == 0:
             print("⚠️  No target specified. Use --vs NUMBER")
             return
+        else:
+            job = self.submit_vs_batch_job(vs_target, category)
+            if not job:
+                return
         
-        generated_vs = 0
-        MAX_BATCH_SIZE = 2
+        batch = self._poll_batch_job(job['id'])
+        if not batch:
+            return
         
-        # Calculate batches
-        batches = []
-        remaining = vs_target
-        while remaining > 0:
-            batch_size = min(MAX_BATCH_SIZE, remaining)
-            batches.append(batch_size)
-            remaining -= batch_size
+        self.run_id = self.telemetry.run_id = self.db.start_run('batch', len(job['requests']))
+        saved = self._process_batch_results(job, batch['results_url'])
         
-        print(f"📊 Strategy:")
-        print(f"   • Batches: {len(batches)} × {MAX_BATCH_SIZE}")
-        print(f"   • Est. time: ~{len(batches) * 2} min")
-        print(f"   • Est. cost: ~${len(batches) * 0.42:.2f}")
-        print()
+        with self._lock:
+            self.progress_data.pop('batch_job', None)
+        self._save_progress(force=True)
+        self.db.finish_run(self.run_id, saved, self.articles_stats['failed'], self.total_cost)
+        self.telemetry.flush()
         
-        for batch_idx, batch_size in enumerate(batches, 1):
+        print(f"\n{'='*70}")
+        print(f"✨ BATCH JOB COMPLETE")
+        print(f"{'='*70}")
+        print(f"📊 Saved: {saved}/{len(job['requests'])}")
+        print(f"💰 Total cost: ${self.total_cost:.2f}")
+        print(f"📁 Location: {self.base_content_dir}")
+        print(f"{'='*70}\n")
+
+    # ==================== MAIN WORKFLOW ====================
+    
+    def _run_batch(self, batch_idx: int, total_batches: int, batch_size: int, category: str = None) -> Optional[int]:
+        """Claim, generate and save one batch. Returns saved count, None when nothing left"""
+        if self._stop.is_set():
+            return 0
+        
+        # Stop scheduling while the worst case of one more call still fits, not after the cap is crossed
+        if not self._budget_left_for_call():
+            self._budget_reached()
+            return 0
+        
+        with self.telemetry.stage('select', batch=batch_idx) as stage:
+            comparisons = self.claim_vs_comparisons(batch_size, category)
+            stage['count'] = len(comparisons)
+        
+        if not comparisons:
+            print(f"⚠️  No more comparisons available")
+            return None
+        
+        try:
             print(f"\n{'='*70}")
-            print(f"📦 BATCH {batch_idx}/{len(batches)}")
+            print(f"📦 BATCH {batch_idx}/{total_batches}")
             print(f"{'='*70}")
             
-            comparisons = self.get_vs_comparisons(batch_size, category)
+            saved = 0
+            # Parsed articles go to the post-processing pool at once and are saved in order as
+            # they come back - sanitizing and gating never hold up the stream
+            pending: List[Tuple[Dict, Future]] = []
             
-            if not comparisons:
-                print(f"⚠️  No more comparisons available")
-                break
+            def save_done(wait: bool = False):
+                nonlocal saved
+                while pending and (wait or pending[0][1].done()):
+                    article, future = pending.pop(0)
+                    try:
+                        processed = future.result()
+                        # Only the result's html is saved, the raw one is not kept
+                        article = {k: v for k, v in article.items() if k != 'html'}
+                    except Exception as e:
+                        print(f"   ⚠️  Post-processing failed ({e}), checked in this thread")
+                        processed = None
+                    if self.save_vs_article(article, comparisons, processed):
+                        saved += 1
+                        self._save_progress()
             
-            articles = self.generate_vs_batch(comparisons)
+            def post(article: Dict):
+                idx = article.get('comparison_id', 1) - 1
+                if 0 <= idx < len(comparisons):
+                    topic_a, topic_b, _ = comparisons[idx]
+                    future = self.post_processor.submit(article.get('html') or '', topic_a, topic_b, article.get('winner'))
+                    # The raw html stays until the future resolves - a failed pool falls back to it
+                    pending.append((article, future))
+                    save_done()
+                    return future
+                return None
+            
+            articles = self.generate_vs_batch(comparisons, on_article=post)
+            save_done(wait=True)
+            # Usage is settled after the last article was saved
+            self._save_progress()
             
             if not articles:
-                print(f"⚠️  Batch generation failed, skipping...")
-                continue
+                print(f"⚠️  Batch {batch_idx} generation failed, skipping...")
+                return 0
             
-            print(f"\n💾 Saving articles...")
-            saved = 0
-            for article in articles:
-                if self.save_vs_article(article, comparisons):
-                    generated_vs += 1
-                    saved += 1
-                    self._save_progress()
+            with self._lock:
+                self._generated_vs += saved
+                generated_vs = self._generated_vs
             
             print(f"\n✅ Batch {batch_idx} complete:")
             print(f"   • Saved: {saved}/{batch_size}")
-            print(f"   • Progress: {generated_vs}/{vs_target} ({generated_vs/vs_target*100:.0f}%)")
+            print(f"   • Progress: {generated_vs}/{self._vs_target} ({generated_vs/self._vs_target*100:.0f}%)")
             print(f"   • Total cost: ${self.total_cost:.2f}")
             
-            if self.total_cost >= self.keys.get('budget', {}).get('claude_total_budget', 10):
-                print(f"\n⚠️  Budget limit reached (${self.keys['budget']['claude_total_budget']:.2f})")
-                break
+            if not self._budget_left_for_call():
+                self._budget_reached()
             
-            if batch_idx < len(batches):
-                print(f"\n⏳ Cooling down 30s...")
-                for i in range(30, 0, -5):
-                    print(f"   {i}s...", end='\r')
-                    time.sleep(5)
-                print()
+            return saved
+        finally:
+            self.release_vs_comparisons(comparisons)
+    
+    def _budget_reached(self):
+        with self._lock:
+            if not self._stop.is_set():
+                print(f"\n⚠️  Budget limit reached: ${self.ledger.spent():.2f} spent of ${self.ledger.cap:.2f}, "
+                      f"next call could cost up to ${self._vs_call_worst_case():.2f}")
+            self._stop.set()
+
+    def run(self, vs_target: int = 0, category: str = None):
+        """Main workflow"""
+        workers = max(1, int(self._setting('workers', 1)))
+        
+        print(f"\n{'='*70}")
+        print(f"🎯 TARGET: {vs_target} VS articles")
+        if category:
+            print(f"📂 Category: {category}")
+        if workers > 1:
+            print(f"🧵 Workers: {workers}")
+        print(f"{'='*70}\n")
+        
+        if vs_target == 0:
+            print("⚠️  No target specified. Use --vs NUMBER")
+            return
+        
+        self._vs_target = vs_target
+        self._generated_vs = 0
+        self._stop.clear()
+        
+        queued = self.db.regenerate_queue()
+        if queued:
+            retry = sum(1 for q in queued if q['attempts'] < self.max_regenerate)
+            print(f"♻️  Regenerate queue: {retry} to retry, {len(queued) - retry} given up")
+        
+        # Calculate batches - as many comparisons per call as fit in max_tokens. The sizes are upper
+        # bounds: each worker's claim is packed again (queued regenerations, other workers' claims)
+        plan = self.planner.plan(self.get_vs_comparisons(vs_target, category))
+        if not plan:
+            print(f"⚠️  No more comparisons available")
+            return
+        batches = [len(group) for group in plan]
+        self.run_id = self.telemetry.run_id = self.db.start_run('sync', vs_target)
+        est_tokens = sum(self.planner.estimate(cat) for group in plan for _, _, cat in group)
+        
+        waves = -(-len(batches) // workers)
+        print(f"📊 Strategy:")
+        sizes = f"{min(batches)}-{max(batches)}" if min(batches) != max(batches) else f"{batches[0]}"
+        print(f"   • Batches: {len(batches)} × {sizes} (~{self.planner.estimate(category):,} output tokens/article)")
+        print(f"   • Est. time: ~{waves * 2} min")
+        print(f"   • Est. cost: ~${est_tokens / 1_000_000 * self.PRICES['output_tokens']:.2f}")
+        print()
+        
+        self.post_processor = PostProcessor(self.post_workers, self.post_rules)
+        try:
+            if workers > 1:
+                # N batches in flight; claims keep workers off each other's comparisons,
+                # the shared rate limiter keeps them under the API ceiling
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(self._run_batch, batch_idx, len(batches), batch_size, category)
+                        for batch_idx, batch_size in enumerate(batches, 1)
+                    ]
+                    for future in futures:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print(f"❌ Worker error: {e}")
+            else:
+                for batch_idx, batch_size in enumerate(batches, 1):
+                    if self._run_batch(batch_idx, len(batches), batch_size, category) is None:
+                        break
+                    
+                    if self._stop.is_set():
+                        break
+        finally:
+            self.post_processor.close()
+            self.post_processor = None
+        
+        generated_vs = self._generated_vs
+        self._save_progress(force=True)
+        self.db.finish_run(self.run_id, generated_vs, self.articles_stats['failed'], self.total_cost)
+        self.telemetry.flush()
         
         # Summary
         print(f"\n{'='*70}")
@@ -656,7 +1651,10 @@ JSON format:
         if self.articles_stats['success'] > 0:
             avg = int(self.articles_stats['total_words'] / self.articles_stats['success'])
             print(f"📝 Avg words: {avg}")
-        print(f"💰 Total cost: ${self.total_cost:.2f}")
+        print(f"💰 Total cost: ${self.total_cost:.2f} (budget: ${self.ledger.spent():.2f} of ${self.ledger.cap:.2f})")
+        if self.usage_totals.get('cache_read_input_tokens') or self.usage_totals.get('cache_creation_input_tokens'):
+            print(f"🗄️  Prompt cache: {self.usage_totals.get('cache_read_input_tokens', 0)} read, "
+                  f"{self.usage_totals.get('cache_creation_input_tokens', 0)} written")
         print(f"📁 Location: {self.base_content_dir}")
         print(f"{'='*70}\n")
         print("🔄 Refresh NextJS to see new articles!")
@@ -668,13 +1666,47 @@ if __name__ == "__main__":
     parser.add_argument('--vs', type=int, default=0, help='Number of VS articles')
     parser.add_argument('--category', type=str, help='Specific category')
     parser.add_argument('--reset', action='store_true', help='Reset progress')
+    parser.add_argument('--reset-budget', action='store_true', help='Count claude_total_budget from zero again (spend so far stays in articles.sqlite)')
+    parser.add_argument('--workers', type=int, help='Batches in flight at once (default: 1)')
+    parser.add_argument('--stream', action='store_true', default=None, help='Stream responses (SSE), abort stalled streams early')
+    parser.add_argument('--pool-size', type=int, help='HTTP keep-alive pool size (default: max(4, workers))')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the response cache')
+    parser.add_argument('--replay', action='store_true', default=None, help='Serve responses only from the cache (no API calls)')
+    parser.add_argument('--batch-api', action='store_true', help='Submit all pending comparisons as one Message Batches job (resumable)')
+    parser.add_argument('--rescan', action='store_true', default=None, help='Re-stat every article file, not just changed directories')
+    parser.add_argument('--storage', choices=STORAGE_FORMATS, help='Article format: inline JSON or split header + compressed body (default: inline)')
+    parser.add_argument('--ingest', action='store_true', help='Fetch rss_feeds / trend_seeds into keywords_pool.json first')
+    parser.add_argument('--base-url', help='API address, e.g. a local mock_anthropic_server.py (default: ANTHROPIC_BASE_URL or api.anthropic.com)')
     
     args = parser.parse_args()
     
-    bot = ClaudePremiumAutopilot()
+    bot = ClaudePremiumAutopilot(options={
+        'workers': args.workers,
+        'stream': args.stream,
+        'http_pool_size': args.pool_size,
+        'response_cache': False if args.no_cache else None,
+        'replay': args.replay,
+        'rescan': args.rescan,
+        'storage_format': args.storage,
+        'api_base_url': args.base_url
+    })
     
     if args.reset and os.path.exists(bot.progress_file):
         os.remove(bot.progress_file)
+        if os.path.exists(bot.journal_file):
+            os.remove(bot.journal_file)
         print("🔄 Progress reset")
     
-    bot.run(vs_target=args.vs, category=args.category)
+    if args.reset_budget:
+        bot.ledger.reset()
+        print(f"🔄 Budget reset: $0.00 spent of ${bot.ledger.cap:.2f}")
+    
+    if args.ingest:
+        bot.ingest_trends()
+        if not args.vs:
+            raise SystemExit(0)
+    
+    if args.batch_api:
+        bot.run_batch_api(vs_target=args.vs, category=args.category)
+    else:
+        bot.run(vs_target=args.vs, category=args.category)
@@ -10,7 +10,7 @@ import json
 import os
 import sys
 from pathlib import Path
-from advanced_seo_generator import AdvancedSEOGenerator
+from content_validator import ContentValidator
 
 
 def load_config(config_path: str = "config.json"):
@@ -48,7 +48,8 @@ def generate_for_niche(niche: str, count: int, output_dir: str, api_key: str, co
     print(f"📁 Output: {output_dir}")
     print(f"🔢 Liczba artykułów: {count}\n")
     
-    # Inicjalizacja generatora
+    # Inicjalizacja generatora - import tutaj: walidacja (--validate) nie potrzebuje generatora
+    from advanced_seo_generator import AdvancedSEOGenerator
     generator = AdvancedSEOGenerator(niche=niche, api_key=api_key)
     
     # Research fraz
@@ -91,41 +92,27 @@ def generate_for_niche(niche: str, count: int, output_dir: str, api_key: str, co
     print(f"\n✅ ZAKOŃCZONO - pliki w: {output_dir}\n")
 
 
-def validate_content(content_dir: str):
-    """Waliduje wygenerowane treści"""
+def validate_content(content_dir: str, workers: int = None, output_format: str = 'text',
+                     report: str = None, use_cache: bool = True) -> int:
+    """Waliduje wygenerowane treści; zwraca liczbę plików z problemami"""
+    validator = ContentValidator(content_dir, cache_path='validation_cache.sqlite' if use_cache else None,
+                                 workers=workers)
+    
+    if output_format != 'text':
+        summary = validator.run()
+        body = validator.to_json(summary) if output_format == 'json' else validator.to_junit(summary)
+        if report:
+            with open(report, 'w', encoding='utf-8') as f:
+                f.write(body)
+        else:
+            sys.stdout.write(body)
+        return summary['failed']
+    
     print("\n🔍 Walidacja treści...\n")
+    summary = validator.run()
+    issues = [f"{rel.rpartition('/')[2]}: {issue}" for rel, result in validator.results.items() for issue in result['issues']]
     
-    issues = []
-    total_files = 0
-    
-    for root, dirs, files in os.walk(content_dir):
-        for file in files:
-            if file.endswith('.json'):
-                total_files += 1
-                filepath = os.path.join(root, file)
-                
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    try:
-                        content = json.load(f)
-                        
-                        # Sprawdź pola
-                        required_fields = ['title', 'h1', 'metaDescription', 'article', 'faq']
-                        missing = [field for field in required_fields if not content.get(field)]
-                        
-                        if missing:
-                            issues.append(f"{file}: brak pól {missing}")
-                        
-                        # Sprawdź długość
-                        article_text = content.get('article', '').replace('<', ' ').replace('>', ' ')
-                        word_count = len(article_text.split())
-                        
-                        if word_count < 600:
-                            issues.append(f"{file}: za krótki artykuł ({word_count} słów)")
-                        
-                    except json.JSONDecodeError:
-                        issues.append(f"{file}: błąd parsowania JSON")
-    
-    print(f"Sprawdzono plików: {total_files}")
+    print(f"Sprawdzono plików: {summary['files']} (nowe/zmienione: {summary['checked']}, z cache: {summary['cached']}) w {summary['seconds']}s")
     
     if issues:
         print(f"\n⚠️  Znaleziono {len(issues)} problemów:\n")
@@ -136,7 +123,17 @@ def validate_content(content_dir: str):
     else:
         print("\n✅ Wszystkie pliki przeszły walidację!")
     
+    slowest = sorted(validator.results.items(), key=lambda item: item[1]['ms'], reverse=True)[:3]
+    if slowest and summary['checked']:
+        print("\n⏱️  Najwolniejsze pliki: " + ", ".join(f"{rel} ({result['ms']:.0f}ms)" for rel, result in slowest))
+    
+    if report:
+        with open(report, 'w', encoding='utf-8') as f:
+            f.write(validator.to_json(summary))
+        print(f"\n📄 Raport: {report}")
+    
     print()
+    return summary['failed']
 
 
 def main():
@@ -155,6 +152,9 @@ Przykłady użycia:
   # Waliduj wygenerowane treści
   python cli.py --validate ./output/Content
   
+  # Walidacja dla CI (JUnit XML, kod wyjścia 1 przy błędach)
+  python cli.py --validate public/content --format junit --report validation.xml
+  
   # Generuj dla wszystkich nisz (po 10 artykułów)
   python cli.py --all --count 10 --output ./output
         """
@@ -166,11 +166,20 @@ Przykłady użycia:
     parser.add_argument('--config', type=str, default='config.json', help='Plik konfiguracyjny (default: config.json)')
     parser.add_argument('--list-niches', action='store_true', help='Wyświetl dostępne nisze')
     parser.add_argument('--validate', type=str, help='Waliduj treści w podanym katalogu')
+    parser.add_argument('--workers', type=int, help='Procesy walidacji (default: liczba rdzeni)')
+    parser.add_argument('--format', choices=['text', 'json', 'junit'], default='text', help='Format wyniku walidacji (default: text)')
+    parser.add_argument('--report', type=str, help='Zapisz raport walidacji do pliku')
+    parser.add_argument('--no-cache', action='store_true', help='Waliduj wszystko od nowa (bez validation_cache.sqlite)')
     parser.add_argument('--all', action='store_true', help='Generuj dla wszystkich nisz')
     parser.add_argument('--api-key', type=str, help='Anthropic API key (lub ustaw ANTHROPIC_API_KEY)')
     
     args = parser.parse_args()
     
+    # Walidacja (nie wymaga configu)
+    if args.validate:
+        failed = validate_content(args.validate, args.workers, args.format, args.report, not args.no_cache)
+        sys.exit(1 if failed else 0)
+    
     # Załaduj config
     config = load_config(args.config)
     
@@ -179,11 +188,6 @@ Przykłady użycia:
         list_niches(config)
         return
     
-    # Walidacja
-    if args.validate:
-        validate_content(args.validate)
-        return
-    
     # API Key
     api_key = args.api_key or os.getenv('ANTHROPIC_API_KEY')
     if not api_key:
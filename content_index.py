@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Derived artifacts for the Next.js API routes (public/content-index/)
+• listing.json - Title, MetaDescription, Category, Slug, LastModified of every article
+• search.json  - inverted index: folded term / word prefix -> positions in listing.json
+• Built from the content manifest, updated on every save, written with progress
+
+    python content_index.py    # rebuild after manual edits in public/content
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from safe_io import atomic_write
+from topic_index import fold
+
+INDEX_VERSION = 1
+MIN_PREFIX = 2   # shorter query words are ignored
+MAX_PREFIX = 8   # longer words: prefixes up to 8 chars + the full word
+
+
+def index_terms(text: str) -> Set[str]:
+    """Every full word and every prefix of MIN_PREFIX..MAX_PREFIX chars, diacritics folded"""
+    terms = set()
+    for word in fold(text).split():
+        if len(word) < MIN_PREFIX:
+            continue
+        terms.add(word)
+        for n in range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1):
+            terms.add(word[:n])
+    return terms
+
+
+class ContentIndex:
+    """In memory only once something changes: an unchanged corpus is never re-indexed,
+    the first add() loads the files written by the previous run"""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.listing_file = os.path.join(out_dir, 'listing.json')
+        self.search_file = os.path.join(out_dir, 'search.json')
+        self.docs: List[Dict] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._terms: Dict[str, Set[int]] = {}
+        self._loaded = False
+        self.dirty = False
+
+    @staticmethod
+    def _doc(entry: Dict) -> Dict:
+        modified = entry.get('modified') or datetime.fromtimestamp(entry['mtime_ns'] / 1e9).isoformat()
+        return {
+            "Title": entry['title'],
+            "MetaDescription": entry['meta'],
+            "Category": entry['category'],
+            "Slug": entry['slug'],
+            "LastModified": modified
+        }
+
+    @staticmethod
+    def _doc_terms(doc: Dict) -> Set[str]:
+        return index_terms(f"{doc['Title']} {doc['MetaDescription']}")
+
+    # ---------- updates ----------
+
+    def rebuild(self, entries):
+        """Whole index from manifest entries"""
+        self.docs, self._ids, self._terms = [], {}, {}
+        self._loaded = True
+        for entry in sorted(entries, key=lambda e: e['path']):
+            self.add(entry)
+        self.dirty = True
+
+    def load(self) -> bool:
+        """Previous run's files; False when missing or not written together"""
+        listing = self._read(self.listing_file)
+        search = self._read(self.search_file)
+        if (not listing or not search or listing.get('version') != INDEX_VERSION
+                or listing.get('generated') != search.get('generated')):
+            return False
+        self.docs = listing['articles']
+        self._ids = {(doc['Category'], doc['Slug']): i for i, doc in enumerate(self.docs)}
+        self._terms = {term: set(ids) for term, ids in search['terms'].items()}
+        self._loaded = True
+        return True
+
+    def add(self, entry: Dict):
+        """New or rewritten article (manifest entry); a rewrite keeps its position"""
+        if not self._loaded and not self.load():
+            raise RuntimeError(f"{self.out_dir}: index files missing - rebuild() first")
+        doc = self._doc(entry)
+        key = (doc['Category'], doc['Slug'])
+        doc_id = self._ids.get(key)
+        if doc_id is None:
+            doc_id = len(self.docs)
+            self.docs.append(doc)
+            self._ids[key] = doc_id
+        else:
+            for term in self._doc_terms(self.docs[doc_id]):
+                self._terms[term].discard(doc_id)
+            self.docs[doc_id] = doc
+        for term in self._doc_terms(doc):
+            self._terms.setdefault(term, set()).add(doc_id)
+        self.dirty = True
+
+    # ---------- output ----------
+
+    def exists(self) -> bool:
+        return os.path.exists(self.listing_file) and os.path.exists(self.search_file)
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, force: bool = False):
+        """Both files carry the same `generated` stamp - the routes ignore a mismatched pair"""
+        if not (self.dirty or force):
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        generated = int(time.time() * 1000)
+        terms = {term: sorted(ids) for term, ids in sorted(self._terms.items()) if ids}
+        self._write(self.listing_file, {"version": INDEX_VERSION, "generated": generated, "articles": self.docs})
+        self._write(self.search_file, {
+            "version": INDEX_VERSION,
+            "generated": generated,
+            "minPrefix": MIN_PREFIX,
+            "maxPrefix": MAX_PREFIX,
+            "terms": terms
+        })
+        self.dirty = False
+
+    @staticmethod
+    def _write(path: str, data: Dict):
+        atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    @property
+    def term_count(self) -> int:
+        return sum(1 for ids in self._terms.values() if ids)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+def main():
+    from content_manifest import ContentManifest
+
+    content_dir = os.path.join(os.getcwd(), 'public', 'content')
+    manifest = ContentManifest(content_dir, os.path.join(os.getcwd(), 'content_manifest.json'))
+    manifest.refresh(full=True)
+    manifest.save()
+
+    index = ContentIndex(os.path.join(os.getcwd(), 'public', 'content-index'))
+    index.rebuild(manifest.entries())
+    index.save()
+    print(f"✅ {len(index)} artykułów, {index.term_count} termów -> {index.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Manifest of public/content: slug, category, title, meta, date, mtime, size, hash per file
+• Startup re-lists only directories whose mtime changed and re-reads only
+  files whose mtime/size changed
+• Split articles (article_store.py): mtime, size and hash cover the header and the body file,
+  so an edit to <slug>.body.html.gz alone is a change too
+• Updated on every save, written together with progress
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Set, Tuple
+
+from article_reader import read_fields
+from article_store import BODY_SUFFIX, article_hash, body_paths as article_body_paths
+from safe_io import atomic_write
+
+MANIFEST_VERSION = 4
+
+# Row layout in the file: relpath -> [title, mtime_ns, size, sha1, meta description, last modified];
+# for a split article mtime is the newer of header / body, size and sha1 are over both
+TITLE, MTIME, SIZE, HASH, META, MODIFIED = range(6)
+_FIELDS = ('Title', 'MetaDescription', 'LastModified')
+
+
+class ContentManifest:
+    def __init__(self, content_dir: str, path: str):
+        self.content_dir = content_dir
+        self.path = path
+        self.rows: Dict[str, List] = {}
+        self.dirs: Dict[str, int] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.rows = data.get('files', {})
+                self.dirs = data.get('dirs', {})
+        except (OSError, ValueError):
+            self.rows = {}
+            self.dirs = {}
+
+    def save(self, force: bool = False):
+        if not (self.dirty or force):
+            return
+        # dumps() uses the C encoder, dump() to a file does not
+        payload = json.dumps({"version": MANIFEST_VERSION, "dirs": self.dirs, "files": self.rows}, ensure_ascii=False, separators=(',', ':'))
+        atomic_write(self.path, payload)
+        self.dirty = False
+
+    def refresh(self, full: bool = False) -> Tuple[int, int, int]:
+        """Bring the manifest in line with the disk. Returns (added, changed, removed).
+        A directory whose mtime is unchanged has the same file list, so its files are not
+        stat-ed unless full=True (in-place edits that keep the name are caught by full)."""
+        added = changed = 0
+        removed: List[str] = []
+        rows = self.rows
+        by_dir: Dict[str, List[str]] = {}
+        for rel in rows:
+            by_dir.setdefault(rel.rpartition('/')[0], []).append(rel)
+        
+        seen_dirs: Set[str] = set()
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            path = os.path.join(self.content_dir, rel_dir) if rel_dir else self.content_dir
+            try:
+                dir_mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen_dirs.add(rel_dir)
+            
+            if not full and self.dirs.get(rel_dir) == dir_mtime:
+                stack.extend(d for d in self.dirs if d and d.rpartition('/')[0] == rel_dir)
+                continue
+            
+            prefix = f"{rel_dir}/" if rel_dir else ''
+            present: Set[str] = set()
+            headers = []
+            bodies: Dict[str, List[os.DirEntry]] = {}
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.endswith('.json'):
+                        headers.append(entry)
+                    elif name.endswith(_SUFFIXES):
+                        bodies.setdefault(_body_base(name), []).append(entry)
+                    elif entry.is_dir():
+                        stack.append(prefix + name)
+            for entry in headers:
+                rel = prefix + entry.name
+                present.add(rel)
+                body = sorted(bodies.get(entry.name[:-len('.json')], ()), key=lambda e: e.name)
+                mtime, size = _combined_stat(entry.stat(), [b.stat() for b in body])
+                row = rows.get(rel)
+                if row is not None and row[MTIME] == mtime and row[SIZE] == size:
+                    continue
+                rows[rel] = self._describe(entry.path, (mtime, size), [b.path for b in body])
+                if row is None:
+                    added += 1
+                else:
+                    changed += 1
+            
+            removed.extend(rel for rel in by_dir.get(rel_dir, ()) if rel not in present)
+            if self.dirs.get(rel_dir) != dir_mtime:
+                self.dirs[rel_dir] = dir_mtime
+                self.dirty = True
+        
+        for rel_dir in [d for d in self.dirs if d not in seen_dirs]:
+            del self.dirs[rel_dir]
+            removed.extend(by_dir.get(rel_dir, ()))
+            self.dirty = True
+        for rel in removed:
+            rows.pop(rel, None)
+        if added or changed or removed:
+            self.dirty = True
+        return added, changed, len(removed)
+
+    def _describe(self, filepath: str, stat: Tuple[int, int] = None, body_paths: List[str] = None) -> List:
+        """Header fields via the partial reader (Article is never decoded), hash over raw chunks
+        of the file and its body files"""
+        if body_paths is None:
+            body_paths = article_body_paths(filepath)
+        if stat is None:
+            stat = _combined_stat(os.stat(filepath), [os.stat(p) for p in body_paths])
+        try:
+            header = read_fields(filepath, _FIELDS)
+        except ValueError:
+            header = {}
+        title, meta, modified = (v if isinstance(v, str) else '' for v in (header.get(k) or '' for k in _FIELDS))
+        return [title, stat[0], stat[1], article_hash(filepath, body_paths), meta, modified]
+
+    def record(self, filepath: str) -> Dict:
+        """Called right after an article was written; returns its expanded entry"""
+        rel = os.path.relpath(filepath, self.content_dir).replace(os.sep, '/')
+        self.rows[rel] = self._describe(filepath)
+        self.dirty = True
+        return self._entry(rel, self.rows[rel])
+
+    def entries(self) -> Iterator[Dict]:
+        """Expanded view: dicts with slug, category, title, meta, modified, mtime_ns, size, hash"""
+        for rel, row in self.rows.items():
+            yield self._entry(rel, row)
+
+    @staticmethod
+    def _entry(rel: str, row: List) -> Dict:
+        category, _, name = rel.rpartition('/')
+        return {
+            "path": rel,
+            "slug": name[:-len('.json')],
+            "category": category.split('/', 1)[0],
+            "title": row[TITLE],
+            "meta": row[META],
+            "modified": row[MODIFIED],
+            "mtime_ns": row[MTIME],
+            "size": row[SIZE],
+            "hash": row[HASH]
+        }
+
+    def slugs(self) -> Set[str]:
+        return {rel.rpartition('/')[2][:-5] for rel in self.rows}
+
+    def titles(self) -> Set[str]:
+        return {row[TITLE].lower() for row in self.rows.values() if row[TITLE]}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+_SUFFIXES = tuple(BODY_SUFFIX.values())
+
+
+def _body_base(name: str) -> str:
+    """'slug.body.html.gz' -> 'slug'"""
+    return name[:-len(next(suffix for suffix in _SUFFIXES if name.endswith(suffix)))]
+
+
+def _combined_stat(header: os.stat_result, bodies: List[os.stat_result]) -> Tuple[int, int]:
+    """(mtime_ns, size) of an article: the newest of its files, their total size"""
+    return (max([header.st_mtime_ns] + [b.st_mtime_ns for b in bodies]),
+            header.st_size + sum(b.st_size for b in bodies))
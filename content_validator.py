@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parallel validator for generated content (public/content/**.json)
+• Files spread across processes, word count from an HTML text extractor (tags are not words)
+• Results cached by file hash - a re-run only re-checks files whose content changed
+• Reports: text, JSON or JUnit XML, with per-file timings
+"""
+
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Set
+from xml.sax.saxutils import quoteattr, escape
+
+from article_reader import read_fields
+from article_store import iter_body_text
+from content_manifest import HASH, ContentManifest
+
+# Bump when a rule changes - cached results of older rules are dropped
+RULES_VERSION = 2
+REQUIRED_FIELDS = ('Title', 'H1', 'MetaDescription', 'FAQ')
+# VS articles (ComparisonType "vs") are generated without FAQ - VS_TEMPLATE has none
+VS_OPTIONAL_FIELDS = ('FAQ',)
+MIN_WORDS = 600
+
+
+class _TextCounter(HTMLParser):
+    """Counts words of the visible text; inline tags do not split a word, block tags do"""
+
+    SKIP_TAGS = {'script', 'style', 'template', 'noscript'}
+    BREAK_TAGS = {
+        'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+        'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'img', 'li', 'main',
+        'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.words = 0
+        self._skip = 0
+        self._glued = False  # last text ended inside a word
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BREAK_TAGS:
+            self._glued = False
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BREAK_TAGS:
+            self._glued = False
+
+    def handle_data(self, data):
+        if self._skip or not data:
+            return
+        words = len(data.split())
+        if words and self._glued and not data[0].isspace():
+            words -= 1
+        self.words += words
+        self._glued = not data[-1].isspace()
+
+
+def html_word_count(html_pieces) -> int:
+    """Word count of HTML given as one string or an iterable of pieces"""
+    counter = _TextCounter()
+    for piece in ([html_pieces] if isinstance(html_pieces, str) else html_pieces):
+        counter.feed(piece)
+    counter.close()
+    return counter.words
+
+
+def validate_file(filepath: str, min_words: int = MIN_WORDS) -> Dict:
+    """Checks one article; returns issues, word count and time spent"""
+    started = time.perf_counter()
+    issues = []
+    words = 0
+    try:
+        header = read_fields(filepath, REQUIRED_FIELDS + ('Body', 'ComparisonType'))
+        if 'Body' in header:
+            # split format stores H1 only when it differs from Title
+            header.setdefault('H1', header.get('Title'))
+        words = html_word_count(iter_body_text(filepath))
+
+        optional = VS_OPTIONAL_FIELDS if header.get('ComparisonType') == 'vs' else ()
+        missing = [field for field in REQUIRED_FIELDS if field not in optional and not header.get(field)]
+        if not words:
+            missing.append('Article')
+        if missing:
+            issues.append(f"brak pól {missing}")
+        if words < min_words:
+            issues.append(f"za krótki artykuł ({words} słów)")
+    except (OSError, ValueError, EOFError, RuntimeError):
+        issues.append("błąd parsowania JSON")
+    return {"issues": issues, "words": words, "ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _validate_task(task):
+    filepath, min_words = task
+    return validate_file(filepath, min_words)
+
+
+class ContentValidator:
+    def __init__(self, content_dir: str, cache_path: Optional[str] = 'validation_cache.sqlite',
+                 workers: Optional[int] = None, min_words: int = MIN_WORDS):
+        self.content_dir = content_dir
+        self.cache_path = cache_path
+        self.workers = workers or os.cpu_count() or 1
+        self.min_words = min_words
+        self.results: Dict[str, Dict] = {}
+        self.checked: Set[str] = set()
+
+    # ---------- cache ----------
+
+    def _open_cache(self) -> Optional[sqlite3.Connection]:
+        if not self.cache_path:
+            return None
+        db = sqlite3.connect(self.cache_path)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                hash TEXT PRIMARY KEY,
+                words INTEGER NOT NULL,
+                ms REAL NOT NULL,
+                issues TEXT NOT NULL  -- one per line
+            )
+        """)
+        # Results of other rules / another directory are useless - start over
+        signature = json.dumps([RULES_VERSION, self.min_words, os.path.abspath(self.content_dir)])
+        row = db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if row is None or row[0] != signature:
+            db.execute("DELETE FROM results")
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+            db.commit()
+        return db
+
+    @staticmethod
+    def _load_results(db: Optional[sqlite3.Connection]) -> Dict[str, Dict]:
+        if db is None:
+            return {}
+        return {
+            h: {"issues": issues.split('\n') if issues else [], "words": words, "ms": ms}
+            for h, words, ms, issues in db.execute("SELECT hash, words, ms, issues FROM results")
+        }
+
+    # ---------- run ----------
+
+    def run(self) -> Dict:
+        started = time.perf_counter()
+        db = self._open_cache()
+        cached = self._load_results(db)
+
+        # Manifest gives the hash of every file; unchanged files are not re-read
+        manifest = ContentManifest(self.content_dir, f"{self.cache_path}.manifest" if self.cache_path else os.devnull)
+        manifest.refresh(full=True)
+
+        results: Dict[str, Dict] = {}
+        todo: List[str] = []
+        for rel, row in manifest.rows.items():
+            hit = cached.get(row[HASH])
+            if hit is not None:
+                results[rel] = hit
+            else:
+                todo.append(rel)
+
+        tasks = [(os.path.join(self.content_dir, rel), self.min_words) for rel in todo]
+        if len(tasks) > 1 and self.workers > 1:
+            chunksize = max(1, len(tasks) // (self.workers * 8))
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                fresh = list(pool.map(_validate_task, tasks, chunksize=chunksize))
+        else:
+            fresh = [_validate_task(t) for t in tasks]
+        for rel, result in zip(todo, fresh):
+            results[rel] = result
+
+        if db is not None:
+            manifest.save()
+            db.executemany(
+                "INSERT OR REPLACE INTO results (hash, words, ms, issues) VALUES (?, ?, ?, ?)",
+                [(manifest.rows[rel][HASH], r['words'], r['ms'], '\n'.join(r['issues']))
+                 for rel, r in zip(todo, fresh)]
+            )
+            # Drop results of files that no longer exist once they outnumber the live ones
+            if len(cached) > 2 * len(manifest.rows):
+                live = {row[HASH] for row in manifest.rows.values()}
+                db.executemany("DELETE FROM results WHERE hash = ?", [(h,) for h in cached if h not in live])
+            db.commit()
+            db.close()
+
+        self.results = dict(sorted(results.items()))
+        self.checked = set(todo)
+        return {
+            "files": len(results),
+            "checked": len(todo),
+            "cached": len(results) - len(todo),
+            "failed": sum(1 for r in results.values() if r['issues']),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+    # ---------- reports ----------
+
+    def to_json(self, summary: Dict) -> str:
+        files = [dict(path=rel, cached=rel not in self.checked, **result) for rel, result in self.results.items()]
+        return json.dumps({"summary": summary, "files": files}, ensure_ascii=False)
+
+    def to_junit(self, summary: Dict) -> str:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<testsuite name="content" tests="{summary["files"]}" failures="{summary["failed"]}" '
+            f'time="{summary["seconds"]}">'
+        ]
+        for rel, result in self.results.items():
+            category = rel.rpartition('/')[0].replace('/', '.') or 'content'
+            lines.append(f'  <testcase classname={quoteattr(category)} name={quoteattr(rel)} '
+                         f'time="{result["ms"] / 1000:.4f}">')
+            if result['issues']:
+                message = '; '.join(result['issues'])
+                lines.append(f'    <failure message={quoteattr(message)}>{escape(message)}</failure>')
+            lines.append('  </testcase>')
+        lines.append('</testsuite>')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Hedged requests - a duplicate for a request that is stuck before its first token
+• TtfbTracker: rolling window of observed time-to-first-token; the hedge delay is a percentile of it
+• HedgeRace: two streamed attempts of the same request; the first one to produce a token
+  wins the text channel, the other one's connection is closed on the spot
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+
+class TtfbTracker:
+    def __init__(self, window: int = 200):
+        self._values = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def seed(self, values: Iterable[float]):
+        with self._lock:
+            self._values.extend(v for v in values if v is not None)
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._values.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return None
+        return values[min(len(values), max(1, math.ceil(p / 100 * len(values)))) - 1]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class HedgeRace:
+    """Shared by the attempts of one request ('primary', 'hedge')"""
+
+    def __init__(self):
+        self.winner: Optional[str] = None
+        self.claimed = threading.Event()
+        self._responses: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, attempt: str, response) -> bool:
+        """Remember the open response so a winner can close it; False if the race is already lost"""
+        with self._lock:
+            if self.winner is not None and self.winner != attempt:
+                lost = True
+            else:
+                self._responses[attempt] = response
+                lost = False
+        if lost:
+            response.close()
+        return not lost
+
+    def claim(self, attempt: str) -> bool:
+        """Called on an attempt's first token. The first caller wins; every other attempt is closed"""
+        with self._lock:
+            if self.winner is None:
+                self.winner = attempt
+                losers = [r for name, r in self._responses.items() if name != attempt]
+            elif self.winner == attempt:
+                return True
+            else:
+                return False
+        self.claimed.set()
+        for response in losers:
+            try:
+                response.close()
+            except Exception:
+                pass
+        return True
+
+    def lost(self, attempt: str) -> bool:
+        return self.winner is not None and self.winner != attempt
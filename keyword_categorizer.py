@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Keyword -> category, one compiled regex over folded text
+• Every term of every category is one alternative of a single pattern; a term shared by
+  categories ("sprzedaż": biznes + nieruchomości) scores for all of them
+• Scores are summed weights per category; confidence = best / total. The best score wins,
+  a tie goes to the category listed first - the order of the old categorize_keyword rules
+  (finanse first, motoryzacja last). No match at all is UNKNOWN - never a silent default
+• categorize_many() folds a whole batch (keyword pool, trends / RSS output) and scans it
+  with one finditer call
+
+    python keyword_categorizer.py check "kredyt na mieszkanie" "sprzedaż"
+    python keyword_categorizer.py pool                 # keywords_pool.json: categories vs stored ones
+"""
+
+import argparse
+import json
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+UNKNOWN = 'unknown'
+MAX_DECISIONS = 100_000
+_NON_ALNUM = re.compile(r'[^a-z0-9\n]+')
+# Best score below this is UNKNOWN; 1 = any matched term, a lone weak one (weight 1) included
+MIN_SCORE = 1
+
+# Folded terms: "stem*" matches any word starting with it, anything else the whole word (or
+# phrase) only - "ai", "dom", "oc" must not match "mail", "domena", "koc". Weight 2 = specific,
+# 1 = also common outside the category. Order matters: ties go to the category listed first.
+CATEGORY_TERMS: Dict[str, Dict[str, float]] = {
+    'finanse': {
+        'kredyt*': 2, 'hipote*': 2, 'pit': 2, 'podat*': 2, 'ulg*': 1, 'bank*': 2, 'oszczedn*': 2,
+        'oszczedza*': 2, 'inwestyc*': 2, 'inwestow*': 2, 'emerytur*': 2, 'finans*': 2, 'obligacj*': 2,
+        'akcj*': 1, 'lokat*': 2, 'pozyczk*': 2, 'ike': 2, 'ikze': 2, 'etf': 2, 'ppk': 2, 'fundusz*': 1,
+        'gield*': 2, 'walut*': 1, 'rata': 1, 'raty': 1, 'ratal*': 1, 'debetow*': 2, 'ryczalt*': 1,
+        'vat': 1, 'konto': 1, 'rachun*': 1, 'ubezpiecz*': 1, 'leasing*': 1, 'inflacj*': 2,
+        'oprocentow*': 2, 'budzet*': 1, 'pieniadz*': 1, 'gotowk*': 1, 'zus': 1, 'kryptowalut*': 2,
+        'deflacj*': 2, 'dlug*': 2, 'fiskus*': 2, 'zadluz*': 2, 'faktoring*': 2,
+    },
+    'zdrowie': {
+        'diet*': 2, 'odchudz*': 2, 'bmi': 2, 'kalori*': 2, 'fitness*': 2, 'trening*': 2, 'zdrow*': 2,
+        'chorob*': 2, 'witamin*': 2, 'lek': 2, 'leki': 2, 'lekow*': 2, 'lekarz*': 2, 'suplement*': 2,
+        'bialk*': 1, 'joga': 2, 'jogi': 2, 'pilates': 2, 'szpital*': 2, 'nfz': 2, 'medyczn*': 2,
+        'biegan*': 2, 'biezni*': 1, 'cwicz*': 2, 'sen': 1, 'odpornos*': 2, 'cukrzyc*': 2, 'cisnieni*': 1,
+        'serc*': 1, 'wegan*': 1, 'wegetarian*': 1, 'keto*': 2, 'psych*': 1, 'stres*': 1, 'masaz*': 1,
+        'rower*': 1, 'objaw*': 2, 'leczeni*': 2, 'bol': 1, 'bole': 1, 'bolu': 1,
+        'kardiolog*': 2, 'badani*': 1, 'metaboli*': 2, 'stretching*': 2, 'probiotyk*': 2, 'zoladk*': 2,
+        'watrob*': 2, 'profilakty*': 2, 'jesc': 1, 'jedzeni*': 1, 'lekarsk*': 2, 'zyw*': 1,
+    },
+    'technologia': {
+        'laptop*': 2, 'komputer*': 2, 'telefon*': 2, 'smartfon*': 2, 'aplikacj*': 2, 'program': 1,
+        'programy': 1, 'programow*': 1, 'programist*': 2, 'oprogramow*': 2, 'ai': 2, 'vpn': 2,
+        'technolog*': 2, 'interne*': 1, 'android*': 2, 'iphone*': 2, 'ios': 2, 'windows': 2, 'linux': 2,
+        'chmur*': 1, 'router*': 2, 'wifi': 2, 'procesor*': 2, 'monitor*': 1, 'tablet*': 2, 'konsol*': 1,
+        'graficzn*': 1, 'ssd': 2, 'hdd': 2, 'chatgpt': 2, 'cyberbezp*': 2, 'antywir*': 2,
+        'smartwatch*': 2, 'sluchawk*': 2, 'telewizor*': 2, 'hosting*': 2, 'serwer*': 2, 'python': 2,
+        'javascript': 2, 'chrome': 2, 'gpu': 2, 'cpu': 2, 'usb': 2, 'bluetooth': 2, 'dysk*': 1,
+        'cloud': 2, 'computing': 2, 'sztuczn*': 1, 'inteligenc*': 1, 'szyfrow*': 2, 'hasl*': 1, 'kopi*': 1,
+        'zapasow*': 1, 'danych': 1, 'dane': 1, 'cyfrow*': 1, 'online': 1, 'wi fi': 2, 'ethernet': 2,
+        'intel': 2, 'amd': 2, 'nvidia': 2, 'google': 1,
+    },
+    'biznes': {
+        'biznes*': 2, 'firm*': 2, 'marketing*': 2, 'sprzedaz*': 1, 'startup*': 2, 'przedsiebior*': 2,
+        'zarzadz*': 1, 'dzialalnos*': 2, 'gospodarcz*': 1, 'jdg': 2, 'spolk*': 2, 'b2b': 2,
+        'freelanc*': 2, 'klient*': 1, 'commerce': 2, 'sklep*': 2, 'zaloz*': 1, 'franczyz*': 2,
+        'ksiegow*': 2, 'faktur*': 2, 'vat': 1, 'zus': 1, 'ryczalt*': 1, 'rekrutac*': 1, 'pracownik*': 1,
+        'pracodaw*': 1, 'seo': 2, 'reklam*': 1, 'crm': 2, 'branding*': 2, 'kampani*': 1, 'zysk*': 1,
+        'zespol*': 1, 'motyw*': 1, 'negocj*': 1, 'dostawc*': 1, 'konkurenc*': 2, 'lean': 2, 'management': 2,
+        'customer': 2, 'klienci': 1, 'biznesplan*': 2, 'faktoring*': 1, 'sluzbow*': 1, 'dropshipping': 2, 'magazyn*': 1, 'ads': 2,
+        'facebook': 1, 'allegro': 1,
+    },
+    'prawo': {
+        'prawo': 2, 'prawa': 2, 'prawn*': 2, 'umow*': 2, 'rozwod*': 2, 'spadek': 2, 'spadk*': 2,
+        'testament*': 2, 'sad': 2, 'sadu': 2, 'sadzie': 2, 'sadow*': 2, 'pozew': 2, 'pozw*': 2,
+        'kodeks*': 2, 'alimen*': 2, 'rodo': 2, 'notariu*': 2, 'notarial*': 2, 'adwokat*': 2, 'radc*': 1,
+        'mandat*': 1, 'wyrok*': 2, 'odszkodow*': 1, 'zachowek': 2, 'zachowku': 2, 'darowizn*': 1,
+        'pelnomocn*': 2, 'przepis*': 1, 'ustaw*': 1, 'kara': 1, 'kary': 1, 'wypowiedz*': 1, 'spolk*': 1,
+        'reklamacj*': 1, 'konsument*': 1, 'klauzul*': 2, 'abuzyw*': 2,
+        'egzekuc*': 2, 'komornik*': 2, 'mediacj*': 2, 'spory': 1, 'sporu': 1, 'sporach': 1, 'wadliw*': 2,
+    },
+    'nieruchomosci': {
+        'mieszkan*': 2, 'dom': 2, 'domu': 1, 'domy': 2, 'nieruchom*': 2, 'wynajem': 2,
+        'wynajm*': 2, 'najem': 1, 'najm*': 1, 'kupn*': 1, 'sprzedaz*': 1, 'lokal': 2, 'lokalu': 2,
+        'dzialk*': 2, 'budow*': 1, 'remont*': 2, 'deweloper*': 2, 'czynsz*': 2, 'wspolnot*': 1,
+        'wieczyst*': 2, 'wycen*': 1, 'kawalerk*': 2, 'apartament*': 2, 'ogrod*': 1, 'dach*': 1,
+        'ocieplen*': 1, 'pomp*': 1, 'hipote*': 1, 'notariu*': 1, 'metraz*': 2,
+        'pierwotn*': 1, 'wtorn*': 1, 'przedmiesc*': 2, 'miast*': 1, 'osiedl*': 2, 'rzeczoznaw*': 1,
+        'zagospodarow*': 2,
+    },
+    'motoryzacja': {
+        'samochod*': 2, 'auto': 2, 'auta': 2, 'aut': 1, 'autem': 2, 'aucie': 2, 'akumulator*': 2, 'pojazd*': 2, 'silnik*': 2,
+        'opon*': 2, 'przeglad': 1, 'ubezpiecz*': 1, 'leasing*': 1, 'motoryz*': 2, 'oc': 2, 'ac': 2,
+        'diesel*': 2, 'benzyn*': 2, 'hybryd*': 2, 'elektryk*': 1, 'lpg': 2, 'paliw*': 2, 'kierowc*': 2,
+        'jazd*': 1, 'motocykl*': 2, 'skuter*': 2, 'rejestrac*': 1, 'warsztat*': 1, 'mechani*': 1,
+        'suv': 2, 'vin': 2, 'hamulc*': 2, 'skrzyni*': 1, 'assistance': 2,
+    },
+}
+
+
+def _fold(text: str) -> str:
+    """topic_index.fold that keeps newlines (keyword separators). NFKD strips every Polish
+    diacritic except ł; a dict translate is slow on a whole batch"""
+    text = text.lower().replace('ł', 'l')
+    return _NON_ALNUM.sub(' ', unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii'))
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    """Regex alternation factored as a trie - "kredyt|kalori|kara" -> "k(?:redyt|alori|ara)".
+    Python's re tries a flat alternation one branch at a time at every position; the trie
+    rejects most positions on the first character"""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+        # Greedy: the longer term is tried before the shorter one that ends here
+        return '(?:%s)?' % body if '' in node else body
+
+    return emit(trie)
+
+
+class Categorizer:
+    def __init__(self, terms: Optional[Dict[str, Dict[str, float]]] = None, min_score: float = MIN_SCORE):
+        self.min_score = min_score
+        terms = terms or CATEGORY_TERMS
+        self.categories = list(terms)
+        # term -> [(category index, weight)]; one alternative per distinct term
+        self._weights: Dict[str, List[Tuple[int, float]]] = {}
+        for index, weighted in enumerate(terms.values()):
+            for term, weight in weighted.items():
+                self._weights.setdefault(term.rstrip('*'), []).append((index, weight))
+        prefixes = {t.rstrip('*') for w in terms.values() for t in w if t.endswith('*')}
+        words = {t for w in terms.values() for t in w if not t.endswith('*')}
+        # The regex reports only the longest stem that matched - it also carries the weights of
+        # the shorter stems it starts with ("ubezpieczeni*" includes "ubezpiecz*")
+        for stem in prefixes:
+            self._weights[stem] = self._weights[stem] + [
+                pair for shorter in prefixes if len(shorter) < len(stem) and stem.startswith(shorter)
+                for pair in self._weights[shorter] if shorter in self._weights]
+        # Group 1 = a newline (keyword separator in a batch), 2 = the longest stem that starts
+        # a word, 3 = a whole word
+        self.pattern = re.compile(r'(\n)|\b(?:(%s)[a-z0-9]*|(%s)\b)' % (_alternation(prefixes), _alternation(words)))
+        # Matched terms -> decision; keyword batches repeat the same few combinations
+        self._decisions: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+
+    def _terms(self, keyword: str) -> List[str]:
+        return [stem or word for _, stem, word in self.pattern.findall(_fold(keyword.replace('\n', ' ')))]
+
+    def _score(self, terms: Iterable[str]) -> List[float]:
+        scores = [0.0] * len(self.categories)
+        for term in terms:
+            for index, weight in self._weights[term]:
+                scores[index] += weight
+        return scores
+
+    def _decide(self, terms: Tuple[str, ...]) -> Tuple[str, float]:
+        decision = self._decisions.get(terms)
+        if decision is not None:
+            return decision
+        scores = self._score(terms)
+        total = sum(scores)
+        # max() keeps the first of equal scores - category order breaks ties
+        best = max(range(len(scores)), key=scores.__getitem__)
+        confidence = scores[best] / total if total else 0.0
+        if not total or scores[best] < self.min_score:
+            decision = (UNKNOWN, confidence)
+        else:
+            decision = (self.categories[best], confidence)
+        if len(self._decisions) >= MAX_DECISIONS:
+            self._decisions.clear()
+        self._decisions[terms] = decision
+        return decision
+
+    def scores(self, keyword: str) -> Dict[str, float]:
+        """Summed term weights per category (only categories that matched)"""
+        return {self.categories[i]: s for i, s in enumerate(self._score(self._terms(keyword))) if s}
+
+    def classify(self, keyword: str) -> Tuple[str, float]:
+        """(category or UNKNOWN, confidence)"""
+        return self._decide(tuple(sorted(self._terms(keyword))))
+
+    def categorize_many(self, keywords: Iterable[str]) -> List[Tuple[str, float]]:
+        """classify() for a whole batch: one text, folded at once and scanned with one
+        findall - newlines separate the keywords"""
+        keywords = [k.replace('\n', ' ') for k in keywords]
+        if not keywords:
+            return []
+        result = []
+        terms: List[str] = []
+        for newline, stem, word in self.pattern.findall(_fold('\n'.join(keywords))):
+            if newline:
+                result.append(self._decide(tuple(sorted(terms))))
+                terms = []
+            else:
+                terms.append(stem or word)
+        result.append(self._decide(tuple(sorted(terms))))
+        return result
+
+
+_default: Optional[Categorizer] = None
+
+
+def _categorizer() -> Categorizer:
+    global _default
+    if _default is None:
+        _default = Categorizer()
+    return _default
+
+
+def categorize(keyword: str) -> str:
+    """Category of one keyword, UNKNOWN if nothing (or nothing clearly) matches"""
+    return _categorizer().classify(keyword)[0]
+
+
+def categorize_many(keywords: Iterable[str]) -> List[Tuple[str, float]]:
+    return _categorizer().categorize_many(keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyword categorizer')
+    parser.add_argument('command', choices=['check', 'pool'])
+    parser.add_argument('keywords', nargs='*', help='check: keywords to classify')
+    parser.add_argument('--pool', default=os.path.join(os.getcwd(), 'keywords_pool.json'))
+    args = parser.parse_args()
+
+    categorizer = _categorizer()
+    if args.command == 'check':
+        for keyword in args.keywords:
+            category, confidence = categorizer.classify(keyword)
+            scores = ', '.join(f"{c} {s:g}" for c, s in sorted(categorizer.scores(keyword).items(), key=lambda x: -x[1]))
+            print(f"{category:>14} {confidence:4.2f}  {keyword}  ({scores or '-'})")
+        return
+
+    with open(args.pool, 'r', encoding='utf-8') as f:
+        pool = json.load(f).get('pool', [])
+    counts: Dict[str, int] = {}
+    changed = []
+    for entry, (category, confidence) in zip(pool, categorizer.categorize_many(e['keyword'] for e in pool)):
+        counts[category] = counts.get(category, 0) + 1
+        if entry.get('category') and category != entry['category']:
+            changed.append((entry['keyword'], entry['category'], category, confidence))
+    for category, count in sorted(counts.items(), key=lambda x: -x[1]):
+        print(f"{category:>14} {count:>7}")
+    print(f"\n{len(changed)} of {len(pool)} differ from the stored category")
+    for keyword, stored, category, confidence in changed[:30]:
+        print(f"   {stored:>14} -> {category:<14} {confidence:4.2f}  {keyword}")
+
+
+if __name__ == '__main__':
+    main()
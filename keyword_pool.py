@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Keyword pool scheduler (keywords_pool.json)
+• The pool is read once into one heap per category; score = priority + trend bonus + freshness
+  (a keyword fetched today outranks the same priority from last month)
+• Categories share claims by quota (weights): the next keyword comes from the category
+  furthest below its share, so a large category cannot starve the others
+• claim / release / mark_used are O(log n); state changes are appended to
+  keywords_pool.journal instead of re-dumping the JSON, which is compacted every
+  compact_every changes (same snapshot + journal scheme as progress_claude.json)
+
+    python keyword_pool.py stats
+    python keyword_pool.py next 20 --category finanse    # what would be claimed, nothing is changed
+    python keyword_pool.py compact
+"""
+
+import argparse
+import heapq
+import json
+import os
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from safe_io import Journal, atomic_write_json
+from topic_index import fold
+
+DEFAULT_PRIORITY = 5
+# Bonus that halves every FRESHNESS_HALF_LIFE days since the keyword was generated / trending
+FRESHNESS_BONUS = 3.0
+FRESHNESS_HALF_LIFE = 7.0
+TREND_BONUS = {"high": 2.0, "medium": 1.0, "low": 0.0}
+RISING_BONUS = 1.0
+
+
+def _age_days(value: Optional[str], today: date) -> Optional[float]:
+    try:
+        return max(0, (today - date.fromisoformat(value[:10])).days)
+    except (TypeError, ValueError):
+        return None
+
+
+def score(entry: Dict, today: Optional[date] = None) -> float:
+    """Higher = claimed earlier"""
+    value = float(entry.get('priority', DEFAULT_PRIORITY))
+    value += TREND_BONUS.get(entry.get('volume'), 0.0)
+    if entry.get('rising'):
+        value += RISING_BONUS
+    age = _age_days(entry.get('trend_date') or entry.get('generated_date'), today or date.today())
+    if age is not None:
+        value += FRESHNESS_BONUS * 0.5 ** (age / FRESHNESS_HALF_LIFE)
+    return value
+
+
+class KeywordPool:
+    def __init__(self, path: str, journal_path: Optional[str] = None, quotas: Optional[Dict[str, float]] = None,
+                 compact_every: int = 1000):
+        """quotas: category -> weight (missing categories weigh 1, weight 0 = never claimed)"""
+        self.path = path
+        self.quotas = quotas or {}
+        self.compact_every = compact_every
+        self.data: Dict = {"generated_date": date.today().isoformat(), "pool": []}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        self.entries: List[Dict] = self.data.setdefault('pool', [])
+        self._ids: Dict[str, int] = {}
+        self._heaps: Dict[str, List[Tuple[float, int]]] = {}
+        self._claimed = set()
+        self._claims: Dict[str, int] = {}
+        self._today = date.today()
+        self._lock = threading.Lock()
+
+        for i, entry in enumerate(self.entries):
+            self._ids.setdefault(fold(entry['keyword']), i)
+        self.journal = Journal(journal_path or f"{os.path.splitext(path)[0]}.journal", self.data.get('journal_seq', 0))
+        replayed = self.journal.read(self.data.get('journal_seq', 0))
+        for record in replayed:
+            self._apply(record)
+        if replayed:
+            print(f"📒 Keyword pool: {len(replayed)} changes replayed from {os.path.basename(self.journal.path)}")
+
+        for i, entry in enumerate(self.entries):
+            if not entry.get('used'):
+                self._heaps.setdefault(entry.get('category', ''), []).append((-score(entry, self._today), i))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ---------- journal ----------
+
+    def _apply(self, record: Dict) -> List[int]:
+        """Fold one journal record into the pool - same path live and on replay. Returns new entry ids"""
+        added = []
+        if record['op'] == 'used':
+            i = self._ids.get(fold(record['keyword']))
+            if i is not None:
+                self.entries[i]['used'] = True
+                self.entries[i]['used_date'] = record['date']
+        elif record['op'] == 'add':
+            for entry in record['entries']:
+                key = fold(entry['keyword'])
+                if key in self._ids:
+                    continue
+                self._ids[key] = len(self.entries)
+                added.append(len(self.entries))
+                self.entries.append(entry)
+        return added
+
+    def _log(self, record: Dict) -> List[int]:
+        self.journal.append(record)
+        added = self._apply(record)
+        if self.journal.pending >= self.compact_every:
+            self._compact()
+        return added
+
+    def _compact(self):
+        used = sum(1 for e in self.entries if e.get('used'))
+        self.data['stats'] = {"total": len(self.entries), "used": used, "remaining": len(self.entries) - used}
+        self.data['journal_seq'] = self.journal.last_seq
+        atomic_write_json(self.path, self.data, indent=2)
+        self.journal.checkpoint()
+
+    def compact(self):
+        """Rewrite keywords_pool.json with every change so far and empty the journal"""
+        with self._lock:
+            self._compact()
+
+    def close(self):
+        with self._lock:
+            if self.journal.pending:
+                self._compact()
+
+    # ---------- scheduling ----------
+
+    def _next_category(self, category: Optional[str]) -> Optional[str]:
+        """The category furthest below its quota share that still has keywords"""
+        if category is not None:
+            return category if self._heaps.get(category) else None
+        best, best_load = None, None
+        for name, heap in self._heaps.items():
+            weight = self.quotas.get(name, 1.0)
+            if not heap or weight <= 0:
+                continue
+            load = self._claims.get(name, 0) / weight
+            if best_load is None or load < best_load:
+                best, best_load = name, load
+        return best
+
+    def _pop(self, category: Optional[str]) -> Optional[int]:
+        while True:
+            name = self._next_category(category)
+            if name is None:
+                return None
+            _, i = heapq.heappop(self._heaps[name])
+            # Lazy deletion: used since it was pushed, or already handed out
+            if self.entries[i].get('used') or i in self._claimed:
+                continue
+            self._claims[name] = self._claims.get(name, 0) + 1
+            return i
+
+    def claim(self, count: int, category: Optional[str] = None) -> List[Dict]:
+        """Best `count` unused keywords no other worker holds (all categories by quota, or one)"""
+        with self._lock:
+            result = []
+            while len(result) < count:
+                i = self._pop(category)
+                if i is None:
+                    break
+                self._claimed.add(i)
+                result.append(self.entries[i])
+            return result
+
+    def release(self, entries: Iterable[Dict]):
+        """Hand back claimed keywords that were not used (failed generation)"""
+        with self._lock:
+            for entry in entries:
+                i = self._ids.get(fold(entry['keyword']))
+                if i is None or i not in self._claimed:
+                    continue
+                self._claimed.discard(i)
+                if not self.entries[i].get('used'):
+                    name = self.entries[i].get('category', '')
+                    self._claims[name] = max(0, self._claims.get(name, 0) - 1)
+                    heapq.heappush(self._heaps.setdefault(name, []), (-score(self.entries[i], self._today), i))
+
+    def mark_used(self, keyword: str, used_date: Optional[str] = None) -> bool:
+        with self._lock:
+            i = self._ids.get(fold(keyword))
+            if i is None or self.entries[i].get('used'):
+                return False
+            self._log({"op": "used", "keyword": self.entries[i]['keyword'],
+                       "date": used_date or date.today().isoformat()})
+            self._claimed.discard(i)
+            return True
+
+    def add(self, entries: Iterable[Dict], generated_by: str = 'manual') -> int:
+        """New candidates (keyword, category, optional priority / volume / rising / trend_date);
+        keywords already in the pool are skipped. One journal record for the whole batch"""
+        today = date.today().isoformat()
+        batch = []
+        with self._lock:
+            seen = set()
+            for entry in entries:
+                key = fold(entry['keyword'])
+                if key in self._ids or key in seen:
+                    continue
+                seen.add(key)
+                item = dict(entry)
+                item.setdefault('generated_by', generated_by)
+                item.setdefault('generated_date', today)
+                item.setdefault('used', False)
+                batch.append(item)
+            if not batch:
+                return 0
+            for i in self._log({"op": "add", "entries": batch}):
+                name = self.entries[i].get('category', '')
+                heapq.heappush(self._heaps.setdefault(name, []), (-score(self.entries[i], self._today), i))
+            return len(batch)
+
+    def peek(self, count: int, category: Optional[str] = None) -> List[Dict]:
+        """What claim() would return, without claiming"""
+        with self._lock:
+            heaps = {name: list(heap) for name, heap in self._heaps.items()}
+            claims = dict(self._claims)
+            claimed = set(self._claimed)
+            try:
+                result = []
+                while len(result) < count:
+                    i = self._pop(category)
+                    if i is None:
+                        break
+                    self._claimed.add(i)
+                    result.append(self.entries[i])
+                return result
+            finally:
+                self._heaps, self._claims, self._claimed = heaps, claims, claimed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        by_category: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for entry in self.entries:
+                s = by_category.setdefault(entry.get('category', ''), {"total": 0, "used": 0})
+                s["total"] += 1
+                s["used"] += 1 if entry.get('used') else 0
+        return by_category
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyword pool scheduler')
+    parser.add_argument('command', choices=['stats', 'next', 'compact'])
+    parser.add_argument('count', type=int, nargs='?', default=10)
+    parser.add_argument('--category', help='Only this category')
+    parser.add_argument('--pool', default=os.path.join(os.getcwd(), 'keywords_pool.json'))
+    args = parser.parse_args()
+
+    pool = KeywordPool(args.pool)
+    if args.command == 'stats':
+        print(f"\n{'category':>14} {'total':>8} {'used':>8} {'left':>8}")
+        for name, s in sorted(pool.stats().items()):
+            print(f"{name:>14} {s['total']:>8} {s['used']:>8} {s['total'] - s['used']:>8}")
+        print(f"{'':>14} {len(pool):>8}\n")
+    elif args.command == 'next':
+        for entry in pool.peek(args.count, args.category):
+            print(f"{score(entry):6.2f}  [{entry.get('category')}] {entry['keyword']}")
+    else:
+        pool.compact()
+        print(f"✅ {len(pool)} keywords -> {args.pool}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local stand-in for the Messages API - measure the pipeline without spending money
+• POST /v1/messages, plain JSON or SSE (stream: true), in the shape _call_claude reads
+• Every "N. A vs B (kategoria: X)" line of the prompt gets an article; bodies are synthetic
+  or replayed from recordings (claude_cache.sqlite or a public/content tree)
+• Synthetic bodies follow VS_TEMPLATE (comparison table, quick answer, verdict), so they
+  pass the post-processing gates (post_process.py) unless made defective
+• Knobs: time to first token, output tokens/s, words per article, tokens per word,
+  429 / 529 rates (with retry-after), truncation at max_tokens, malformed articles,
+  defective articles (valid JSON, short table and no verdict - rejected by the gates)
+• Same --seed, same sequence of errors and truncations
+
+    python mock_anthropic_server.py --port 8765 --ttfb 1.5 --tps 400 --rate-429 0.05
+    python claude_premium_v11_FINAL.py --base-url http://127.0.0.1:8765 --vs 10
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from stream_json import parse_articles
+
+COMPARISON = re.compile(r'^\d+\. (.+?) vs (.+?) \(kategoria: (.+?)\)$', re.MULTILINE)
+# Polish prose with HTML markup, as the batch planner assumes before it has samples
+TOKENS_PER_WORD = 2.8
+CHUNK_CHARS = 400
+
+
+def load_recordings(path: str) -> List[str]:
+    """Article bodies (html) from a response cache (claude_cache.sqlite) or an article tree"""
+    bodies = []
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith('.json'):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                        html = json.load(f).get('Article')
+                    if html:
+                        bodies.append(html)
+        return bodies
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for (response,) in db.execute("SELECT response FROM responses ORDER BY created"):
+            for article in parse_articles(json.loads(response).get('content') or ''):
+                if article.get('html'):
+                    bodies.append(article['html'])
+    finally:
+        db.close()
+    return bodies
+
+
+class MockAnthropicServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, ttfb: float = 0.5, jitter: float = 0.2,
+                 tokens_per_second: float = 0, words: int = 600, tokens_per_word: float = TOKENS_PER_WORD,
+                 rate_429: float = 0.0, rate_529: float = 0.0, truncate: float = 0.0, malformed: float = 0.0,
+                 defective: float = 0.0, retry_after: float = 1.0, recordings: Optional[List[str]] = None, seed: Optional[int] = None):
+        """ttfb +- jitter (fraction) before the first token; tokens_per_second=0: no pacing"""
+        self.ttfb = ttfb
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.words = words
+        self.tokens_per_word = tokens_per_word
+        self.rate_429 = rate_429
+        self.rate_529 = rate_529
+        self.truncate = truncate
+        self.malformed = malformed
+        self.defective = defective
+        self.retry_after = retry_after
+        self.recordings = recordings or []
+        self.stats: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cached_prefixes = set()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockAnthropicServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def _draws(self, count: int) -> List[float]:
+        """All random numbers of one request in one go - the sequence depends only on the seed
+        and the order of requests, not on thread scheduling inside a request"""
+        with self._lock:
+            return [self._random.random() for _ in range(count)]
+
+    # ---------- response ----------
+
+    def _synthetic_html(self, topic_a: str, topic_b: str, words: int, defective: bool) -> str:
+        """VS_TEMPLATE's structure with ~words words; defective: 6 table rows and no verdict"""
+        rows = ''.join(f"<tr><td>Cecha {n}</td><td>{topic_a} {n}</td><td>{topic_b} {n}</td>"
+                       f"<td class=\"winner-cell\">🏆 {(topic_a, topic_b)[n % 2]}</td></tr>"
+                       for n in range(1, 7 if defective else 12))
+        table = (f"<table class=\"comparison-table\"><thead><tr><th>Kryterium</th><th>{topic_a}</th><th>{topic_b}</th>"
+                 f"<th>Zwycięzca</th></tr></thead><tbody>{rows}</tbody></table>")
+        verdict = ("" if defective else
+                   f"<h2>Werdykt</h2><div class=\"verdict\"><p><strong>🏆 ZWYCIĘZCA:</strong> {topic_a}</p>"
+                   f"<p><strong>💡 REKOMENDACJA:</strong> {topic_b} przy niskim budżecie.</p></div>")
+        sentence = f"{topic_a} i {topic_b} różnią się ceną, jakością i zastosowaniem. "
+        # The table, headings and verdict carry ~15% of the words
+        fill = sentence * max(1, int(words * 0.85) // (len(sentence.split()) * 3))
+        return (f"<p>{fill}</p><h2>📊 Tabela Porównawcza</h2>{table}"
+                f"<h2>💰 Koszty</h2><p>{fill}</p><h2>⚖️ Zalety i Wady</h2><p>{fill}</p>"
+                f"<h2>🎯 Szybka Odpowiedź</h2><div class=\"quick-answer\"><p>Wybierz {topic_a}, jeśli liczy się jakość.</p></div>"
+                f"{verdict}")
+
+    def _article(self, idx: int, topic_a: str, topic_b: str, category: str, draw: float, defective: bool = False) -> Dict:
+        if self.recordings:
+            html = self.recordings[(idx - 1 + int(draw * len(self.recordings))) % len(self.recordings)]
+            words = len(re.sub(r'<[^>]+>', ' ', html).split())
+        else:
+            words = self.words
+            html = self._synthetic_html(topic_a, topic_b, words, defective)
+        return {"comparison_id": idx, "topic_a": topic_a, "topic_b": topic_b, "category": category,
+                "html": html, "word_count": words, "winner": ("topic_a", "topic_b", "tie")[int(draw * 3)]}
+
+    def _respond(self, body: Dict) -> Dict:
+        """Text, usage and stop_reason for one request"""
+        blocks = body['messages'][-1]['content']
+        if isinstance(blocks, str):
+            blocks = [{"type": "text", "text": blocks}]
+        prompt = ''.join(b.get('text', '') for b in blocks)
+        comparisons = COMPARISON.findall(prompt)
+        draws = self._draws(2 + 3 * len(comparisons))
+
+        if comparisons:
+            parts = []
+            output_tokens = 0
+            for i, (a, b, cat) in enumerate(comparisons, 1):
+                body_draw, malformed_draw, defect_draw = draws[3 * i - 1:3 * i + 2]
+                defective = defect_draw < self.defective
+                if defective:
+                    self._count('defective')
+                article = self._article(i, a, b, cat, body_draw, defective)
+                output_tokens += int(article['word_count'] * self.tokens_per_word) + 60
+                if malformed_draw < self.malformed:
+                    self._count('malformed')
+                    parts.append('{"comparison_id": %d, "word_count": 5 500, "html": ""}' % i)
+                else:
+                    parts.append(json.dumps(article, ensure_ascii=False))
+            text = '{"articles": [' + ', '.join(parts) + ']}'
+        else:
+            text = "test"
+            output_tokens = 2
+
+        stop_reason = 'end_turn'
+        max_tokens = body.get('max_tokens') or output_tokens
+        if output_tokens > max_tokens or draws[0] < self.truncate:
+            # Cut where max_tokens (or a random point) falls; the payload ends mid-article
+            keep = max_tokens / output_tokens if output_tokens > max_tokens else 0.4 + 0.5 * draws[1]
+            text = text[:int(len(text) * keep)]
+            output_tokens = min(max_tokens, int(output_tokens * keep))
+            stop_reason = 'max_tokens'
+            self._count('truncated')
+
+        # Cached prefix: written on its first use, read afterwards
+        usage = {"input_tokens": len(json.dumps(body, ensure_ascii=False)) // 3, "output_tokens": output_tokens}
+        cached = [b['text'] for b in blocks if b.get('cache_control')]
+        if cached:
+            prefix_tokens = sum(len(t) for t in cached) // 3
+            usage["input_tokens"] = max(1, usage["input_tokens"] - prefix_tokens)
+            with self._lock:
+                seen = all(t in self._cached_prefixes for t in cached)
+                self._cached_prefixes.update(cached)
+            usage["cache_read_input_tokens" if seen else "cache_creation_input_tokens"] = prefix_tokens
+        return {"text": text, "usage": usage, "stop_reason": stop_reason, "model": body.get('model')}
+
+    def _first_token_delay(self) -> float:
+        jitter = self._draws(1)[0] * 2 - 1
+        return max(0.0, self.ttfb * (1 + self.jitter * jitter))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('content-type', 'application/json')
+                self.send_header('content-length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _error(self, status: int, kind: str, message: str, headers: Optional[Dict] = None):
+                self._json(status, {"type": "error", "error": {"type": kind, "message": message}}, headers)
+
+            def do_GET(self):
+                self._error(404, 'not_found_error', f"{self.path} is not mocked")
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('content-length') or 0)) or b'{}')
+                if self.path != '/v1/messages':
+                    self._error(404, 'not_found_error', f"{self.path} is not mocked")
+                    return
+                server._count('requests')
+
+                draw = server._draws(1)[0]
+                if draw < server.rate_429:
+                    server._count('http_429')
+                    self._error(429, 'rate_limit_error', 'Mock rate limit', {'retry-after': f"{server.retry_after:g}"})
+                    return
+                if draw < server.rate_429 + server.rate_529:
+                    server._count('http_529')
+                    self._error(529, 'overloaded_error', 'Mock overload', {'retry-after': f"{server.retry_after:g}"})
+                    return
+
+                response = server._respond(body)
+                delay = server._first_token_delay()
+                pace = 1 / server.tokens_per_second if server.tokens_per_second else 0
+                try:
+                    if body.get('stream'):
+                        self._stream(response, delay, pace)
+                    else:
+                        time.sleep(delay + response['usage']['output_tokens'] * pace)
+                        self._json(200, {
+                            "id": "msg_mock", "type": "message", "role": "assistant", "model": response['model'],
+                            "content": [{"type": "text", "text": response['text']}],
+                            "stop_reason": response['stop_reason'], "usage": response['usage']
+                        })
+                    server._count('ok')
+                except (BrokenPipeError, ConnectionResetError):
+                    server._count('client_closed')
+
+            def _stream(self, response: Dict, delay: float, pace: float):
+                self.send_response(200)
+                self.send_header('content-type', 'text/event-stream')
+                self.send_header('transfer-encoding', 'chunked')
+                self.end_headers()
+
+                def event(payload: Dict):
+                    data = f"event: {payload['type']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8')
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+
+                usage = response['usage']
+                text = response['text']
+                event({"type": "message_start", "message": {
+                    "id": "msg_mock", "type": "message", "role": "assistant", "model": response['model'],
+                    "content": [], "stop_reason": None,
+                    "usage": dict(usage, output_tokens=1)
+                }})
+                event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+                time.sleep(delay)
+                tokens_per_char = usage['output_tokens'] / max(1, len(text))
+                for i in range(0, len(text), CHUNK_CHARS):
+                    chunk = text[i:i + CHUNK_CHARS]
+                    event({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}})
+                    if pace:
+                        time.sleep(len(chunk) * tokens_per_char * pace)
+                event({"type": "content_block_stop", "index": 0})
+                event({"type": "message_delta", "delta": {"stop_reason": response['stop_reason']},
+                       "usage": {"output_tokens": usage['output_tokens']}})
+                event({"type": "message_stop"})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Mock knobs - shared with benchmarks/bench_pipeline.py"""
+    parser.add_argument('--ttfb', type=float, default=0.5, help='Seconds before the first token (default: 0.5)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='TTFB varies by +- this fraction (default: 0.2)')
+    parser.add_argument('--tps', type=float, default=0, help='Output tokens per second, 0 = as fast as possible')
+    parser.add_argument('--words', type=int, default=600, help='Words per synthetic article (default: 600)')
+    parser.add_argument('--tokens-per-word', type=float, default=TOKENS_PER_WORD, help='Output tokens per word')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Share of requests answered 429')
+    parser.add_argument('--rate-529', type=float, default=0.0, help='Share of requests answered 529 (overloaded)')
+    parser.add_argument('--truncate', type=float, default=0.0, help='Share of responses cut off (stop_reason max_tokens)')
+    parser.add_argument('--malformed', type=float, default=0.0, help='Share of articles sent as invalid JSON')
+    parser.add_argument('--defective', type=float, default=0.0, help='Share of articles that fail the post-processing gates')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='retry-after of 429/529 answers (s)')
+    parser.add_argument('--recordings', help='claude_cache.sqlite or an article tree to take bodies from')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+
+
+def from_arguments(args: argparse.Namespace, host: str = '127.0.0.1', port: int = 0) -> MockAnthropicServer:
+    recordings = load_recordings(args.recordings) if args.recordings else None
+    if args.recordings and not recordings:
+        print(f"⚠️  No article bodies in {args.recordings} - using synthetic ones")
+    return MockAnthropicServer(host, port, ttfb=args.ttfb, jitter=args.jitter, tokens_per_second=args.tps,
+                               words=args.words, tokens_per_word=args.tokens_per_word,
+                               rate_429=args.rate_429, rate_529=args.rate_529, truncate=args.truncate,
+                               malformed=args.malformed, defective=args.defective, retry_after=args.retry_after,
+                               recordings=recordings, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock of the Anthropic Messages API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = from_arguments(args, args.host, args.port)
+    print(f"🧪 Mock Messages API on {server.url} (ANTHROPIC_BASE_URL={server.url})")
+    if server.recordings:
+        print(f"   {len(server.recordings)} recorded article bodies")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\n📊 {json.dumps(server.stats)}")
+
+
+if __name__ == '__main__':
+    main()
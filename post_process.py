@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Post-processing of generated VS articles - runs in a process pool, off the threads that wait on the API
+• Sanitizer: allowlisted tags and attributes only (class everywhere, http(s) href on links);
+  script / style / iframe dropped with their content, unclosed tags closed, markdown fences stripped
+• Real word count of the sanitized HTML (content_validator.html_word_count), not the model's word_count
+• Winner (topic_a / topic_b / tie) read from the verdict, then the table's winner cells -
+  the model's winner field only when neither names one
+• Quality gates: comparison table with 10-12 rows, "Szybka Odpowiedź", verdict, minimum words -
+  an article that fails one is not published, the autopilot queues the pair for regeneration
+
+    python post_process.py public/content/finanse/ike-vs-ikze.json
+"""
+
+import argparse
+import html as html_lib
+import os
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from html.parser import HTMLParser
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+from content_validator import MIN_WORDS, html_word_count
+from topic_index import fold
+
+MIN_TABLE_ROWS = 10
+MAX_TABLE_ROWS = 12
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'h2', 'h3', 'h4', 'hr', 'i', 'li', 'ol', 'p',
+    'pre', 'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead',
+    'tr', 'u', 'ul'
+}
+VOID_TAGS = {'br', 'hr'}
+# Dropped together with everything inside them
+DROP_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'svg', 'math',
+             'form', 'head', 'title', 'textarea', 'select'}
+# The page renders the article's H1 itself
+RENAME_TAGS = {'h1': 'h2', 'h5': 'h4', 'h6': 'h4'}
+# Closed implicitly by the next sibling (<li>a<li>b), an open <p> by any block
+IMPLIED_END = {'li': ('li',), 'tr': ('tr', 'td', 'th'), 'td': ('td', 'th'), 'th': ('td', 'th'),
+               'tbody': ('thead', 'tr', 'td', 'th'), 'tfoot': ('tbody', 'tr', 'td', 'th')}
+BLOCK_TAGS = {'blockquote', 'div', 'h2', 'h3', 'h4', 'hr', 'ol', 'p', 'pre', 'table', 'ul'}
+_CLASS = re.compile(r'[^A-Za-z0-9_ -]')
+_SPAN = re.compile(r'^\d{1,2}$')
+_FENCE = re.compile(r'^\s*```[a-z]*\s*|\s*```\s*$')
+
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds the HTML from allowlisted parts and notes the structure the gates need"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self.removed = 0
+        self.table_rows: Optional[int] = None  # body rows of the first comparison-table
+        self.winner_cells: List[str] = []
+        self.headings: List[str] = []
+        self.classes = set()
+        self.verdict = ''
+        self._stack: List[str] = []
+        self._drop = 0
+        self._table = 0       # depth inside the comparison table, 0 = outside
+        self._row_cells = None
+        self._capture: List[List] = []  # [tag depth, kind, pieces]
+
+    def handle_starttag(self, tag, attrs):
+        if self._drop or tag in DROP_TAGS:
+            self._drop += tag in DROP_TAGS
+            self.removed += 1
+            return
+        tag = RENAME_TAGS.get(tag, tag)
+        if tag not in ALLOWED_TAGS:
+            self.removed += 1
+            return
+
+        kept = []
+        for name, value in attrs:
+            value = value or ''
+            if name == 'class':
+                value = _CLASS.sub('', value).strip()
+                if value:
+                    kept.append((name, value))
+            elif name == 'href' and tag == 'a' and value.strip().lower().startswith(('http://', 'https://', '/')):
+                kept.append((name, value.strip()))
+            elif name in ('colspan', 'rowspan') and tag in ('td', 'th') and _SPAN.match(value):
+                kept.append((name, value))
+            else:
+                self.removed += 1
+        classes = dict(kept).get('class', '').split()
+        self.classes.update(classes)
+        if tag == 'a' and any(name == 'href' for name, _ in kept):
+            kept.append(('rel', 'nofollow noopener'))
+
+        implied = IMPLIED_END.get(tag, ()) + (('p',) if tag in BLOCK_TAGS else ())
+        while self._stack and self._stack[-1] in implied:
+            self._close()
+        self.out.append(f"<{tag}" + ''.join(f' {name}="{html_lib.escape(value)}"' for name, value in kept) + '>')
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+
+        if tag == 'table':
+            if self._table:
+                self._table += 1
+            elif self.table_rows is None and 'comparison-table' in classes:
+                self._table = 1
+                self.table_rows = 0
+        elif self._table == 1 and tag == 'tr':
+            self._row_cells = 0
+        elif self._table == 1 and tag == 'td' and self._row_cells is not None:
+            self._row_cells += 1
+            if 'winner-cell' in classes:
+                self._capture.append([len(self._stack), 'winner', []])
+        if tag in ('h2', 'h3'):
+            self._capture.append([len(self._stack), 'heading', []])
+        elif tag == 'div' and 'verdict' in classes and not self.verdict:
+            self._capture.append([len(self._stack), 'verdict', []])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._drop:
+            if tag in DROP_TAGS:
+                self._drop -= 1
+            return
+        tag = RENAME_TAGS.get(tag, tag)
+        if tag not in self._stack:
+            return
+        # Misnested: everything opened after it is closed first
+        while self._stack:
+            if self._close() == tag:
+                break
+
+    def _close(self) -> str:
+        depth = len(self._stack)
+        tag = self._stack.pop()
+        self.out.append(f"</{tag}>")
+        while self._capture and self._capture[-1][0] == depth:
+            _, kind, pieces = self._capture.pop()
+            text = ' '.join(''.join(pieces).split())
+            if kind == 'winner':
+                self.winner_cells.append(text)
+            elif kind == 'heading':
+                self.headings.append(text)
+            else:
+                self.verdict = text
+        if tag == 'table' and self._table:
+            self._table -= 1
+        elif tag == 'tr' and self._table == 1 and self._row_cells is not None:
+            self.table_rows += self._row_cells > 0
+            self._row_cells = None
+        return tag
+
+    def handle_data(self, data):
+        if self._drop or not data:
+            return
+        self.out.append(html_lib.escape(data, quote=False))
+        for capture in self._capture:
+            capture[2].append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close()
+
+
+def sanitize(html: str) -> _Sanitizer:
+    sanitizer = _Sanitizer()
+    sanitizer.feed(_FENCE.sub('', html or ''))
+    sanitizer.close()
+    return sanitizer
+
+
+def sanitize_html(html: str) -> str:
+    """Allowlisted, balanced HTML"""
+    return ''.join(sanitize(html).out)
+
+
+WINNERS = ('topic_a', 'topic_b', 'tie')
+
+
+def _stems(topic: str, other: str) -> List[str]:
+    """Words only this topic has, cut to a stem so inflected forms match ("kredyt" ~ "kredytu")"""
+    shared = set(fold(other).split())
+    return [w[:max(4, len(w) - 2)] for w in fold(topic).split() if w not in shared]
+
+
+def _named(text: str, topic_a: str, topic_b: str) -> Optional[str]:
+    """'topic_a' / 'topic_b' when a text names only that one, 'tie' for both or a draw, None for neither"""
+    words = fold(text).split()
+    if 'remis' in words:
+        return 'tie'
+    a = any(w.startswith(s) for s in _stems(topic_a, topic_b) for w in words)
+    b = any(w.startswith(s) for s in _stems(topic_b, topic_a) for w in words)
+    if a != b:
+        return 'topic_a' if a else 'topic_b'
+    return 'tie' if a else None
+
+
+def find_winner(verdict: str, winner_cells: List[str], topic_a: str, topic_b: str) -> Optional[str]:
+    """From the "ZWYCIĘZCA: ..." line of the verdict (a conditional "A for ..., B for ..." is a tie),
+    else the majority of the table's winner cells"""
+    folded = fold(verdict)
+    start = folded.find('zwyciezca')
+    if start >= 0:
+        # Up to the next labelled line, the verdict text follows it
+        line = re.split(r'\brekomendacja\b', folded[start + len('zwyciezca'):], 1)[0]
+        named = _named(line, topic_a, topic_b)
+        if named:
+            return named
+    votes = [_named(cell, topic_a, topic_b) for cell in winner_cells]
+    a, b = votes.count('topic_a'), votes.count('topic_b')
+    if a or b:
+        return 'topic_a' if a > b else 'topic_b' if b > a else 'tie'
+    return None
+
+
+def process_article(html: str, topic_a: str, topic_b: str, claimed_winner: Optional[str] = None,
+                    rules: Optional[Dict] = None) -> Dict:
+    """Sanitized html, real word count, winner and gate failures (empty issues = publishable).
+    Top-level and plain-data in/out - it runs in a pool process."""
+    started = time.perf_counter()
+    rules = rules or {}
+    min_words = rules.get('min_words', MIN_WORDS)
+    min_rows, max_rows = rules.get('table_rows', (MIN_TABLE_ROWS, MAX_TABLE_ROWS))
+
+    sanitizer = sanitize(html)
+    clean = ''.join(sanitizer.out)
+    words = html_word_count(clean)
+    issues = []
+    if words < min_words:
+        issues.append(f"za krótki artykuł ({words} słów, minimum {min_words})")
+    if sanitizer.table_rows is None:
+        issues.append('brak tabeli porównawczej (table class="comparison-table")')
+    elif not min_rows <= sanitizer.table_rows <= max_rows:
+        issues.append(f"tabela porównawcza ma {sanitizer.table_rows} wierszy (wymagane {min_rows}-{max_rows})")
+    if 'quick-answer' not in sanitizer.classes and not any('szybka odpowiedz' in fold(h) for h in sanitizer.headings):
+        issues.append('brak sekcji "Szybka Odpowiedź"')
+    if not sanitizer.verdict:
+        issues.append('brak werdyktu (div class="verdict")')
+
+    winner = find_winner(sanitizer.verdict, sanitizer.winner_cells, topic_a, topic_b)
+    if winner is None:
+        winner = claimed_winner if claimed_winner in WINNERS else 'tie'
+    return {
+        'html': clean,
+        'words': words,
+        'winner': winner,
+        'issues': issues,
+        'removed': sanitizer.removed,
+        'table_rows': sanitizer.table_rows,
+        'ms': round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+class PostProcessor:
+    """process_article in worker processes; workers=0 runs it in the calling thread"""
+
+    def __init__(self, workers: int = 0, rules: Optional[Dict] = None):
+        self.rules = rules or {}
+        self.workers = workers
+        # spawn: the autopilot has HTTP threads running, a forked child would inherit their locks
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) if workers > 0 else None
+
+    def submit(self, html: str, topic_a: str, topic_b: str, claimed_winner: Optional[str] = None) -> Future:
+        if self._pool:
+            return self._pool.submit(process_article, html, topic_a, topic_b, claimed_winner, self.rules)
+        future = Future()
+        try:
+            future.set_result(process_article(html, topic_a, topic_b, claimed_winner, self.rules))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+def main():
+    from article_store import read_article
+
+    parser = argparse.ArgumentParser(description='Run the post-processing gates on saved VS articles')
+    parser.add_argument('files', nargs='+', help='Article JSON files')
+    parser.add_argument('--min-words', type=int, default=MIN_WORDS)
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.files:
+        fields = read_article(path)
+        if not fields.get('TopicA'):
+            print(f"⏭️  {path}: not a VS article")
+            continue
+        result = process_article(fields.get('Article') or '', fields['TopicA'], fields['TopicB'],
+                                 fields.get('Winner'), {'min_words': args.min_words})
+        failed += bool(result['issues'])
+        status = '❌' if result['issues'] else '✅'
+        print(f"{status} {os.path.relpath(path)}: {result['words']} words, {result['table_rows']} rows, "
+              f"winner {result['winner']} ({result['ms']:.1f} ms, {result['removed']} removed)")
+        for issue in result['issues']:
+            print(f"   • {issue}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Adaptive rate limiter for the Claude API
+• Token buckets: requests / input tokens / output tokens per minute
+• Limits follow anthropic-ratelimit-* response headers
+• 429/529 + retry-after pause every worker, jittered backoff
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, NamedTuple, Optional
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously over one minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (never more than a full bucket)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def consume(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        self.tokens -= amount
+        return amount
+
+    def refund(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def adjust(self, limit: Optional[float], remaining: Optional[float], now: float):
+        """Trust the server: its limit is our capacity, its remaining caps our tokens"""
+        self._refill(now)
+        if limit and limit > 0:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining), self.capacity)
+
+
+class Reservation(NamedTuple):
+    waited: float
+    input_tokens: float
+    output_tokens: float
+
+
+class RateLimiter:
+    """Shared by every _call_claude - thread safe"""
+
+    HEADER_PREFIX = 'anthropic-ratelimit-'
+    BUCKETS = ('requests', 'input-tokens', 'output-tokens')
+
+    # Tier 1 limits of the Sonnet models - the headers of the first response replace them
+    def __init__(self, requests_per_minute: float = 50, input_tokens_per_minute: float = 30000,
+                 output_tokens_per_minute: float = 8000, base_backoff: float = 2.0, max_backoff: float = 60.0):
+        self.buckets = {
+            'requests': TokenBucket(requests_per_minute),
+            'input-tokens': TokenBucket(input_tokens_per_minute),
+            'output-tokens': TokenBucket(output_tokens_per_minute),
+        }
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+        self._clamped = set()
+
+    def acquire(self, input_tokens: int, output_tokens: int) -> Reservation:
+        """Block until the request fits all buckets. A request bigger than a whole bucket waits for
+        a full bucket and empties it - logged once per limit, it means one such call per minute."""
+        want = {'requests': 1, 'input-tokens': input_tokens, 'output-tokens': output_tokens}
+        start = time.monotonic()
+        with self._cond:
+            for name, amount in want.items():
+                capacity = self.buckets[name].capacity
+                if amount > capacity and (name, capacity) not in self._clamped:
+                    self._clamped.add((name, capacity))
+                    print(f"   ⚠️  Rate limiter: request needs {amount:,.0f} {name}, the limit is {capacity:,.0f}/min - "
+                          f"one such request per minute (raise rate_limits in config.json to your tier)")
+            while True:
+                now = time.monotonic()
+                wait = max([self.paused_until - now] + [self.buckets[name].wait_time(amount, now) for name, amount in want.items()])
+                if wait <= 0:
+                    taken = {}
+                    for name, amount in want.items():
+                        taken[name] = self.buckets[name].consume(amount, now)
+                    return Reservation(now - start, taken['input-tokens'], taken['output-tokens'])
+                self._cond.wait(timeout=wait)
+
+    def reconcile(self, reservation: Reservation, actual_input: int, actual_output: int):
+        """Give back what the estimate over-reserved (or charge what it missed)"""
+        with self._cond:
+            self.buckets['input-tokens'].refund(reservation.input_tokens - actual_input)
+            self.buckets['output-tokens'].refund(reservation.output_tokens - actual_output)
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Read anthropic-ratelimit-{requests,input-tokens,output-tokens}-{limit,remaining,reset}"""
+        if not headers:
+            return
+        with self._cond:
+            now = time.monotonic()
+            for name in self.BUCKETS:
+                limit = _to_float(headers.get(f"{self.HEADER_PREFIX}{name}-limit"))
+                remaining = _to_float(headers.get(f"{self.HEADER_PREFIX}{name}-remaining"))
+                if limit is None and remaining is None:
+                    continue
+                self.buckets[name].adjust(limit, remaining, now)
+                if remaining is not None and remaining <= 0:
+                    reset_in = _seconds_until(headers.get(f"{self.HEADER_PREFIX}{name}-reset"))
+                    if reset_in:
+                        self.paused_until = max(self.paused_until, now + reset_in)
+            self._cond.notify_all()
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> float:
+        """429/529 - stop every worker until retry-after (or a short backoff) passes"""
+        pause = retry_after if retry_after is not None else self.base_backoff
+        pause += random.uniform(0, min(1.0, pause * 0.1))
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        return pause
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with jitter, never shorter than retry-after"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        wait = random.uniform(ceiling / 2, ceiling)
+        if retry_after is not None:
+            wait = max(wait, retry_after + random.uniform(0, 1.0))
+        return wait
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._cond:
+            now = time.monotonic()
+            for bucket in self.buckets.values():
+                bucket._refill(now)
+            return {name: round(bucket.tokens, 1) for name, bucket in self.buckets.items()}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """retry-after is seconds (Anthropic) or an HTTP date"""
+    if not value:
+        return None
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _seconds_until(reset: Optional[str]) -> Optional[float]:
+    """Reset headers are RFC 3339 timestamps"""
+    if not reset:
+        return None
+    try:
+        when = datetime.fromisoformat(reset.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Crash-safe file writes
+• atomic_write(): temp file in the same directory + fsync + rename - readers see old or new, never half
+• Journal: append-only JSONL with sequence numbers, fsync-ed per record; replayed on start,
+  emptied once a snapshot that includes it is on disk
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Union
+
+
+def fsync_dir(path: str):
+    """Persist a rename in `path` (no-op where directories cannot be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: Union[str, bytes], encoding: str = 'utf-8'):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data.encode(encoding) if isinstance(data, str) else data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    fsync_dir(directory)
+
+
+def atomic_write_json(path: str, data, **kwargs):
+    """json.dumps kwargs pass through (ensure_ascii=False by default)"""
+    kwargs.setdefault('ensure_ascii', False)
+    atomic_write(path, json.dumps(data, **kwargs))
+
+
+class Journal:
+    """Write-ahead log of records not yet folded into a snapshot"""
+
+    def __init__(self, path: str, start_seq: int = 0):
+        self.path = path
+        self.last_seq = start_seq
+        self.pending = 0
+        self._repair()
+        for record in self.read():
+            self.last_seq = max(self.last_seq, record['seq'])
+
+    def _repair(self):
+        """Cut a torn last line so the next append starts on a fresh one"""
+        try:
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        except OSError:
+            pass
+
+    def read(self, after_seq: int = 0) -> List[Dict]:
+        """Records with seq > after_seq; unreadable lines are skipped"""
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('seq', 0) > after_seq:
+                        records.append(record)
+        except OSError:
+            pass
+        return records
+
+    def append(self, record: Dict) -> int:
+        self.last_seq += 1
+        line = json.dumps(dict(record, seq=self.last_seq), ensure_ascii=False) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += 1
+        return self.last_seq
+
+    def checkpoint(self):
+        """Call after a snapshot holding last_seq is on disk"""
+        try:
+            has_records = os.path.getsize(self.path) > 0
+        except OSError:
+            has_records = False
+        if has_records:
+            atomic_write(self.path, '')
+        self.pending = 0
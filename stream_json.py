@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Incremental parser for batch responses: {"articles": [ {...}, {...} ]}
+• feed() text as it arrives, get every finished article right away
+• Markdown fences / chatter around the JSON are skipped
+• A payload cut at max_tokens still yields every complete article
+"""
+
+import json
+import re
+from typing import Dict, List
+
+
+class ArticleStreamParser:
+    """Yields each element of the top-level array as soon as its closing brace arrives"""
+
+    _STRUCT = re.compile(r'[{}"]')
+    _STRING = re.compile(r'["\\]')
+    _ARRAY = re.compile(r'[{\]]')
+
+    def __init__(self, array_key: str = 'articles'):
+        self._open = re.compile(r'"%s"\s*:\s*\[' % re.escape(array_key))
+        self.state = 'seek'          # seek -> array <-> element -> done
+        self._pending = ''           # tail kept while looking for the array key
+        self._parts: List[str] = []  # current element, chunk by chunk
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.parsed = 0
+        self.errors = 0
+
+    @property
+    def truncated(self) -> bool:
+        """True when the payload ended before the closing ] of the array"""
+        return self.state != 'done'
+
+    @property
+    def pending_chars(self) -> int:
+        return sum(len(p) for p in self._parts)
+
+    def feed(self, chunk: str) -> List[Dict]:
+        out = []
+        if self.state == 'done' or not chunk:
+            return out
+
+        if self.state == 'seek':
+            self._pending += chunk
+            m = self._open.search(self._pending)
+            if not m:
+                self._pending = self._pending[-64:]
+                return out
+            chunk = self._pending[m.end():]
+            self._pending = ''
+            self.state = 'array'
+
+        i = 0
+        seg_start = 0
+        n = len(chunk)
+
+        while i < n:
+            if self.state == 'array':
+                m = self._ARRAY.search(chunk, i)
+                if not m:
+                    return out
+                if m.group() == ']':
+                    self.state = 'done'
+                    return out
+                self.state = 'element'
+                self._parts = []
+                self._depth = 0
+                seg_start = i = m.start()
+
+            if self._escape:
+                self._escape = False
+                i += 1
+                continue
+
+            if self._in_string:
+                m = self._STRING.search(chunk, i)
+                if not m:
+                    break
+                if m.group() == '\\':
+                    i = m.end() + 1
+                    if i > n:
+                        self._escape = True
+                else:
+                    self._in_string = False
+                    i = m.end()
+                continue
+
+            m = self._STRUCT.search(chunk, i)
+            if not m:
+                break
+            c = m.group()
+            i = m.end()
+            if c == '"':
+                self._in_string = True
+            elif c == '{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[seg_start:i])
+                    article = self._decode(''.join(self._parts))
+                    self._parts = []
+                    self.state = 'array'
+                    if article is not None:
+                        out.append(article)
+
+        if self.state == 'element':
+            self._parts.append(chunk[seg_start:])
+        return out
+
+    def _decode(self, text: str):
+        try:
+            value = json.loads(text)
+        except ValueError:
+            self.errors += 1
+            return None
+        if not isinstance(value, dict):
+            self.errors += 1
+            return None
+        self.parsed += 1
+        return value
+
+
+def parse_articles(text: str, array_key: str = 'articles') -> List[Dict]:
+    """One-shot helper: every complete article in a (possibly truncated) payload"""
+    return ArticleStreamParser(array_key).feed(text)
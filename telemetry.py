@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-call and per-stage telemetry (JSONL)
+• One line per API call (tokens, cost, bytes, attempt, outcome) and per timed stage
+  (select, prompt, request, parse, save)
+• Hot path = perf_counter + list append; lines are written in batches, never fsync-ed
+• report: latency percentiles, stage times, throughput, cost per article
+
+    python telemetry.py report                 # every run in telemetry.jsonl
+    python telemetry.py report --run 12        # one run (ids from articles.sqlite)
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+FLUSH_EVERY = 50
+FLUSH_SECONDS = 5.0
+
+
+class Telemetry:
+    """path=None: disabled, every method is a no-op"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.run_id: Optional[int] = None
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def emit(self, kind: str, **fields):
+        if not self.path:
+            return
+        record = {"ts": round(time.time(), 3), "kind": kind, "run": self.run_id}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._buffer.append(line)
+            due = len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """with telemetry.stage('save', category=cat): ... -> {"kind": "stage", "stage": "save", "ms": ...}"""
+        if not self.path:
+            yield fields
+            return
+        started = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield fields
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            fields.setdefault('outcome', outcome)
+            self.emit('stage', stage=name, ms=round((time.perf_counter() - started) * 1000, 2), **fields)
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not lines:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError as e:
+            print(f"⚠️  Telemetry write error: {e}")
+
+    def close(self):
+        self.flush()
+
+
+# ---------- report ----------
+
+def read_records(path: str, run_id: Optional[int] = None) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if run_id is None or record.get('run') == run_id:
+                yield record
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest rank on a sorted list"""
+    if not values:
+        return 0.0
+    rank = min(len(values), max(1, math.ceil(p / 100 * len(values))))
+    return values[rank - 1]
+
+
+def summarize(records: Iterator[Dict]) -> Dict:
+    calls: List[Dict] = []
+    stages: Dict[str, List[float]] = {}
+    hedges: List[Dict] = []
+    articles = 0
+    first = last = None
+    for record in records:
+        first = record['ts'] if first is None else min(first, record['ts'])
+        last = record['ts'] if last is None else max(last, record['ts'])
+        if record['kind'] == 'call':
+            calls.append(record)
+        elif record['kind'] == 'hedge':
+            hedges.append(record)
+        elif record['kind'] == 'stage':
+            stages.setdefault(record['stage'], []).append(record['ms'])
+            if record['stage'] == 'save' and record.get('outcome') == 'ok':
+                articles += 1
+
+    # Batches API results have no per-call latency
+    live = [c for c in calls if c.get('outcome') == 'ok' and not c.get('cached') and c.get('ms') is not None]
+    outcomes: Dict[str, int] = {}
+    for c in calls:
+        outcomes[c.get('outcome', '?')] = outcomes.get(c.get('outcome', '?'), 0) + 1
+    latency = sorted(c['ms'] for c in live)
+    ttfb = sorted(c['ttfb_ms'] for c in live if c.get('ttfb_ms') is not None)
+    cost = sum(c.get('cost') or 0 for c in calls)
+    wall = (last - first) if first is not None else 0
+
+    return {
+        "calls": len(calls),
+        "outcomes": outcomes,
+        "retries": sum(1 for c in calls if c.get('attempt', 0) > 0),
+        "latency_ms": {p: percentile(latency, p) for p in (50, 95, 99)},
+        "ttfb_ms": {p: percentile(ttfb, p) for p in (50, 95, 99)},
+        "stages": {
+            name: {
+                "count": len(ms),
+                "total_s": sum(ms) / 1000,
+                "p50": percentile(sorted(ms), 50),
+                "p95": percentile(sorted(ms), 95),
+                "max": max(ms)
+            } for name, ms in stages.items()
+        },
+        "hedges": len(hedges),
+        "hedges_won": sum(1 for h in hedges if h.get('winner') == 'hedge'),
+        "hedge_cost": sum(c.get('cost') or 0 for c in calls if c.get('outcome') == 'hedge_cancelled'),
+        "input_tokens": sum(c.get('input_tokens') or 0 for c in calls),
+        "output_tokens": sum(c.get('output_tokens') or 0 for c in calls),
+        "cache_read_tokens": sum(c.get('cache_read_tokens') or 0 for c in calls),
+        "response_mb": sum(c.get('response_bytes') or 0 for c in calls) / 1024 / 1024,
+        "cost": cost,
+        "articles": articles,
+        "cost_per_article": cost / articles if articles else 0.0,
+        "wall_s": wall,
+        "articles_per_min": articles / (wall / 60) if wall > 0 else 0.0
+    }
+
+
+def print_report(summary: Dict, token_rates: Optional[Dict[str, tuple]] = None):
+    print(f"\n{'='*70}")
+    print(f"📈 TELEMETRY REPORT")
+    print(f"{'='*70}")
+    outcomes = ', '.join(f"{k} {v}" for k, v in sorted(summary['outcomes'].items()))
+    print(f"📞 Calls: {summary['calls']} ({outcomes or '-'}), retries: {summary['retries']}")
+    lat, ttfb = summary['latency_ms'], summary['ttfb_ms']
+    print(f"⏱️  Latency p50/p95/p99: {lat[50] / 1000:.1f}s / {lat[95] / 1000:.1f}s / {lat[99] / 1000:.1f}s")
+    if ttfb[50]:
+        print(f"⚡ TTFB    p50/p95/p99: {ttfb[50] / 1000:.1f}s / {ttfb[95] / 1000:.1f}s / {ttfb[99] / 1000:.1f}s")
+    if summary['hedges']:
+        print(f"🪁 Hedges: {summary['hedges']} fired, {summary['hedges_won']} won, ${summary['hedge_cost']:.3f} on cancelled attempts")
+    print(f"📊 Tokens: {summary['input_tokens']:,} in, {summary['output_tokens']:,} out, "
+          f"{summary['cache_read_tokens']:,} cache read ({summary['response_mb']:.1f} MB received)")
+    print(f"📝 Articles: {summary['articles']} in {summary['wall_s'] / 60:.1f} min "
+          f"({summary['articles_per_min']:.2f}/min)")
+    print(f"💰 Cost: ${summary['cost']:.2f} (${summary['cost_per_article']:.3f}/article)")
+
+    if summary['stages']:
+        print(f"\n{'stage':>10} {'count':>7} {'total':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+        for name, s in sorted(summary['stages'].items(), key=lambda kv: -kv[1]['total_s']):
+            print(f"{name:>10} {s['count']:>7} {s['total_s']:>8.1f}s {s['p50']:>7.1f}ms {s['p95']:>7.1f}ms {s['max']:>7.1f}ms")
+
+    if token_rates:
+        print(f"\n{'category':>14} {'samples':>8} {'words/art':>10} {'tok/word':>9}")
+        for category, (words, tokens, samples) in sorted(token_rates.items()):
+            print(f"{category:>14} {samples:>8} {words / samples:>10.0f} {tokens / words:>9.2f}")
+    print(f"{'='*70}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Telemetry report')
+    parser.add_argument('command', choices=['report'])
+    parser.add_argument('--file', default=os.path.join(os.getcwd(), 'telemetry.jsonl'), help='Telemetry log')
+    parser.add_argument('--run', type=int, help='Only this run id')
+    parser.add_argument('--db', default=os.path.join(os.getcwd(), 'articles.sqlite'), help='Article database (tokens per word by category)')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"❌ {args.file} not found")
+        raise SystemExit(1)
+    summary = summarize(read_records(args.file, args.run))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    token_rates = None
+    if os.path.exists(args.db):
+        from article_db import ArticleDB
+        db = ArticleDB(args.db)
+        token_rates = {c: db.token_stats(c, last=1000) for c in db.token_categories()}
+        db.close()
+    print_report(summary, token_rates)
+
+
+if __name__ == '__main__':
+    main()
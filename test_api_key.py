@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import json
+import os
 import requests
 
 print("🔍 Testing Claude API Key...\n")
@@ -22,7 +23,8 @@ else:
     print(f"✅ Key format OK")
 
 # Test API call
-url = "https://api.anthropic.com/v1/messages"
+# ANTHROPIC_BASE_URL=http://127.0.0.1:8765 -> mock_anthropic_server.py
+url = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/") + "/v1/messages"
 headers = {
     "x-api-key": api_key,
     "anthropic-version": "2023-06-01",
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+articles.sqlite <-> public/content round trip
+
+    python -m pytest tests
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from article_db import ArticleDB  # noqa: E402
+from content_manifest import ContentManifest  # noqa: E402
+
+ARTICLE = {
+    "Title": "Lokata czy obligacje",
+    "MetaDescription": "Porównanie lokaty i obligacji skarbowych",
+    "Category": "finanse",
+    "Article": "<h2>Lokata</h2><p>" + "oprocentowanie " * 300 + "</p>",
+}
+
+
+def _tree(tmp_path):
+    content_dir = tmp_path / 'content'
+    (content_dir / 'finanse').mkdir(parents=True)
+    with open(content_dir / 'finanse' / 'lokata-czy-obligacje.json', 'w', encoding='utf-8') as f:
+        json.dump(ARTICLE, f, ensure_ascii=False, indent=2)
+    manifest = ContentManifest(str(content_dir), str(tmp_path / 'content_manifest.json'))
+    db = ArticleDB(str(tmp_path / 'articles.sqlite'))
+    manifest.refresh()
+    assert db.sync_tree(str(content_dir), manifest.entries()) == (1, 0)
+    return str(content_dir), manifest, db
+
+
+def test_split_export_is_not_reimported(tmp_path):
+    content_dir, manifest, db = _tree(tmp_path)
+    assert db.export(content_dir, 'split', 'gzip', force=True)['written'] == 1
+    manifest.refresh()
+    assert db.sync_tree(content_dir, manifest.entries()) == (0, 0)
+    assert db.export(content_dir, 'split', 'gzip') == {"written": 0, "skipped": 1}
+
+
+def test_inline_export_is_not_reimported(tmp_path):
+    content_dir, manifest, db = _tree(tmp_path)
+    db.export(content_dir, 'inline', force=True)
+    manifest.refresh()
+    assert db.sync_tree(content_dir, manifest.entries()) == (0, 0)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Indexed lookups for "already written?" checks
+• Topic pairs, order independent: A|B == B|A
+• Trigram inverted index over titles for substring containment
+• Both updated incrementally as articles are saved
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+POLISH = str.maketrans({'ą': 'a', 'ć': 'c', 'ę': 'e', 'ł': 'l', 'ń': 'n', 'ó': 'o', 'ś': 's', 'ź': 'z', 'ż': 'z'})
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_VS_TITLE = re.compile(r'^(.+?) vs (.+?)(?: - |$)')
+
+
+def fold(text: str) -> str:
+    """lowercase, no diacritics, single spaces: 'Kredyt na Samochód' -> 'kredyt na samochod'"""
+    text = text.lower().translate(POLISH)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def article_pair(title: str, slug: str = '') -> Optional[Tuple[str, str]]:
+    """Compared topics of a VS article - from 'A vs B - ...' in the title, else from 'a-vs-b' in the slug"""
+    m = _VS_TITLE.match((title or '').lower())
+    if m:
+        return TopicIndex.pair_key(m.group(1), m.group(2))
+    if '-vs-' in slug:
+        a, b = slug.split('-vs-', 1)
+        return TopicIndex.pair_key(a.replace('-', ' '), b.replace('-', ' '))
+    return None
+
+
+class TopicIndex:
+    def __init__(self, n: int = 3):
+        self.n = n
+        self.pairs: Set[Tuple[str, str]] = set()
+        self.titles: List[str] = []
+        self._title_ids: Dict[str, int] = {}
+        self._grams: Dict[str, Set[int]] = {}
+
+    @staticmethod
+    def pair_key(topic_a: str, topic_b: str) -> Tuple[str, str]:
+        a, b = fold(topic_a), fold(topic_b)
+        return (a, b) if a <= b else (b, a)
+
+    def _ngrams(self, text: str) -> Set[str]:
+        n = self.n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    # ---------- updates ----------
+
+    def add_pair(self, topic_a: str, topic_b: str):
+        self.pairs.add(self.pair_key(topic_a, topic_b))
+
+    def add_slug(self, slug: str):
+        """'ike-vs-ikze' -> pair (ike, ikze)"""
+        if '-vs-' in slug:
+            a, b = slug.split('-vs-', 1)
+            self.add_pair(a.replace('-', ' '), b.replace('-', ' '))
+
+    def add_title(self, title: str):
+        m = _VS_TITLE.match(title.lower())
+        if m:
+            self.add_pair(m.group(1), m.group(2))
+        folded = fold(title)
+        if not folded or folded in self._title_ids:
+            return
+        doc_id = len(self.titles)
+        self.titles.append(folded)
+        self._title_ids[folded] = doc_id
+        for gram in self._ngrams(folded):
+            self._grams.setdefault(gram, set()).add(doc_id)
+
+    def update(self, slugs: Iterable[str] = (), titles: Iterable[str] = ()):
+        for slug in slugs:
+            self.add_slug(slug)
+        for title in titles:
+            self.add_title(title)
+
+    # ---------- queries ----------
+
+    def has_pair(self, topic_a: str, topic_b: str) -> bool:
+        return self.pair_key(topic_a, topic_b) in self.pairs
+
+    def contains(self, phrase: str) -> bool:
+        """Is phrase a substring of any indexed title? Rarest trigrams are intersected first"""
+        query = fold(phrase)
+        if not query:
+            return False
+        if len(query) < self.n:
+            return any(query in t for t in self.titles)
+
+        postings = []
+        for gram in self._ngrams(query):
+            ids = self._grams.get(gram)
+            if not ids:
+                return False
+            postings.append(ids)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return False
+        return any(query in self.titles[i] for i in candidates)
+
+    def __len__(self) -> int:
+        return len(self.titles)
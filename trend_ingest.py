@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Trends + RSS ingestion - new candidate keywords for keywords_pool.json
+• Every feed and every trend seed term is fetched concurrently; per-host token buckets and
+  a per-host concurrency cap keep each source under its own limit
+• Results are cached in ingest_cache.sqlite: within the TTL a source is not fetched at all,
+  after it feeds get a conditional request (ETag / Last-Modified) and a 304 reuses the cache;
+  a failed fetch falls back to the last good result
+• Items are deduplicated (folded keyword) and merged into the pool in one journal record
+
+    python claude_premium_v11_FINAL.py --ingest
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from keyword_categorizer import UNKNOWN
+from keyword_pool import KeywordPool
+from rate_limiter import TokenBucket
+from safe_io import atomic_write_json
+from topic_index import fold
+
+try:
+    import feedparser
+    RSS_AVAILABLE = True
+except ImportError:
+    RSS_AVAILABLE = False
+
+TRENDS_HOST = 'trends.google.com'
+# Requests per minute per host; Google Trends answers 429 quickly
+DEFAULT_RATE_LIMITS = {TRENDS_HOST: 10, 'default': 60}
+MIN_KEYWORD_CHARS = 8
+
+
+class HostLimiter:
+    """Token bucket + concurrency cap per host - thread safe"""
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None, concurrency: int = 2):
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS, **(rate_limits or {}))
+        self.concurrency = concurrency
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[float]:
+        """Blocks until `host` has a free connection and a token; yields the seconds waited"""
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_limits.get(host, self.rate_limits['default']))
+                self._slots[host] = threading.Semaphore(self.concurrency)
+            bucket, semaphore = self._buckets[host], self._slots[host]
+        started = time.monotonic()
+        semaphore.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    wait = bucket.wait_time(1, now)
+                    if wait <= 0:
+                        bucket.consume(1, now)
+                        break
+                time.sleep(wait)
+            yield time.monotonic() - started
+        finally:
+            semaphore.release()
+
+
+class IngestCache:
+    """Last good result per source + its validators (SQLite)"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                key TEXT PRIMARY KEY,
+                fetched REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                items TEXT NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT fetched, etag, last_modified, items FROM sources WHERE key = ?",
+                                   (key,)).fetchone()
+        if row is None:
+            return None
+        return {"fetched": row[0], "etag": row[1], "last_modified": row[2], "items": json.loads(row[3])}
+
+    def put(self, key: str, items: List[Dict], etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO sources (key, fetched, etag, last_modified, items) VALUES (?, ?, ?, ?, ?)",
+                             (key, time.time(), etag, last_modified, json.dumps(items, ensure_ascii=False)))
+            self._db.commit()
+
+    def touch(self, key: str):
+        """304 Not Modified - the cached items are current again"""
+        with self._lock:
+            self._db.execute("UPDATE sources SET fetched = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# ---------- parsing ----------
+
+def clean_keyword(text: str) -> str:
+    text = re.sub(r'<[^>]+>', ' ', text or '')
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text[:1].upper() + text[1:]
+
+
+def _item_date(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).date().isoformat()   # RSS pubDate
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(value.strip()[:10]).date().isoformat()   # Atom
+    except ValueError:
+        return None
+
+
+def parse_feed(content: bytes) -> List[Tuple[str, Optional[str]]]:
+    """(title, date) of every item - feedparser when installed, RSS 2.0 / Atom via ElementTree otherwise"""
+    if RSS_AVAILABLE:
+        parsed = feedparser.parse(content)
+        return [(e.get('title', ''), time.strftime('%Y-%m-%d', e.published_parsed) if e.get('published_parsed') else None)
+                for e in parsed.entries]
+    items = []
+    for element in ET.fromstring(content).iter():
+        if element.tag.rsplit('}', 1)[-1] not in ('item', 'entry'):
+            continue
+        fields = {child.tag.rsplit('}', 1)[-1]: (child.text or '') for child in element}
+        items.append((fields.get('title', ''), _item_date(fields.get('pubDate') or fields.get('published') or fields.get('updated'))))
+    return items
+
+
+def _records(frame) -> List[Dict]:
+    """pytrends returns DataFrames (or None); a stub may return lists of dicts"""
+    if frame is None:
+        return []
+    if hasattr(frame, 'to_dict'):
+        return frame.to_dict('records')
+    return list(frame)
+
+
+def _volume(value) -> str:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 'medium'
+    return 'high' if value >= 70 else 'medium' if value >= 30 else 'low'
+
+
+# ---------- ingestion ----------
+
+class TrendIngest:
+    def __init__(self, cache_path: str, ttl_hours: float = 20, workers: int = 8,
+                 rate_limits: Optional[Dict[str, float]] = None, host_concurrency: int = 2,
+                 trends_client: Optional[Callable[[], object]] = None,
+                 categorize: Optional[Callable[[List[str]], List[Tuple[str, float]]]] = None,
+                 geo: str = 'PL', timeframe: str = 'now 7-d', timeout: float = 15):
+        """trends_client() builds a pytrends-like client (build_payload + related_queries) - one per
+        worker thread, pytrends keeps per-request state. categorize(keywords) -> [(category, confidence)]
+        (keyword_categorizer.categorize_many) for items of feeds without a category, once per run"""
+        self.cache = IngestCache(cache_path)
+        self.ttl = ttl_hours * 3600
+        self.workers = workers
+        self.limiter = HostLimiter(rate_limits, host_concurrency)
+        self.trends_client = trends_client
+        self.categorize = categorize
+        self.geo = geo
+        self.timeframe = timeframe
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['user-agent'] = 'mocinformacji-ingest/1.0'
+        self._local = threading.local()
+
+    def close(self):
+        self.session.close()
+        self.cache.close()
+
+    def _cached(self, key: str) -> Tuple[Optional[Dict], bool]:
+        """(cache entry, still within the TTL)"""
+        entry = self.cache.get(key)
+        return entry, entry is not None and time.time() - entry['fetched'] < self.ttl
+
+    # ---------- RSS ----------
+
+    def fetch_feed(self, feed: Dict) -> Tuple[str, List[Dict]]:
+        """-> (status, items); status: fresh | not_modified | cached | stale | error"""
+        url = feed['url']
+        key = f"rss:{url}"
+        entry, valid = self._cached(key)
+        if valid:
+            return 'cached', entry['items']
+
+        try:
+            if url.startswith('file://'):
+                # Local fixture: the file's mtime plays Last-Modified
+                path = url[len('file://'):]
+                modified = str(os.stat(path).st_mtime_ns)
+                if entry and entry['last_modified'] == modified:
+                    self.cache.touch(key)
+                    return 'not_modified', entry['items']
+                with open(path, 'rb') as f:
+                    content = f.read()
+                etag = None
+            else:
+                headers = {}
+                if entry and entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry and entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+                with self.limiter.slot(urlparse(url).netloc):
+                    resp = self.session.get(url, headers=headers, timeout=self.timeout)
+                if resp.status_code == 304 and entry:
+                    self.cache.touch(key)
+                    return 'not_modified', entry['items']
+                resp.raise_for_status()
+                content = resp.content
+                etag, modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+
+            today = date.today().isoformat()
+            items = []
+            for title, published in parse_feed(content):
+                keyword = clean_keyword(title)
+                if len(keyword) < MIN_KEYWORD_CHARS:
+                    continue
+                # No feed category: decided in run(), so cached items follow categorizer changes
+                items.append({"keyword": keyword, "category": feed.get('category'), "generated_by": "rss",
+                              "trend_date": published or today, "source": url})
+            self.cache.put(key, items, etag, modified)
+            return 'fresh', items
+        except Exception as e:
+            print(f"⚠️  Feed {url}: {str(e)[:100]}")
+            return ('stale', entry['items']) if entry else ('error', [])
+
+    # ---------- Google Trends ----------
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.trends_client()
+        return client
+
+    def fetch_trend(self, term: str, category: str) -> Tuple[str, List[Dict]]:
+        """Related queries (top + rising) of one seed term; TTL only - Trends has no validators"""
+        key = f"trends:{self.geo}:{self.timeframe}:{term}"
+        entry, valid = self._cached(key)
+        if valid:
+            return 'cached', entry['items']
+        try:
+            with self.limiter.slot(TRENDS_HOST):
+                client = self._client()
+                client.build_payload([term], geo=self.geo, timeframe=self.timeframe)
+                related = (client.related_queries() or {}).get(term) or {}
+            today = date.today().isoformat()
+            items = []
+            for kind in ('rising', 'top'):
+                for row in _records(related.get(kind)):
+                    keyword = clean_keyword(row.get('query', ''))
+                    if len(keyword) < MIN_KEYWORD_CHARS:
+                        continue
+                    items.append({"keyword": keyword, "category": category, "generated_by": "google_trends",
+                                  "trend_date": today, "volume": 'high' if kind == 'rising' else _volume(row.get('value')),
+                                  "rising": kind == 'rising', "original": term})
+            self.cache.put(key, items)
+            return 'fresh', items
+        except Exception as e:
+            print(f"⚠️  Trends '{term}': {str(e)[:100]}")
+            return ('stale', entry['items']) if entry else ('error', [])
+
+    # ---------- stage ----------
+
+    def run(self, feeds: List[Dict], seeds: Dict[str, List[str]]) -> Dict:
+        """Every feed and seed term at once -> {"items": [...deduplicated...], "status": {...}, "seconds": s}"""
+        started = time.monotonic()
+        jobs = [(self.fetch_feed, (feed,)) for feed in feeds]
+        if self.trends_client:
+            jobs += [(self.fetch_trend, (term, category)) for category, terms in seeds.items() for term in terms]
+        elif seeds:
+            print(f"⚠️  pytrends not installed - {sum(len(t) for t in seeds.values())} trend seed terms skipped")
+
+        status: Dict[str, int] = {}
+        items: List[Dict] = []
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            for outcome, found in pool.map(lambda job: job[0](*job[1]), jobs):
+                status[outcome] = status.get(outcome, 0) + 1
+                for item in found:
+                    key = fold(item['keyword'])
+                    if key not in seen:
+                        seen.add(key)
+                        items.append(item)
+
+        # One batch for every uncategorized item; UNKNOWN (news, recipes...) is left out of the pool
+        pending = [item for item in items if not item.get('category')]
+        if pending and self.categorize:
+            for item, (category, _) in zip(pending, self.categorize([item['keyword'] for item in pending])):
+                item['category'] = None if category == UNKNOWN else category
+        dropped = sum(1 for item in items if not item.get('category'))
+        if dropped:
+            status['uncategorized'] = dropped
+        items = [item for item in items if item.get('category')]
+        return {"items": items, "status": status, "seconds": time.monotonic() - started}
+
+    @staticmethod
+    def merge(result: Dict, pool: KeywordPool) -> int:
+        """One pass, one journal record; keywords already in the pool are skipped"""
+        return pool.add(result['items'], generated_by='ingest')
+
+    @staticmethod
+    def write_snapshot(result: Dict, path: str, region: str = 'PL'):
+        """Trend items in the 1trends.json shape"""
+        trends: Dict[str, List[Dict]] = {}
+        for item in result['items']:
+            if item['generated_by'] == 'google_trends':
+                trends.setdefault(item['category'], []).append(
+                    {k: item[k] for k in ('keyword', 'volume', 'rising', 'original')})
+        now = datetime.now()
+        atomic_write_json(path, {
+            "date": now.strftime('%Y-%m-%d'),
+            "fetched_at": now.strftime('%H:%M:%S'),
+            "source": "google_api",
+            "trends": trends,
+            "metadata": {"total_keywords": sum(len(v) for v in trends.values()), "region": region}
+        }, indent=2)